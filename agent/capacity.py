@@ -0,0 +1,157 @@
+"""
+Worker Capacity
+================
+What the worker's main process reports to LiveKit dispatch, instead of
+the SDK's CPU-only default:
+
+- load(): the highest of three usage ratios, clamped to [0, 1]. Each is
+  scaled so it reaches AGENT_LOAD_THRESHOLD (where the worker stops
+  taking jobs) exactly at its limit:
+    active jobs        / AGENT_MAX_JOBS
+    main event-loop lag / AGENT_LOOP_LAG_BUDGET_S
+    worker memory (RSS of the main process and its job processes)
+                       / AGENT_MEMORY_BUDGET_MB
+  A limit of 0 leaves that signal out.
+- on_request(): rejects a job when AGENT_MAX_JOBS are already running or
+  the last reported load is over the threshold (a request can race the
+  load update), so dispatch hands it to another worker right away.
+
+The lag probe runs on the main event loop; start() it from there when
+the worker starts (load_fnc itself may run on an executor thread).
+
+Both export to the worker's metrics registry (load, lag, memory,
+dispatch wait, accepted/rejected jobs) for autoscaling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # type: ignore
+
+from agent import metrics
+
+logger = logging.getLogger("agent.capacity")
+
+MAX_JOBS = int(os.getenv("AGENT_MAX_JOBS", "0"))   # 0 = no per-process limit
+LOAD_THRESHOLD = float(os.getenv("AGENT_LOAD_THRESHOLD", "0.75"))
+LOOP_LAG_BUDGET_S = float(os.getenv("AGENT_LOOP_LAG_BUDGET_S", "0.1"))
+MEMORY_BUDGET_MB = float(os.getenv("AGENT_MEMORY_BUDGET_MB", "0"))   # 0 = not counted
+
+# Event-loop lag probe: scheduled every LAG_INTERVAL_S, smoothed (EWMA).
+LAG_INTERVAL_S = 0.5
+LAG_SMOOTHING = 0.3
+
+
+class Capacity:
+    """Load and admission for one worker process (see module docstring)."""
+
+    def __init__(
+        self,
+        max_jobs: int = MAX_JOBS,
+        lag_budget_s: float = LOOP_LAG_BUDGET_S,
+        memory_budget_mb: float = MEMORY_BUDGET_MB,
+        threshold: float = LOAD_THRESHOLD,
+    ) -> None:
+        self.max_jobs = max_jobs
+        self.lag_budget_s = lag_budget_s
+        self.memory_budget_mb = memory_budget_mb
+        self.threshold = threshold
+        self.server = None
+        self.lag_s = 0.0
+        self.last_load = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def attach(self, server) -> None:
+        """Count active jobs on this AgentServer."""
+        self.server = server
+
+    # -- Signals ---------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the lag probe on the running (main) event loop; idempotent."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        loop.call_later(LAG_INTERVAL_S, self._probe, loop.time() + LAG_INTERVAL_S)
+
+    def _probe(self, due: float) -> None:
+        lag = max(0.0, self._loop.time() - due)
+        self.lag_s += LAG_SMOOTHING * (lag - self.lag_s)
+        metrics.LOOP_LAG.set(self.lag_s)
+        self._loop.call_later(LAG_INTERVAL_S, self._probe, self._loop.time() + LAG_INTERVAL_S)
+
+    def active_jobs(self) -> int:
+        return len(getattr(self.server, "active_jobs", None) or ())
+
+    @staticmethod
+    def memory_mb() -> float:
+        """RSS of this process and its job processes, in MB (0 without psutil)."""
+        if psutil is None:
+            return 0.0
+        main = psutil.Process()
+        rss = main.memory_info().rss
+        for child in main.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                continue   # exited while we looked
+        return rss / (1024 * 1024)
+
+    # -- AgentServer hooks -------------------------------------------------------
+
+    def _usage(self, used: float, limit: float) -> float:
+        """used/limit, scaled so that reaching `limit` reaches the threshold."""
+        return used / limit * self.threshold if limit > 0 else 0.0
+
+    def load(self, server=None) -> float:
+        """load_fnc: 0 (idle) .. 1 (full). Safe to call from any thread."""
+        parts = [self._usage(self.lag_s, self.lag_budget_s)]
+        if self.memory_budget_mb > 0:
+            memory_mb = self.memory_mb()
+            metrics.WORKER_MEMORY.set(memory_mb * 1024 * 1024)
+            parts.append(self._usage(memory_mb, self.memory_budget_mb))
+        if self.max_jobs > 0:
+            parts.append(self._usage(self.active_jobs(), self.max_jobs))
+        load = self.last_load = min(1.0, max(parts))
+        metrics.WORKER_LOAD.set(load)
+        return load
+
+    async def on_request(self, request) -> None:
+        """Job request handler: accept unless this process is full."""
+        self.start()   # no-op once started at worker startup
+        reason = None
+        if self.max_jobs > 0 and self.active_jobs() >= self.max_jobs:
+            reason = "max_jobs"
+        elif self.last_load >= self.threshold:
+            reason = "load"
+        if reason is not None:
+            metrics.JOBS_REJECTED.inc(reason=reason)
+            logger.info(f"🚦 Rejecting job for room {request.room.name} ({reason}, load={self.last_load:.2f})")
+            await request.reject()
+            return
+
+        created = _room_created(request.room)
+        if created:
+            metrics.DISPATCH_WAIT.observe(max(0.0, time.time() - created))
+        await request.accept()
+        metrics.JOBS_ACCEPTED.inc()
+
+
+def _room_created(room) -> Optional[float]:
+    """Room creation time (epoch seconds) from the dispatch request, if known."""
+    ms = getattr(room, "creation_time_ms", 0)
+    if ms:
+        return ms / 1000
+    return getattr(room, "creation_time", 0) or None
+
+
+capacity = Capacity()
@@ -0,0 +1,121 @@
+"""
+Worker Process Context
+=======================
+Everything a job needs that does not depend on the caller: persona
+cache, compiled prompts, realtime model clients and the recordings
+directory. Built once per worker process by the AgentServer setup hook
+(see prewarm in agent/main.py) and reused by every job in that process.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from agent.personas import get as get_file_persona, manifest as persona_manifest
+from agent.prompts import LANGUAGE_NAMES, PromptCache, prompt_cache
+from agent.recorder import RECORDINGS_DIR
+from customers.cache import CustomerCache
+
+logger = logging.getLogger("agent.context")
+
+DEFAULT_PERSONA_ID = "home_services"
+
+# Key under which the context is stored in JobProcess.userdata
+USERDATA_KEY = "lisa"
+
+
+class WorkerContext:
+    """Per-process state shared by all jobs."""
+
+    def __init__(
+        self,
+        model_factory: Callable[[str], object],
+        persona_cache: Optional[CustomerCache] = None,
+        prompts: Optional[PromptCache] = None,
+    ) -> None:
+        self._model_factory = model_factory
+        self.persona_cache = persona_cache or CustomerCache(
+            max_size=int(os.getenv("PERSONA_CACHE_SIZE", "256"))
+        )
+        self.prompts = prompts or prompt_cache
+        self._models: Dict[str, object] = {}
+        self._models_lock = threading.Lock()
+        self.prewarm_s: Optional[float] = None
+        self.jobs_started = 0
+
+    # ── Personas / prompts ──────────────────────────────────────────────────
+
+    def find_persona(self, persona_id: str) -> Optional[dict]:
+        """
+        Shared database first. The persona file is only a fallback for ids
+        the database has never seen: a customer deleted through the API
+        leaves a tombstone and must not come back from its file.
+        """
+        persona = self.persona_cache.get(persona_id)
+        if persona is None and not self.persona_cache.is_deleted(persona_id):
+            persona = get_file_persona(persona_id)
+        return persona
+
+    def load_persona(self, customer_id: str) -> dict:
+        """The customer's persona, else the default persona."""
+        for pid in (customer_id, DEFAULT_PERSONA_ID):
+            persona = self.find_persona(pid)
+            if persona:
+                return persona
+        raise LookupError(f"No persona for '{customer_id}' and no default persona")
+
+    def system_prompt(self, persona: dict, language: str) -> str:
+        return self.prompts.get(persona, language)
+
+    # ── Model clients ───────────────────────────────────────────────────────
+
+    def model_for(self, voice: str):
+        """Realtime model client for a voice, created once per process."""
+        model = self._models.get(voice)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(voice)
+                if model is None:
+                    model = self._models[voice] = self._model_factory(voice)
+        return model
+
+    # ── Prewarm ─────────────────────────────────────────────────────────────
+
+    def prewarm(self, languages: Iterable[str] = LANGUAGE_NAMES) -> None:
+        started = time.perf_counter()
+        RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
+
+        personas = [p for p in map(self.find_persona, persona_manifest()) if p]
+        built = self.prompts.precompute(personas, languages)
+        for voice in {p["voice"] for p in personas}:
+            self.model_for(voice)
+
+        self.prewarm_s = time.perf_counter() - started
+        logger.info(
+            f"🔥 Prewarmed {len(personas)} personas, {built} prompts, "
+            f"{len(self._models)} model clients in {self.prewarm_s * 1000:.1f} ms"
+        )
+
+
+_process_context: Optional[WorkerContext] = None
+_process_lock = threading.Lock()
+
+
+def get_worker_context(
+    model_factory: Callable[[str], object],
+    userdata: Optional[dict] = None,
+) -> WorkerContext:
+    """The process's context: from JobProcess.userdata, else created on demand."""
+    global _process_context
+    if userdata is not None and USERDATA_KEY in userdata:
+        return userdata[USERDATA_KEY]
+    with _process_lock:
+        if _process_context is None:
+            _process_context = WorkerContext(model_factory)
+        if userdata is not None:
+            userdata[USERDATA_KEY] = _process_context
+        return _process_context
@@ -0,0 +1,217 @@
+"""
+Flight Recorder
+================
+Fixed-size, per-session ring buffer of structured session events
+(kind, monotonic time, a few small fields). Recording is a deque
+append; nothing is formatted or logged while the session is healthy.
+
+The buffer is dumped as JSON to FLIGHT_RECORDER_DIR when:
+- the session reports an error (or closes with one)
+- a turn's reply latency exceeds FLIGHT_RECORDER_LATENCY_S
+- someone asks for it: the API's admin endpoint drops a marker file in
+  <dir>/requests/<session_id>, which the job process owning that session
+  picks up (request_dump / the poller thread below). A marker nobody
+  picks up within REQUEST_TTL_S expires, so a later session reusing
+  the id is not dumped for an old request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from agent.transcript import format_timestamp
+
+logger = logging.getLogger("agent.flight_recorder")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+FLIGHT_DIR = Path(os.getenv("FLIGHT_RECORDER_DIR") or PROJECT_ROOT / "data" / "flight")
+REQUESTS_DIR = FLIGHT_DIR / "requests"
+
+CAPACITY = int(os.getenv("FLIGHT_RECORDER_SIZE", "512"))
+LATENCY_THRESHOLD_S = float(os.getenv("FLIGHT_RECORDER_LATENCY_S", "4.0"))
+MAX_DUMPS_PER_SESSION = 3
+POLL_INTERVAL_S = 2.0
+# A dump request no live session picked up within this long is dropped.
+REQUEST_TTL_S = float(os.getenv("FLIGHT_RECORDER_REQUEST_TTL_S", "30"))
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+Event = Tuple[float, str, Dict]
+
+
+class FlightRecorder:
+    """Ring buffer of the last `capacity` events of one session."""
+
+    __slots__ = ("session_id", "latency_threshold_s", "directory", "dumps",
+                 "_events", "_wall0", "_mono0", "__weakref__")
+
+    def __init__(
+        self,
+        session_id: str,
+        capacity: int = CAPACITY,
+        latency_threshold_s: float = LATENCY_THRESHOLD_S,
+        directory: Path = FLIGHT_DIR,
+    ) -> None:
+        self.session_id = session_id
+        self.latency_threshold_s = latency_threshold_s
+        self.directory = directory
+        self.dumps = 0
+        self._events: Deque[Event] = deque(maxlen=capacity)
+        self._wall0 = time.time()
+        self._mono0 = time.monotonic()
+
+    def record(self, kind: str, **fields) -> None:
+        self._events.append((time.monotonic(), kind, fields))
+
+    def latency(self, name: str, seconds: float) -> None:
+        self.record("latency", name=name, s=round(seconds, 3))
+        if seconds > self.latency_threshold_s:
+            self.trigger(f"slow_{name}")
+
+    # ── Dumping ─────────────────────────────────────────────────────────────
+
+    def trigger(self, reason: str) -> None:
+        """Dump from the event loop: snapshot now, write in the default executor."""
+        if self.dumps >= MAX_DUMPS_PER_SESSION:
+            return
+        self.dumps += 1
+        events = list(self._events)
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self._write, reason, events)
+        except RuntimeError:
+            self._write(reason, events)
+
+    def dump(self, reason: str) -> Optional[Path]:
+        """Blocking dump (any thread)."""
+        return self._write(reason, list(self._events))
+
+    def _write(self, reason: str, events: List[Event]) -> Optional[Path]:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.directory / f"{self.session_id}_{stamp}_{reason}.json"
+        payload = {
+            "session_id": self.session_id,
+            "reason": reason,
+            "dumped_at": datetime.now().isoformat(),
+            "events": [
+                {
+                    "t": format_timestamp(self._wall0 + (mono - self._mono0)),
+                    "since_start_s": round(mono - self._mono0, 4),
+                    "kind": kind,
+                    **fields,
+                }
+                for mono, kind, fields in events
+            ],
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+        except OSError:
+            logger.warning(f"Could not write flight recorder dump {path}", exc_info=True)
+            return None
+        logger.warning(f"🛩️  Flight recorder dumped ({reason}, {len(events)} events) → {path}")
+        return path
+
+
+# ── On-demand dumps across processes ────────────────────────────────────────
+
+_active: "weakref.WeakValueDictionary[str, FlightRecorder]" = weakref.WeakValueDictionary()
+_poller: Optional[threading.Thread] = None
+_poller_lock = threading.Lock()
+
+
+def register(flight: FlightRecorder) -> None:
+    """Make a session's recorder reachable by on-demand dump requests."""
+    global _poller
+    _active[flight.session_id] = flight
+    if _poller is None or not _poller.is_alive():
+        with _poller_lock:
+            if _poller is None or not _poller.is_alive():
+                _poller = threading.Thread(target=_poll_requests, name="flight-requests", daemon=True)
+                _poller.start()
+
+
+def unregister(flight: FlightRecorder) -> None:
+    if _active.get(flight.session_id) is flight:
+        del _active[flight.session_id]
+
+
+def _marker_age(marker: Path) -> Optional[float]:
+    """Seconds since the marker was written, or None if it does not exist."""
+    try:
+        return time.time() - marker.stat().st_mtime
+    except OSError:
+        return None
+
+
+def expire_requests(now: Optional[float] = None) -> int:
+    """Delete dump requests older than REQUEST_TTL_S. Returns how many."""
+    if not REQUESTS_DIR.exists():
+        return 0
+    now = now or time.time()
+    expired = 0
+    for marker in REQUESTS_DIR.iterdir():
+        try:
+            if now - marker.stat().st_mtime > REQUEST_TTL_S:
+                marker.unlink(missing_ok=True)
+                expired += 1
+        except OSError:
+            continue
+    return expired
+
+
+def _poll_requests() -> None:
+    while True:
+        time.sleep(POLL_INTERVAL_S)
+        if not _active or not REQUESTS_DIR.exists():
+            continue
+        for session_id in list(_active.keys()):
+            marker = REQUESTS_DIR / session_id
+            age = _marker_age(marker)
+            if age is None:
+                continue
+            flight = _active.get(session_id)
+            if flight is not None and age <= REQUEST_TTL_S:
+                flight.dump("requested")
+            marker.unlink(missing_ok=True)
+
+
+def request_dump(session_id: str) -> Path:
+    """Ask whichever worker process runs `session_id` to dump its buffer."""
+    if not _SESSION_ID.match(session_id):
+        raise ValueError(f"Invalid session id: {session_id!r}")
+    REQUESTS_DIR.mkdir(parents=True, exist_ok=True)
+    expire_requests()
+    marker = REQUESTS_DIR / session_id
+    marker.write_text(datetime.now().isoformat(), encoding="utf-8")
+    return marker
+
+
+def list_dumps(session_id: Optional[str] = None) -> List[Dict]:
+    if not FLIGHT_DIR.exists() or (session_id and not _SESSION_ID.match(session_id)):
+        return []
+    pattern = f"{session_id}_*.json" if session_id else "*.json"
+    paths = sorted(FLIGHT_DIR.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [
+        {"name": p.name, "bytes": p.stat().st_size, "modified": format_timestamp(p.stat().st_mtime)}
+        for p in paths
+    ]
+
+
+def read_dump(name: str) -> Optional[Dict]:
+    path = FLIGHT_DIR / name
+    if path.parent != FLIGHT_DIR or path.suffix != ".json" or not path.is_file():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
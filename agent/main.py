@@ -2,9 +2,17 @@
 Lisa Voice Agent — Agent Worker (TRANSCRIPT-ONLY)
 =================================================
 Uses xAI Grok Voice Agent API (speech-to-speech).
-Loads persona from agent/personas/*.py, reads language from frontend metadata.
+Loads persona from the shared customer database (seeded from the
+persona files in agent/personas/, hot-reloaded while the worker runs),
+reads language from frontend metadata.
 Saves ONLY the full transcript to recordings/ folder (no audio recording).
 
+By default the model session starts while waiting for the caller
+(AGENT_PIPELINED_STARTUP); per-phase timings land in metadata.json.
+Rooms pre-created by the API's warm pool (app/room_pool.py) always take
+that path and keep the primed session waiting for their caller.
+Latency histograms are served on http://localhost:AGENT_METRICS_PORT/metrics.
+
 Run with:
     python -m agent.main dev
 """
@@ -14,7 +22,9 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 import sys
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -23,90 +33,57 @@ load_dotenv()
 
 from livekit import agents
 from livekit.agents import Agent, AgentServer, AgentSession
-from livekit.plugins import xai
 
 _root = str(Path(__file__).resolve().parents[1])
 if _root not in sys.path:
     sys.path.insert(0, _root)
 
-from agent.personas import get as get_persona, get_all as get_all_personas
+from agent import metrics
+from agent.capacity import LOAD_THRESHOLD, capacity
+from agent.context import DEFAULT_PERSONA_ID, USERDATA_KEY, WorkerContext, get_worker_context
+from agent.personas import manifest as persona_manifest
+from agent.prompts import get_language_name
 from agent.recorder import SessionRecorder
+from agent.timing import PhaseTimer
+from customers.seed import watch_personas
+from telemetry.exporter import aggregate, clear_snapshots, serve_metrics
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("lisa-agent")
 
 
-# =============================================================================
-# Language mapping
-# =============================================================================
-LANGUAGE_NAMES = {
-    "en": "English", "it": "Italian", "es": "Spanish", "fr": "French",
-    "de": "German", "pt": "Portuguese", "nl": "Dutch", "ja": "Japanese",
-    "ko": "Korean", "zh": "Chinese", "ar": "Arabic", "hi": "Hindi",
-    "ru": "Russian", "vi": "Vietnamese", "th": "Thai", "tr": "Turkish",
-}
+# Start the model session while waiting for the caller (see _run_pipelined).
+PIPELINED_STARTUP = os.getenv("AGENT_PIPELINED_STARTUP", "true").lower() == "true"
+
+
+def _load_plugins():
+    """
+    Import the xAI plugin on first need rather than at module load.
+    LiveKit plugins register on import and must do so on the main thread:
+    the CLI and prewarm (the job process's setup hook) both run there.
+    """
+    from livekit.plugins import xai
+    return xai
+
 
+def _create_model(voice: str):
+    return _load_plugins().realtime.RealtimeModel(voice=voice)
 
-def get_language_name(code: str) -> str:
-    return LANGUAGE_NAMES.get(code, code)
 
+def worker_context(ctx: agents.JobContext | None = None) -> WorkerContext:
+    userdata = ctx.proc.userdata if ctx is not None else None
+    return get_worker_context(_create_model, userdata)
 
-DEFAULT_PERSONA_ID = "home_services"
+
+def load_persona(customer_id: str) -> dict:
+    return worker_context().load_persona(customer_id)
 
 
 # =============================================================================
 # Build prompts
 # =============================================================================
 def build_system_prompt(persona: dict, language: str) -> str:
-    parts = []
-    if language != "en":
-        lang_name = get_language_name(language)
-        parts.append(
-            f"CRITICAL LANGUAGE RULE: You MUST speak and respond ONLY in {lang_name}. "
-            f"All your spoken output must be in {lang_name}. "
-            f"Never switch to English unless the user explicitly asks you to."
-        )
-    parts.append(persona["system_prompt"])
-    parts.append(
-        "DEFAULT MISSED-CALL ASSISTANT WORKFLOW:\n"
-        "- Act like a proactive front-desk assistant for a small business, not a passive voicemail.\n"
-        "- Never say the owner is unavailable, never ask the caller to leave a message, and never frame yourself as only a placeholder.\n"
-        "- Start strong: greet with the business name and position yourself as actively helping get the issue handled quickly.\n"
-        "- Ask what the caller needs in a simple, natural way.\n"
-        "- Guide the conversation forward with calm confidence.\n"
-        "- Say things like: 'I can help get this taken care of quickly,' 'Let me grab a couple details so we can move fast,' and 'I'll make sure the team gets this right away.'\n"
-        "- Collect the caller's name, what they need, urgency when relevant, and callback details if needed.\n"
-        "- Confirm the key details back clearly so the handoff feels already in motion.\n"
-        "- Reassure with confident but realistic language such as 'Perfect — I've got everything I need' and 'I'll pass this to the team right away so they can follow up as soon as possible.'\n"
-        "- Only offer a booking link after you have collected the important details.\n"
-        "- Close cleanly: thank the caller by name when possible and reinforce that the team will be in touch shortly.\n"
-        "- Do not mention AI.\n"
-        "- Never invent pricing, availability, policies, or actions already taken.\n"
-        "- If information is missing, say the team will follow up with specifics."
-    )
-
-    if category := persona.get("business_category"):
-        parts.append(f"Business category: {category}.")
-    if services := persona.get("services"):
-        parts.append(f"Services offered: {', '.join(services)}.")
-    if service_area := persona.get("service_area"):
-        parts.append(f"Service area: {service_area}.")
-    if hours := persona.get("business_hours"):
-        parts.append(f"Business hours: {hours}.")
-    if address := persona.get("business_address"):
-        parts.append(f"Located at: {address}.")
-    if questions := persona.get("common_customer_questions"):
-        parts.append(
-            "Common customer questions to help with: "
-            f"{', '.join(questions)}."
-        )
-    if persona.get("booking_link_enabled") and persona.get("booking_link_url"):
-        parts.append(
-            "Optional booking link for callers after details are collected: "
-            f"{persona['booking_link_url']}."
-        )
-
-    return "\n\n".join(parts)
+    return worker_context().system_prompt(persona, language)
 
 
 def build_intro_instruction(persona: dict, user_name: str, language: str) -> str:
@@ -131,71 +108,200 @@ async def wait_for_first_remote_participant(room, timeout_s: float = 15.0):
     """
     Wait until at least one remote participant exists.
     Avoids firing the intro before there is anyone to speak to.
+    Resolves on the room's participant_connected event (no polling).
     """
-    loop = asyncio.get_running_loop()
-    deadline = loop.time() + timeout_s
-    while loop.time() < deadline:
+    if room.remote_participants:
+        return next(iter(room.remote_participants.values()))
+
+    joined = asyncio.get_running_loop().create_future()
+
+    def _on_participant_connected(participant):
+        if not joined.done():
+            joined.set_result(participant)
+
+    room.on("participant_connected", _on_participant_connected)
+    try:
+        # Someone may have joined between the first check and on().
         if room.remote_participants:
             return next(iter(room.remote_participants.values()))
-        await asyncio.sleep(0.05)
-    return None
+        return await asyncio.wait_for(joined, timeout_s)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        room.off("participant_connected", _on_participant_connected)
 
 
 # =============================================================================
 # Server
 # =============================================================================
-server = AgentServer()
+def prewarm(proc: agents.JobProcess) -> None:
+    """
+    Runs once per worker process before it accepts jobs: discovers
+    personas, compiles their prompts and builds the model clients.
+    HTTP/WebSocket sessions stay with the plugin's per-job http_context,
+    since this hook runs before the job's event loop exists and aiohttp
+    sessions are bound to the loop that created them.
+    """
+    _load_plugins()
+    context = get_worker_context(_create_model, proc.userdata)
+    context.prewarm()
+    proc.userdata[USERDATA_KEY] = context
+    metrics.snapshots.start()
+
+
+server = AgentServer(load_threshold=LOAD_THRESHOLD)
+server.setup_fnc = prewarm
+server.load_fnc = capacity.load
+capacity.attach(server)
+
+
+@server.on("worker_started")
+def _on_worker_started():
+    # Emitted on the main process's event loop: the lag probe must run there.
+    capacity.start()
+
+
+def warm_pool_wait(room) -> float | None:
+    """Seconds a warm-pool room waits for its caller, or None for a normal room."""
+    try:
+        meta = json.loads(getattr(room, "metadata", None) or "{}")
+    except ValueError:
+        return None
+    if not isinstance(meta, dict) or not meta.get("warm_pool"):
+        return None
+    return float(meta.get("caller_wait_s", 300.0))
+
+
+def parse_room_name(room_name: str) -> tuple[str, str] | None:
+    """The API names rooms "<customer_id>-<session_id>" (session_id has no '-')."""
+    customer_id, sep, session_id = (room_name or "").rpartition("-")
+    if not sep or not customer_id or not session_id:
+        return None
+    return customer_id, session_id
+
+
+def read_participant_metadata(participants) -> dict:
+    """customer_id / name / session_id / language from the first participant with metadata."""
+    info = {
+        "customer_id": DEFAULT_PERSONA_ID,
+        "name": "there",
+        "session_id": "unknown",
+        "language": "en",
+    }
+    for p in participants:
+        if getattr(p, "metadata", None):
+            try:
+                meta = json.loads(p.metadata)
+                for key in info:
+                    info[key] = meta.get(key, info[key])
+            except Exception:
+                logger.exception("Failed to parse participant metadata")
+            break
+    return info
+
+
+def _participants(room, first_p) -> list:
+    candidates = [first_p] if first_p else []
+    candidates.extend(room.remote_participants.values())
+    return candidates
+
+
+def _track_first_audio(session, timer: PhaseTimer) -> None:
+    """Mark when the agent first starts speaking (first greeting audio)."""
 
+    @session.on("agent_state_changed")
+    def _on_state(ev):
+        if getattr(ev, "new_state", None) == "speaking" and "first_audio_s" not in timer.spans:
+            first_audio = timer.mark("first_audio")
+            joined = timer.spans.get("participant_joined_s")
+            if joined is not None:
+                timer.record("join_to_first_audio", first_audio - joined)
 
-@server.rtc_session()
+
+def _save_on_close(session, recorder: SessionRecorder, timer: PhaseTimer) -> None:
+    async def _save_transcript():
+        try:
+            logger.info("🛑 Session ended — saving transcript...")
+            timer.flush_to(recorder)
+            metrics.observe_timings(timer.spans)
+            started = time.perf_counter()
+            saved = await recorder.save()
+            metrics.SAVE.observe(time.perf_counter() - started)
+            logger.info(f"💾 Saved: {list(saved.keys())}")
+        except Exception:
+            logger.exception("Failed while saving transcript")
+            recorder.flight.trigger("save_error")
+        finally:
+            metrics.ACTIVE_SESSIONS.dec()
+            await asyncio.to_thread(metrics.snapshots.flush)
+
+    metrics.ACTIVE_SESSIONS.inc()   # paired with dec() once the transcript is saved
+
+    @session.on("close")
+    def _on_close():
+        # LiveKit requires sync callback here
+        try:
+            asyncio.get_running_loop().create_task(_save_transcript())
+        except RuntimeError:
+            logger.warning("No running event loop during close; skipping save task")
+
+
+@server.rtc_session(on_request=capacity.on_request)
 async def entrypoint(ctx: agents.JobContext):
+    worker = worker_context(ctx)
+    worker.jobs_started += 1
+    timer = PhaseTimer()
+    metrics.snapshots.start()
+    metrics.SESSIONS.inc()
+
     logger.info("🔌 Connecting to room...")
-    await ctx.connect()
+    with timer.span("connect"):
+        await ctx.connect()
+
+    caller_wait_s = warm_pool_wait(ctx.room)
+    guess = parse_room_name(ctx.room.name)
+    # Only rooms named after a known customer (the API's naming) are worth a guess.
+    if (PIPELINED_STARTUP or caller_wait_s) and guess and worker.find_persona(guess[0]):
+        await _run_pipelined(ctx, worker, timer, caller_wait_s)
+    else:
+        await _run_sequential(ctx, worker, timer)
 
+
+async def _run_sequential(ctx: agents.JobContext, worker: WorkerContext, timer: PhaseTimer) -> None:
     # ── Wait for a user to join ──────────────────────────────────────────────
-    first_p = await wait_for_first_remote_participant(ctx.room, timeout_s=15.0)
+    with timer.span("participant_wait"):
+        first_p = await wait_for_first_remote_participant(ctx.room, timeout_s=15.0)
     if first_p:
-        logger.info(f"👤 Remote participant joined: {first_p.identity}")
+        timer.mark("participant_joined")
+        logger.info(
+            f"👤 Remote participant joined: {first_p.identity} "
+            f"(waited {timer.spans['participant_wait_s']:.3f}s)"
+        )
     else:
         logger.warning("⚠️ No remote participant joined within 15s; continuing anyway.")
 
     # ── Read metadata ───────────────────────────────────────────────────────
-    customer_id = DEFAULT_PERSONA_ID
-    user_name = "there"
-    session_id = "unknown"
-    language = "en"
-
-    candidates = []
-    if first_p:
-        candidates.append(first_p)
-    candidates.extend(ctx.room.remote_participants.values())
-
-    for p in candidates:
-        if getattr(p, "metadata", None):
-            try:
-                meta = json.loads(p.metadata)
-                customer_id = meta.get("customer_id", DEFAULT_PERSONA_ID)
-                user_name = meta.get("name", "there")
-                session_id = meta.get("session_id", "unknown")
-                language = meta.get("language", "en")
-            except Exception:
-                logger.exception("Failed to parse participant metadata")
-            break
+    meta = read_participant_metadata(_participants(ctx.room, first_p))
+    customer_id = meta["customer_id"]
+    user_name = meta["name"]
+    session_id = meta["session_id"]
+    language = meta["language"]
 
     logger.info(f"📋 customer={customer_id}, user={user_name}, session={session_id}, lang={language}")
 
     # ── Load persona ────────────────────────────────────────────────────────
-    persona = get_persona(customer_id) or get_persona(DEFAULT_PERSONA_ID)
+    with timer.span("persona"):
+        persona = worker.load_persona(customer_id)
+        instructions = worker.system_prompt(persona, language)
     voice = persona["voice"]
     agent_name = persona["agent_name"]
-    instructions = build_system_prompt(persona, language)
 
     logger.info(f"🤖 {agent_name} | voice={voice} | lang={get_language_name(language)}")
 
     # ── Create agent ────────────────────────────────────────────────────────
     agent = Agent(
         instructions=instructions,
-        llm=xai.realtime.RealtimeModel(voice=voice),
+        llm=worker.model_for(voice),
     )
 
     # ── Recorder (TRANSCRIPT ONLY) ──────────────────────────────────────────
@@ -212,7 +318,11 @@ async def entrypoint(ctx: agents.JobContext):
     # ── Start session ───────────────────────────────────────────────────────
     session = AgentSession()
     recorder.attach_to_session(session)
-    await session.start(room=ctx.room, agent=agent)
+    _track_first_audio(session, timer)
+    metrics.track_turns(session, recorder.flight)
+    _save_on_close(session, recorder, timer)
+    with timer.span("session_start"):
+        await session.start(room=ctx.room, agent=agent)
     logger.info(f"✅ {agent_name} is live! ({get_language_name(language)})")
 
     await asyncio.sleep(0)
@@ -220,40 +330,144 @@ async def entrypoint(ctx: agents.JobContext):
     # ── Greeting ────────────────────────────────────────────────────────────
     if not ctx.room.remote_participants:
         logger.info("⏳ Waiting briefly for participant before greeting...")
-        await wait_for_first_remote_participant(ctx.room, timeout_s=5.0)
+        with timer.span("greeting_participant_wait"):
+            await wait_for_first_remote_participant(ctx.room, timeout_s=5.0)
 
     if ctx.room.remote_participants:
         intro_instruction = build_intro_instruction(persona, user_name, language)
         logger.info("👋 Sending intro message...")
+        timer.mark("greeting_requested")
         await session.generate_reply(instructions=intro_instruction)
     else:
         logger.warning("⚠️ Still no remote participants; cannot deliver intro.")
 
-    # ── Save transcript on disconnect ───────────────────────────────────────
-    async def _save_transcript():
-        try:
-            logger.info("🛑 Session ended — saving transcript...")
-            saved = await recorder.save()
-            logger.info(f"💾 Saved: {list(saved.keys())}")
-        except Exception:
-            logger.exception("Failed while saving transcript")
 
-    @session.on("close")
-    def _on_close():
-        # LiveKit requires sync callback here
-        try:
-            asyncio.get_running_loop().create_task(_save_transcript())
-        except RuntimeError:
-            logger.warning("No running event loop during close; skipping save task")
+async def _run_pipelined(
+    ctx: agents.JobContext, worker: WorkerContext, timer: PhaseTimer, warm_wait_s: float | None = None,
+) -> None:
+    """
+    Overlap model session startup with waiting for the caller.
+    The room name gives customer_id/session_id up front; that customer's
+    persona and its own language are the speculative guess, corrected
+    (persona, instructions, greeting) once metadata arrives.
+    In a warm-pool room (warm_wait_s set) the primed session waits that
+    long for its caller and leaves if nobody was handed the room; the
+    transcript recorder is only set up once the caller is known, so an
+    unclaimed room saves and indexes nothing.
+    """
+    caller_wait_s = warm_wait_s or 15.0
+    customer_id, session_id = parse_room_name(ctx.room.name)
+
+    # ── Speculative setup (before the caller is known) ──────────────────────
+    with timer.span("persona"):
+        persona = worker.load_persona(customer_id)
+        guessed_language = persona.get("language", "en")
+        instructions = worker.system_prompt(persona, guessed_language)
+        intro_instruction = build_intro_instruction(persona, "there", guessed_language)
+    voice = persona["voice"]
+    agent_name = persona["agent_name"]
+
+    agent = Agent(
+        instructions=instructions,
+        llm=worker.model_for(voice),
+    )
+    session = AgentSession()
+    _track_first_audio(session, timer)
+
+    async def _start_session():
+        with timer.span("session_start"):
+            await session.start(room=ctx.room, agent=agent)
+
+    async def _wait_participant():
+        with timer.span("participant_wait"):
+            return await wait_for_first_remote_participant(ctx.room, timeout_s=caller_wait_s)
+
+    start_task = asyncio.create_task(_start_session())
+    first_p = await _wait_participant()
+    if first_p:
+        timer.mark("participant_joined")
+        logger.info(
+            f"👤 Remote participant joined: {first_p.identity} "
+            f"(waited {timer.spans['participant_wait_s']:.3f}s)"
+        )
+    elif warm_wait_s:
+        logger.info("♨️  Warm room was never claimed; leaving")
+        await start_task
+        ctx.shutdown(reason="warm room unclaimed")
+        return
+    else:
+        logger.warning(f"⚠️ No remote participant joined within {caller_wait_s:.0f}s; continuing anyway.")
+
+    # ── Reconcile the guess with the caller's metadata ──────────────────────
+    meta = read_participant_metadata(_participants(ctx.room, first_p))
+    user_name = meta["name"]
+    language = meta["language"]
+    switched = meta["customer_id"] not in (customer_id, DEFAULT_PERSONA_ID)
+    if switched:
+        logger.info(
+            f"🔀 Metadata customer '{meta['customer_id']}' differs from room "
+            f"customer '{customer_id}'; switching persona"
+        )
+        customer_id = meta["customer_id"]
+        with timer.span("persona_switch"):
+            persona = worker.load_persona(customer_id)
+        if persona["voice"] != voice:
+            logger.warning(f"⚠️ Session already started with voice '{voice}'; '{persona['voice']}' not applied")
+        agent_name = persona["agent_name"]
+
+    logger.info(f"📋 customer={customer_id}, user={user_name}, session={session_id}, lang={language}")
+
+    # Recorded (and later saved and indexed) only once there is a call to record.
+    recorder = SessionRecorder(
+        session_id=session_id,
+        customer_id=customer_id,
+        user_name=user_name,
+        agent_name=agent_name,
+        language=language,
+        save_metadata=True,
+        room=ctx.room,
+    )
+    recorder.attach_to_session(session)
+    metrics.track_turns(session, recorder.flight)
+    _save_on_close(session, recorder, timer)
+
+    await start_task
+    logger.info(f"✅ {agent_name} is live! ({get_language_name(language)})")
+
+    if switched or language != guessed_language:
+        with timer.span("language_switch"):
+            await agent.update_instructions(worker.system_prompt(persona, language))
+    if switched or user_name != "there" or language != guessed_language:
+        intro_instruction = build_intro_instruction(persona, user_name, language)
+
+    # ── Greeting ────────────────────────────────────────────────────────────
+    if not ctx.room.remote_participants:
+        logger.info("⏳ Waiting briefly for participant before greeting...")
+        with timer.span("greeting_participant_wait"):
+            await wait_for_first_remote_participant(ctx.room, timeout_s=5.0)
+
+    if ctx.room.remote_participants:
+        logger.info("👋 Sending intro message...")
+        timer.mark("greeting_requested")
+        await session.generate_reply(instructions=intro_instruction)
+    else:
+        logger.warning("⚠️ Still no remote participants; cannot deliver intro.")
 
 
 # =============================================================================
 # CLI
 # =============================================================================
 if __name__ == "__main__":
-    personas = get_all_personas()
-    logger.info(f"📋 {len(personas)} personas loaded: {list(personas.keys())}")
+    personas = persona_manifest()
+    logger.info(f"📋 {len(personas)} personas found: {list(personas.keys())}")
     for pid, p in personas.items():
         logger.info(f"  {pid}: {p['agent_name']} (voice={p['voice']})")
 
+    _load_plugins()
+    watch_personas()
+    clear_snapshots()
+    if metrics.METRICS_PORT:
+        serve_metrics(metrics.METRICS_PORT, lambda: aggregate(metrics.registry))
+        logger.info(f"📈 Metrics: http://localhost:{metrics.METRICS_PORT}/metrics")
+
     agents.cli.run_app(server)
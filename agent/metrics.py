@@ -0,0 +1,126 @@
+"""
+Agent Metrics
+==============
+Latency histograms for the worker: time to participant, time to first
+greeting, per-turn reply latency (final user transcript → agent reply
+item), agent speaking time, setup phases and transcript save time.
+
+Each job process records into its own registry and snapshots it to
+TELEMETRY_DIR; the worker's main process serves the merged view on
+AGENT_METRICS_PORT (see telemetry/exporter.py and agent/main.py).
+Capacity metrics (load, loop lag, dispatch wait, accepted/rejected jobs)
+come from the main process (agent/capacity.py).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from telemetry.exporter import SnapshotWriter
+from telemetry.metrics import DEFAULT_BUCKETS, SESSION_BUCKETS, Registry
+
+METRICS_PORT = int(os.getenv("AGENT_METRICS_PORT", "9464"))   # 0 disables the endpoint
+
+registry = Registry()
+snapshots = SnapshotWriter(registry)
+
+PARTICIPANT_WAIT = registry.histogram(
+    "lisa_agent_participant_wait_seconds",
+    "Time from joining the room to the first remote participant",
+    buckets=SESSION_BUCKETS,
+)
+FIRST_GREETING = registry.histogram(
+    "lisa_agent_first_greeting_seconds",
+    "Time from job start to the agent's first audio",
+    buckets=SESSION_BUCKETS,
+)
+JOIN_TO_GREETING = registry.histogram(
+    "lisa_agent_join_to_greeting_seconds",
+    "Time from the participant joining to the agent's first audio",
+    buckets=SESSION_BUCKETS,
+)
+TURN_LATENCY = registry.histogram(
+    "lisa_agent_turn_latency_seconds",
+    "Time from a final user transcript to the agent's reply",
+    buckets=SESSION_BUCKETS,
+)
+SPEAKING = registry.histogram(
+    "lisa_agent_speaking_seconds",
+    "Duration of each agent speaking span",
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 60.0),
+)
+SETUP_PHASE = registry.histogram(
+    "lisa_agent_setup_phase_seconds",
+    "Call setup phases (connect, persona, session_start, persona_switch, language_switch)",
+    ["phase"],
+    buckets=DEFAULT_BUCKETS,
+)
+SAVE = registry.histogram(
+    "lisa_agent_recorder_save_seconds",
+    "Time to flush and save a session transcript",
+    buckets=DEFAULT_BUCKETS,
+)
+SESSIONS = registry.counter("lisa_agent_sessions_total", "Sessions started")
+ACTIVE_SESSIONS = registry.gauge("lisa_agent_active_sessions", "Sessions currently running")
+
+DISPATCH_WAIT = registry.histogram(
+    "lisa_agent_dispatch_wait_seconds",
+    "Time from room creation to this worker accepting the job",
+    buckets=SESSION_BUCKETS,
+)
+JOBS_ACCEPTED = registry.counter("lisa_agent_jobs_accepted_total", "Job requests accepted")
+JOBS_REJECTED = registry.counter("lisa_agent_jobs_rejected_total", "Job requests rejected", ["reason"])
+WORKER_LOAD = registry.gauge("lisa_agent_worker_load", "Load reported to dispatch (0..1)")
+LOOP_LAG = registry.gauge("lisa_agent_event_loop_lag_seconds", "Main process event-loop lag (smoothed)")
+WORKER_MEMORY = registry.gauge(
+    "lisa_agent_worker_memory_bytes", "RSS of the worker's main and job processes (with AGENT_MEMORY_BUDGET_MB)",
+)
+
+_SETUP_PHASES = ("connect", "persona", "session_start", "persona_switch", "language_switch")
+
+
+def observe_timings(spans: dict) -> None:
+    """Record a finished session's PhaseTimer spans."""
+    if "participant_wait_s" in spans and "participant_joined_s" in spans:
+        PARTICIPANT_WAIT.observe(spans["participant_wait_s"])
+    if "first_audio_s" in spans:
+        FIRST_GREETING.observe(spans["first_audio_s"])
+    if "join_to_first_audio_s" in spans:
+        JOIN_TO_GREETING.observe(spans["join_to_first_audio_s"])
+    for phase in _SETUP_PHASES:
+        if f"{phase}_s" in spans:
+            SETUP_PHASE.observe(spans[f"{phase}_s"], phase=phase)
+
+
+def track_turns(session, flight=None) -> None:
+    """
+    Per-turn reply latency and speaking time from AgentSession events.
+    Turn latencies are also handed to the session's flight recorder,
+    which dumps its buffer when one is over threshold.
+    """
+    state = {"user_final": None, "speaking_since": None}
+
+    @session.on("user_input_transcribed")
+    def _on_user_final(ev):
+        if getattr(ev, "is_final", False):
+            state["user_final"] = time.monotonic()
+
+    @session.on("conversation_item_added")
+    def _on_item(ev):
+        if getattr(ev.item, "role", None) != "assistant" or state["user_final"] is None:
+            return
+        latency = time.monotonic() - state["user_final"]
+        state["user_final"] = None
+        TURN_LATENCY.observe(latency)
+        if flight is not None:
+            flight.latency("turn", latency)
+
+    @session.on("agent_state_changed")
+    def _on_state(ev):
+        new_state = getattr(ev, "new_state", None)
+        if new_state == "speaking":
+            state["speaking_since"] = time.monotonic()
+        elif state["speaking_since"] is not None:
+            SPEAKING.observe(time.monotonic() - state["speaking_since"])
+            state["speaking_since"] = None
@@ -1,55 +1,280 @@
 """
 Persona Registry
 =================
-Auto-discovers all persona files in this folder.
-Each persona file exports a PERSONA dict.
+Auto-discovers all persona files in this folder:
 
-To add a new agent: just create a new .py file here with a PERSONA dict.
+- *.json / *.yaml / *.yml: one persona object per file (YAML needs PyYAML)
+- *.py: a module exporting a PERSONA dict
+
+To add a new agent: just drop a new file here.
+
+Nothing is imported up front. A manifest (id → file, mtime, size,
+revision) is cached at PERSONA_MANIFEST_PATH; a persona file is only
+parsed or imported when it is new or changed, or when the persona itself
+is asked for (get/get_all). manifest() answers id/revision questions
+without loading anything once the cache is warm.
+
+Hot reload: refresh() (or a PersonaWatcher thread) re-stats the folder,
+reloads only the files that changed, validates them and swaps the new
+dict in. Persona dicts are never mutated, so a call that already holds
+one keeps its snapshot; only new lookups see the new version. A persona
+that fails validation keeps its previous version.
 """
 
 from __future__ import annotations
 
+import hashlib
 import importlib
+import json
 import logging
-import pkgutil
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import yaml
+except ImportError:
+    yaml = None  # type: ignore
+
+from agent.prompts import unknown_rules
 
 logger = logging.getLogger("agent.personas")
 
-# All loaded personas keyed by persona id.
+PACKAGE_DIR = Path(__file__).parent
+MANIFEST_PATH = Path(
+    os.getenv("PERSONA_MANIFEST_PATH")
+    or PACKAGE_DIR.parents[1] / "data" / "personas_manifest.json"
+)
+# How often (seconds) PersonaWatcher stats the persona files.
+PERSONA_CHECK_INTERVAL_S = float(os.getenv("PERSONA_CHECK_INTERVAL_S", "2.0"))
+
+DATA_SUFFIXES = (".json", ".yaml", ".yml")
+REQUIRED_FIELDS = ("id", "name", "agent_name", "system_prompt")
+LIST_FIELDS = ("services", "common_customer_questions", "covers_rules")
+
+# Personas loaded so far, keyed by persona id.
 _registry: Dict[str, dict] = {}
+# Manifest entries keyed by file name; None until first use.
+_manifest: Optional[Dict[str, dict]] = None
+_lock = threading.RLock()
 
 
-def _discover() -> None:
-    """Import every module in this package and register its PERSONA."""
-    package_dir = Path(__file__).parent
-    for finder, name, _ in pkgutil.iter_modules([str(package_dir)]):
-        if name.startswith("_"):
-            continue
+class PersonaError(ValueError):
+    """A persona file that cannot be loaded or fails validation."""
+
+
+def fingerprint(persona: dict) -> str:
+    """Content revision of a persona dict (stable across processes)."""
+    blob = json.dumps(persona, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def validate(persona: object, source: str = "persona") -> dict:
+    """Check the fields the worker and API rely on; returns the persona."""
+    if not isinstance(persona, dict):
+        raise PersonaError(f"{source}: expected an object, got {type(persona).__name__}")
+    for key in REQUIRED_FIELDS:
+        if not isinstance(persona.get(key), str) or not persona[key]:
+            raise PersonaError(f"{source}: '{key}' must be a non-empty string")
+    for key in LIST_FIELDS:
+        if not isinstance(persona.get(key, []), list):
+            raise PersonaError(f"{source}: '{key}' must be a list")
+    if unknown := unknown_rules(persona.get("covers_rules", [])):
+        raise PersonaError(f"{source}: unknown workflow rules in 'covers_rules': {', '.join(unknown)}")
+    for key in ("intro_message", "goodbye_message"):
+        try:
+            persona.get(key, "").format(user_name="", agent_name="", business_name="")
+        except (KeyError, IndexError, ValueError, AttributeError) as e:
+            raise PersonaError(f"{source}: bad placeholder in '{key}': {e}")
+    return persona
+
+
+def _parse(path: Path) -> dict:
+    """Load one persona file (parse data files, import or reload modules)."""
+    if path.suffix == ".py":
+        name = f"{__package__}.{path.stem}"
         try:
-            module = importlib.import_module(f".{name}", package=__package__)
-            persona = getattr(module, "PERSONA", None)
-            if persona and isinstance(persona, dict) and "id" in persona:
-                _registry[persona["id"]] = persona
-                logger.info(f"  Loaded persona: {persona['id']} → {persona['agent_name']}")
+            module = sys.modules.get(name)
+            if module is None:
+                module = importlib.import_module(name)
+            else:
+                module = importlib.reload(module)
         except Exception as e:
-            logger.warning(f"  Failed to load persona '{name}': {e}")
+            raise PersonaError(f"{path.name}: {e}")
+        persona = getattr(module, "PERSONA", None)
+    else:
+        if path.suffix != ".json" and yaml is None:
+            raise PersonaError(f"{path.name}: PyYAML is not installed")
+        try:
+            with open(path, encoding="utf-8") as f:
+                persona = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+        except Exception as e:   # OSError, JSON or YAML syntax errors
+            raise PersonaError(f"{path.name}: {e}")
+    return validate(persona, path.name)
+
+
+def _persona_files() -> Iterable[Path]:
+    for path in sorted(PACKAGE_DIR.iterdir()):
+        if path.name.startswith("_") or path.suffix not in (".py",) + DATA_SUFFIXES:
+            continue
+        yield path
+
+
+def _load(path: Path, stat: os.stat_result) -> Optional[dict]:
+    """Load, validate and register a persona file; returns its manifest entry."""
+    try:
+        persona = _parse(path)
+    except PersonaError as e:
+        logger.warning(f"  Failed to load persona: {e}")
+        return None
+    _registry[persona["id"]] = persona   # swap, never mutate
+    logger.info(f"  Loaded persona: {persona['id']} → {persona['agent_name']}")
+    return {
+        "id": persona["id"],
+        "file": path.name,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "revision": fingerprint(persona),
+        "agent_name": persona["agent_name"],
+        "voice": persona.get("voice", "eve"),
+    }
+
+
+def _read_cached() -> Dict[str, dict]:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return {entry["file"]: entry for entry in json.load(f)["personas"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _write_cached(entries: Dict[str, dict]) -> None:
+    try:
+        MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = MANIFEST_PATH.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"personas": sorted(entries.values(), key=lambda e: e["file"])}, f, indent=1)
+        os.replace(tmp, MANIFEST_PATH)
+    except OSError:
+        logger.warning("Could not write persona manifest", exc_info=True)
+
+
+def _scan(previous: Dict[str, dict]) -> List[str]:
+    """
+    Stat every persona file and (re)load those that don't match `previous`.
+    Updates the manifest; returns the ids of personas that changed.
+    """
+    global _manifest
+    entries: Dict[str, dict] = {}
+    changed: List[str] = []
+    for path in _persona_files():
+        stat = path.stat()
+        entry = previous.get(path.name)
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            loaded = _load(path, stat)
+            if loaded is None:
+                if entry is not None:
+                    # Keep serving the last good version; retry once the file changes again.
+                    entries[path.name] = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                continue
+            if entry is None or loaded["revision"] != entry["revision"]:
+                changed.append(loaded["id"])
+            entry = loaded
+        entries[path.name] = entry
+
+    live_ids = {entry["id"] for entry in entries.values()}
+    for name in previous.keys() - entries.keys():
+        persona_id = previous[name]["id"]
+        if persona_id in live_ids:
+            continue   # moved to another file (e.g. .py → .json)
+        _registry.pop(persona_id, None)
+        changed.append(persona_id)
+        logger.info(f"  Removed persona: {persona_id}")
+
+    if entries != previous:
+        _write_cached(entries)
+    _manifest = entries
+    return changed
+
+
+def _ensure_manifest() -> Dict[str, dict]:
+    if _manifest is None:
+        _scan(_read_cached())
+    return _manifest
+
+
+def manifest() -> Dict[str, dict]:
+    """Metadata for every persona file, keyed by id; loads nothing when cached."""
+    with _lock:
+        return {entry["id"]: entry for entry in _ensure_manifest().values()}
 
 
 def get(persona_id: str) -> Optional[dict]:
-    """Get a persona by ID."""
-    if not _registry:
-        _discover()
-    return _registry.get(persona_id)
+    """Get a persona by ID, loading only its own file."""
+    with _lock:
+        persona = _registry.get(persona_id)
+        if persona is None:
+            for entry in _ensure_manifest().values():
+                if entry["id"] == persona_id:
+                    path = PACKAGE_DIR / entry["file"]
+                    _load(path, path.stat())
+                    persona = _registry.get(persona_id)
+                    break
+        return persona
 
 
 def get_all() -> Dict[str, dict]:
-    """Get all registered personas."""
-    if not _registry:
-        _discover()
-    return dict(_registry)
+    """Get all registered personas (loads every persona file)."""
+    with _lock:
+        for persona_id in manifest():
+            get(persona_id)
+        return dict(_registry)
+
+
+def refresh() -> List[str]:
+    """Reload personas whose files changed on disk; returns the changed ids."""
+    with _lock:
+        if _manifest is None:
+            _ensure_manifest()
+            return []
+        return _scan(_manifest)
+
+
+class PersonaWatcher:
+    """Calls refresh() every `interval_s` and hands changed ids to `on_change`."""
+
+    def __init__(
+        self,
+        on_change: Callable[[List[str]], None],
+        interval_s: float = PERSONA_CHECK_INTERVAL_S,
+    ) -> None:
+        self.on_change = on_change
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="persona-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
 
+    def check(self) -> List[str]:
+        changed = refresh()
+        if changed:
+            logger.info(f"🔁 Personas changed: {changed}")
+            self.on_change(changed)
+        return changed
 
-# Auto-discover on import
-_discover()
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Persona refresh failed")
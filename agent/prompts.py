@@ -0,0 +1,223 @@
+"""
+Prompt Compiler
+================
+The one place system prompts are built, for both the agent worker
+(agent/main.py) and the API (CustomerConfig.get_full_system_prompt).
+
+Compiled prompts are memoized by (persona id, persona revision, language).
+A persona's revision changes on every store write, so edits never serve a
+stale prompt; the store also invalidates explicitly on update/delete.
+
+Compact mode (PROMPT_COMPACT=true, or "compact_prompt" on a persona) drops
+the default-workflow rules the persona lists in "covers_rules" (keys from
+WORKFLOW_RULE_KEYS), except the guardrails, which are always sent.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# =============================================================================
+# Language mapping
+# =============================================================================
+LANGUAGE_NAMES = {
+    "en": "English", "it": "Italian", "es": "Spanish", "fr": "French",
+    "de": "German", "pt": "Portuguese", "nl": "Dutch", "ja": "Japanese",
+    "ko": "Korean", "zh": "Chinese", "ar": "Arabic", "hi": "Hindi",
+    "ru": "Russian", "vi": "Vietnamese", "th": "Thai", "tr": "Turkish",
+}
+
+
+def get_language_name(code: str) -> str:
+    return LANGUAGE_NAMES.get(code, code)
+
+
+# Default workflow rules, keyed so a persona can list the ones its own
+# prompt already covers ("covers_rules"); compact mode drops those.
+# Guardrails are always sent, whatever the persona claims to cover.
+_WORKFLOW_HEADER = "DEFAULT MISSED-CALL ASSISTANT WORKFLOW:"
+_WORKFLOW_RULES: Tuple[Tuple[str, str], ...] = (
+    ("proactive_front_desk",
+     "Act like a proactive front-desk assistant for a small business, not a passive voicemail."),
+    ("no_voicemail",
+     "Never say the owner is unavailable, never ask the caller to leave a message, and never frame yourself as only a placeholder."),
+    ("strong_opening",
+     "Start strong: greet with the business name and position yourself as actively helping get the issue handled quickly."),
+    ("ask_need",
+     "Ask what the caller needs in a simple, natural way."),
+    ("guide_forward",
+     "Guide the conversation forward with calm confidence."),
+    ("example_phrasing",
+     "Say things like: 'I can help get this taken care of quickly,' 'Let me grab a couple details so we can move fast,' and 'I'll make sure the team gets this right away.'"),
+    ("collect_details",
+     "Collect the caller's name, what they need, urgency when relevant, and callback details if needed."),
+    ("confirm_details",
+     "Confirm the key details back clearly so the handoff feels already in motion."),
+    ("reassure_handoff",
+     "Reassure with confident but realistic language such as 'Perfect — I've got everything I need' and 'I'll pass this to the team right away so they can follow up as soon as possible.'"),
+    ("booking_link_timing",
+     "Only offer a booking link after you have collected the important details."),
+    ("close_cleanly",
+     "Close cleanly: thank the caller by name when possible and reinforce that the team will be in touch shortly."),
+    ("no_ai",
+     "Do not mention AI."),
+    ("no_invented_facts",
+     "Never invent pricing, availability, policies, or actions already taken."),
+    ("missing_info",
+     "If information is missing, say the team will follow up with specifics."),
+)
+GUARDRAIL_RULES = frozenset({"no_ai", "no_invented_facts"})
+WORKFLOW_RULE_KEYS = tuple(key for key, _ in _WORKFLOW_RULES)
+
+DEFAULT_WORKFLOW = _WORKFLOW_HEADER + "\n" + "\n".join(f"- {rule}" for _, rule in _WORKFLOW_RULES)
+
+# Opt-in for every persona; a persona can also set "compact_prompt": True.
+COMPACT_PROMPTS = os.getenv("PROMPT_COMPACT", "false").lower() == "true"
+
+
+def unknown_rules(keys: Iterable[str]) -> List[str]:
+    """Keys in a "covers_rules" list that name no workflow rule."""
+    return sorted(set(keys) - set(WORKFLOW_RULE_KEYS))
+
+
+def _workflow_block(covered: Iterable[str], compact: bool) -> str:
+    if not compact:
+        return DEFAULT_WORKFLOW
+    dropped = set(covered) - GUARDRAIL_RULES
+    rules = [rule for key, rule in _WORKFLOW_RULES if key not in dropped]
+    return _WORKFLOW_HEADER + "\n" + "\n".join(f"- {rule}" for rule in rules)
+
+
+def is_compact(persona: dict, compact: Optional[bool] = None) -> bool:
+    if compact is not None:
+        return compact
+    return bool(persona.get("compact_prompt") or COMPACT_PROMPTS)
+
+
+# =============================================================================
+# Compile
+# =============================================================================
+def compile_system_prompt(
+    persona: dict,
+    language: str = "en",
+    compact: Optional[bool] = None,
+) -> str:
+    parts = []
+    if language != "en":
+        lang_name = get_language_name(language)
+        parts.append(
+            f"CRITICAL LANGUAGE RULE: You MUST speak and respond ONLY in {lang_name}. "
+            f"All your spoken output must be in {lang_name}. "
+            f"Never switch to English unless the user explicitly asks you to."
+        )
+    persona_prompt = persona.get("system_prompt") or (
+        f"You are {persona['agent_name']}, helping with {persona.get('name', 'the business')}. "
+        "You sound like a real front-desk assistant who moves the situation forward."
+    )
+    parts.append(persona_prompt)
+    parts.append(_workflow_block(persona.get("covers_rules") or (), is_compact(persona, compact)))
+
+    if category := persona.get("business_category"):
+        parts.append(f"Business category: {category}.")
+    if services := persona.get("services"):
+        parts.append(f"Services offered: {', '.join(services)}.")
+    if service_area := persona.get("service_area"):
+        parts.append(f"Service area: {service_area}.")
+    if hours := persona.get("business_hours"):
+        parts.append(f"Business hours: {hours}.")
+    if address := persona.get("business_address"):
+        parts.append(f"Located at: {address}.")
+    if questions := persona.get("common_customer_questions"):
+        parts.append(
+            "Common customer questions to help with: "
+            f"{', '.join(questions)}."
+        )
+    if persona.get("booking_link_enabled") and persona.get("booking_link_url"):
+        parts.append(
+            "Optional booking link for callers after details are collected: "
+            f"{persona['booking_link_url']}."
+        )
+
+    return "\n\n".join(parts)
+
+
+def prompt_size(prompt: str) -> Dict[str, int]:
+    """Size of a prompt in UTF-8 bytes and approximate tokens (~4 chars each)."""
+    return {
+        "chars": len(prompt),
+        "bytes": len(prompt.encode("utf-8")),
+        "approx_tokens": math.ceil(len(prompt) / 4),
+    }
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+class PromptCache:
+    """Bounded memo of compiled prompts keyed by (id, revision, language, compact)."""
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._prompts: "OrderedDict[Tuple[str, object, str, bool], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._prompts)
+
+    def get(self, persona: dict, language: str = "en", compact: Optional[bool] = None) -> str:
+        compact = is_compact(persona, compact)
+        revision = persona.get("revision")
+        if revision == 0:
+            # Unsaved CustomerConfig: content is not pinned by a revision.
+            return compile_system_prompt(persona, language, compact)
+
+        key = (persona["id"], revision, language, compact)
+        with self._lock:
+            prompt = self._prompts.get(key)
+            if prompt is not None:
+                self._prompts.move_to_end(key)
+                self.hits += 1
+                return prompt
+
+        prompt = compile_system_prompt(persona, language, compact)
+        with self._lock:
+            self.misses += 1
+            self._prompts[key] = prompt
+            while len(self._prompts) > self.max_size:
+                self._prompts.popitem(last=False)
+        return prompt
+
+    def invalidate(self, persona_id: Optional[str] = None) -> None:
+        with self._lock:
+            if persona_id is None:
+                self._prompts.clear()
+                return
+            for key in [k for k in self._prompts if k[0] == persona_id]:
+                del self._prompts[key]
+
+    def precompute(
+        self,
+        personas: Iterable[dict],
+        languages: Iterable[str] = LANGUAGE_NAMES,
+    ) -> int:
+        """Compile every persona × language up front. Returns prompts built."""
+        languages = list(languages)
+        count = 0
+        for persona in personas:
+            for language in languages:
+                self.get(persona, language)
+                count += 1
+        return count
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._prompts), "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide cache
+prompt_cache = PromptCache()
@@ -0,0 +1,194 @@
+"""
+Transcript Publisher
+=====================
+Per-session outbound queue for transcript updates on the LiveKit data
+channel. Replaces one fire-and-forget task per update with a single
+sender that:
+
+- sends in order, one publish at a time
+- coalesces updates for the same entry that have not been sent yet
+  (incremental STT finals collapse into the latest text)
+- caps queued bytes; over the cap, queued "replace" updates are dropped
+  first, then the new update
+- optionally encodes with msgpack on a dedicated topic
+
+Every message carries a schema version ("v") and the entry index ("id").
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from agent.transcript import format_timestamp
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore
+
+logger = logging.getLogger("agent.publisher")
+
+SCHEMA_VERSION = 1
+JSON_TOPIC = ""                             # default topic the frontend already reads
+MSGPACK_TOPIC = f"lisa.transcript.v{SCHEMA_VERSION}+msgpack"
+
+PUBLISH_FORMAT = os.getenv("TRANSCRIPT_PUBLISH_FORMAT", "json").lower()
+MAX_QUEUED_BYTES = int(os.getenv("TRANSCRIPT_PUBLISH_MAX_BYTES", str(256 * 1024)))
+
+_OVERHEAD_BYTES = 96  # rough per-message envelope size
+
+
+class TranscriptPublisher:
+    """Ordered, coalescing, bounded data-channel publisher for one session."""
+
+    def __init__(
+        self,
+        room,
+        encoding: str = PUBLISH_FORMAT,
+        max_queued_bytes: int = MAX_QUEUED_BYTES,
+    ) -> None:
+        self.room = room
+        if encoding == "msgpack" and msgpack is None:
+            logger.warning("msgpack not installed; publishing transcripts as JSON")
+            encoding = "json"
+        self.encoding = encoding
+        self.topic = MSGPACK_TOPIC if encoding == "msgpack" else JSON_TOPIC
+        self.max_queued_bytes = max_queued_bytes
+
+        self._queue: Deque[dict] = deque()
+        self._unsent: Dict[int, dict] = {}   # entry index → queued message
+        self._queued_bytes = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # ── Enqueue ─────────────────────────────────────────────────────────────
+
+    def publish(
+        self,
+        role: str,
+        text: str,
+        action: str,
+        index: int,
+        wall_time: Optional[float] = None,
+    ) -> None:
+        if self.room is None or self._closing:
+            return
+        wall_time = time.time() if wall_time is None else wall_time
+
+        pending = self._unsent.get(index)
+        if pending is not None:
+            # Superseded before it went out: send only the latest text.
+            self._queued_bytes += len(text) - len(pending["text"])
+            pending["text"] = text
+            pending["timestamp"] = wall_time
+            self.coalesced += 1
+            return
+
+        size = len(text) + _OVERHEAD_BYTES
+        while self._queued_bytes + size > self.max_queued_bytes and self._drop_oldest_replace():
+            pass
+        if self._queued_bytes + size > self.max_queued_bytes:
+            self.dropped += 1
+            return
+
+        message = {
+            "v": SCHEMA_VERSION,
+            "type": "transcript",
+            "id": index,
+            "role": role,
+            "text": text,
+            "action": action,
+            "timestamp": wall_time,    # formatted only when sent
+        }
+        self._queue.append(message)
+        self._unsent[index] = message
+        self._queued_bytes += size
+        self._ensure_sender()
+
+    def _drop_oldest_replace(self) -> bool:
+        for message in self._queue:
+            if message["action"] == "replace":
+                self._queue.remove(message)
+                self._forget(message)
+                self.dropped += 1
+                return True
+        return False
+
+    def _forget(self, message: dict) -> None:
+        if self._unsent.get(message["id"]) is message:
+            del self._unsent[message["id"]]
+        self._queued_bytes -= len(message["text"]) + _OVERHEAD_BYTES
+
+    # ── Sender ──────────────────────────────────────────────────────────────
+
+    def _ensure_sender(self) -> None:
+        if self._task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+
+    def _encode(self, message: dict) -> bytes:
+        message["timestamp"] = format_timestamp(message["timestamp"])
+        if self.encoding == "msgpack":
+            return msgpack.packb(message, use_bin_type=True)
+        return json.dumps(message).encode("utf-8")
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            message = self._queue.popleft()
+            self._forget(message)
+            try:
+                await self.room.local_participant.publish_data(
+                    self._encode(message), reliable=True, topic=self.topic
+                )
+                self.sent += 1
+            except Exception:
+                self.failed += 1
+                logger.warning("Could not publish transcript to data channel", exc_info=True)
+
+    async def aclose(self, timeout_s: float = 2.0) -> None:
+        """Flush what is queued (bounded by timeout_s), then stop."""
+        self._closing = True
+        if self._task is None:
+            return
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout_s)
+        except asyncio.TimeoutError:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._unsent.clear()
+            self._queued_bytes = 0
+            logger.warning("Transcript publisher did not drain in time; dropping the rest")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "queued": len(self._queue),
+            "queued_bytes": self._queued_bytes,
+        }
@@ -3,13 +3,24 @@ Session Recorder (TRANSCRIPT-ONLY)
 ==================================
 Saves ONLY the full transcript (both sides) to local files.
 Also publishes transcript entries to the LiveKit room data channel
-so the frontend can display them in real time.
+so the frontend can display them in real time (see agent/publisher.py).
+Session events go to a per-session flight recorder (agent/flight_recorder.py)
+instead of the log.
 
-Output structure:
+Output structure (see transcripts/storage.py):
   recordings/
-    <customer>_<session>_<timestamp>/
+    <customer>/<YYYY>/<MM>/<DD>/<session>_<HHMMSS>/
+      transcript.jsonl  (streaming mode, while the call runs)
       transcript.json
       metadata.json   (optional)
+
+Saved sessions are added to the search index (transcripts/index.py)
+unless TRANSCRIPT_INDEXING=false.
+
+In streaming mode (TRANSCRIPT_STREAMING, default on) every entry and
+"replace" is appended to transcript.jsonl by a background writer and
+compacted into transcript.json at close. The session directory is
+created on the first entry, and no file I/O runs on the event loop.
 """
 
 from __future__ import annotations
@@ -17,21 +28,24 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from dataclasses import dataclass
+import os
 from datetime import datetime
-from pathlib import Path
 
-logger = logging.getLogger("agent.recorder")
+from agent import flight_recorder
+from agent.flight_recorder import FlightRecorder
+from agent.publisher import TranscriptPublisher
+from agent.transcript import TranscriptStore
+from agent.transcript_writer import JSONL_NAME, TranscriptWriter, compact
+from transcripts.index import get_index
+from transcripts.storage import RECORDINGS_DIR, session_dir
 
-# Where transcripts are saved
-RECORDINGS_DIR = Path(__file__).resolve().parents[1] / "recordings"
+logger = logging.getLogger("agent.recorder")
 
+STREAM_TRANSCRIPTS = os.getenv("TRANSCRIPT_STREAMING", "true").lower() == "true"
+INDEX_TRANSCRIPTS = os.getenv("TRANSCRIPT_INDEXING", "true").lower() == "true"
 
-@dataclass
-class TranscriptEntry:
-    role: str          # "user" | "agent"
-    text: str
-    timestamp: str     # ISO-8601
+# Entries kept in memory in streaming mode (the rest live only on disk).
+MEMORY_WINDOW = 32
 
 
 class SessionRecorder:
@@ -46,6 +60,7 @@ class SessionRecorder:
         language: str = "en",
         save_metadata: bool = True,
         room=None,
+        stream: bool | None = None,
     ):
         self.session_id = session_id
         self.customer_id = customer_id
@@ -54,80 +69,84 @@ class SessionRecorder:
         self.language = language
         self.save_metadata = save_metadata
         self.room = room
+        self._publisher = TranscriptPublisher(room)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_dir = RECORDINGS_DIR / f"{customer_id}_{session_id}_{timestamp}"
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        self._transcript: list[TranscriptEntry] = []
         self._started_at = datetime.now()
+        self.output_dir = session_dir(RECORDINGS_DIR, customer_id, session_id, self._started_at)
+        self.stream = STREAM_TRANSCRIPTS if stream is None else stream
+        self._writer = TranscriptWriter(self.output_dir / JSONL_NAME) if self.stream else None
+
+        self._transcript = TranscriptStore()
+        self.timings: dict[str, float] = {}
+        self.flight = FlightRecorder(session_id)
 
         logger.info(f"📝 Transcript recorder ready → {self.output_dir}")
 
-    # ── Publish transcript entry to LiveKit data channel ──────────────────
+    def record_timing(self, name: str, seconds: float) -> None:
+        """Store a per-session latency measurement (saved in metadata.json)."""
+        self.timings[name] = round(seconds, 4)
 
-    def _publish_to_room(self, role: str, text: str, action: str = "add") -> None:
-        """Publish a transcript entry to the LiveKit room so the frontend can display it."""
-        if not self.room:
-            return
-        try:
-            payload = json.dumps({
-                "type": "transcript",
-                "role": role,
-                "text": text,
-                "action": action,
-                "timestamp": datetime.now().isoformat(),
-            }).encode("utf-8")
-            loop = asyncio.get_running_loop()
-            loop.create_task(
-                self.room.local_participant.publish_data(payload, reliable=True)
-            )
-        except Exception:
-            logger.debug("Could not publish transcript to data channel", exc_info=True)
+    # ── Publish transcript entry to LiveKit data channel ──────────────────
 
-    def _last_entry_by_role(self, role: str) -> TranscriptEntry | None:
-        for entry in reversed(self._transcript):
-            if entry.role == role:
-                return entry
-        return None
+    def _publish_to_room(self, index: int, action: str = "add") -> None:
+        """Queue a transcript entry for the LiveKit room so the frontend can display it."""
+        t = self._transcript
+        self._publisher.publish(t.role(index), t.text(index), action, index, t.wall_time(index))
+
+    def _append_entry(self, role: str, text: str) -> int:
+        t = self._transcript
+        index = t.append(role, text)
+        if self._writer:
+            self._writer.append({
+                "op": "add", "i": index, "role": role,
+                "text": text, "t": t.wall_time(index),
+            })
+            t.trim(MEMORY_WINDOW)
+        return index
+
+    def _replace_entry(self, index: int, text: str) -> None:
+        t = self._transcript
+        t.replace(index, text)
+        if self._writer:
+            self._writer.append({
+                "op": "replace", "i": index,
+                "text": text, "t": t.wall_time(index),
+            })
 
     # ── Session-level: capture transcript ───────────────────────────────────
 
     def attach_to_session(self, session) -> None:
         """Hook into AgentSession events to capture the conversation transcript."""
+        flight = self.flight
+        flight_recorder.register(flight)
 
         @session.on("user_input_transcribed")
         def _on_user_speech(ev):
             if not getattr(ev, "is_final", False):
                 return
             text = (getattr(ev, "transcript", None) or "").strip()
+            flight.record("user_final", chars=len(text))
             if not text:
                 return
 
             # Deduplicate: if new text is a superset of the last user entry,
             # replace it instead of adding a new one (STT sends incremental finals)
-            last = self._last_entry_by_role("user")
-            if last and (text.startswith(last.text) or last.text.startswith(text)):
-                last.text = text
-                last.timestamp = datetime.now().isoformat()
-                self._publish_to_room("user", text, action="replace")
+            last = self._transcript.last_index("user")
+            last_text = self._transcript.text(last) if last >= 0 else None
+            if last_text and (text.startswith(last_text) or last_text.startswith(text)):
+                self._replace_entry(last, text)
+                self._publish_to_room(last, action="replace")
                 logger.debug(f"📝 User (updated): {text[:120]}")
             else:
-                self._transcript.append(
-                    TranscriptEntry(
-                        role="user",
-                        text=text,
-                        timestamp=datetime.now().isoformat(),
-                    )
-                )
-                self._publish_to_room("user", text, action="add")
+                index = self._append_entry("user", text)
+                self._publish_to_room(index, action="add")
                 logger.debug(f"📝 User: {text[:120]}")
 
         @session.on("conversation_item_added")
         def _on_conversation_item(ev):
             message = ev.item
             role = getattr(message, "role", None)
-            logger.info(f"📨 conversation_item_added: role={role}")
+            flight.record("item", role=role)
 
             if role != "assistant":
                 return
@@ -136,15 +155,40 @@ class SessionRecorder:
             if text:
                 self._add_agent_entry(text)
 
-        def _debug_events(name: str):
-            """Register a catch-all debug listener."""
-            @session.on(name)
-            def _handler(ev):
-                logger.info(f"🔍 Event '{name}': {type(ev).__name__} — {str(ev)[:200]}")
+        # Structured, buffered records instead of logging every event.
+        @session.on("agent_state_changed")
+        def _on_agent_state(ev):
+            flight.record(
+                "agent_state", old=getattr(ev, "old_state", None), new=getattr(ev, "new_state", None)
+            )
+
+        @session.on("speech_created")
+        def _on_speech_created(ev):
+            flight.record(
+                "speech", source=getattr(ev, "source", None), user=getattr(ev, "user_initiated", None)
+            )
 
-        # Register debug listeners for agent-related events
-        for evt in ("agent_state_changed", "speech_created"):
-            _debug_events(evt)
+        @session.on("error")
+        def _on_error(ev):
+            error = getattr(ev, "error", None)
+            flight.record(
+                "error",
+                type=type(error).__name__,
+                recoverable=getattr(error, "recoverable", None),
+                message=str(error)[:200],
+            )
+            flight.trigger("error")
+
+        @session.on("close")
+        def _on_close(ev=None):
+            error = getattr(ev, "error", None)
+            flight.record(
+                "close",
+                reason=str(getattr(ev, "reason", "")),
+                error=type(error).__name__ if error else None,
+            )
+            if error is not None:
+                flight.trigger("close_error")
 
     def _extract_text(self, message) -> str:
         """Extract text from a ChatMessage, handling various content formats."""
@@ -175,61 +219,74 @@ class SessionRecorder:
 
     def _add_agent_entry(self, text: str) -> None:
         """Add an agent transcript entry, deduplicating if needed."""
-        last = self._last_entry_by_role("agent")
-        if last and last.text == text:
+        last = self._transcript.last_index("agent")
+        if last >= 0 and self._transcript.text(last) == text:
             return  # exact duplicate, skip
 
-        self._transcript.append(
-            TranscriptEntry(
-                role="agent",
-                text=text,
-                timestamp=datetime.now().isoformat(),
-            )
-        )
-        self._publish_to_room("agent", text, action="add")
-        logger.info(f"📝 Agent: {text[:120]}")
+        index = self._append_entry("agent", text)
+        self._publish_to_room(index, action="add")
+        logger.debug(f"📝 Agent: {text[:120]}")
 
     # ── Save transcript (and optional metadata) ─────────────────────────────
 
-    async def save(self) -> dict:
-        """
-        Save transcript to disk. Call this when the session ends.
-        Returns a summary dict of saved file paths.
-        """
+    def _metadata(self) -> dict:
+        ended_at = datetime.now()
+        return {
+            "session_id": self.session_id,
+            "customer_id": self.customer_id,
+            "user_name": self.user_name,
+            "agent_name": self.agent_name,
+            "language": self.language,
+            "started_at": self._started_at.isoformat(),
+            "ended_at": ended_at.isoformat(),
+            "duration_seconds": (ended_at - self._started_at).total_seconds(),
+            "transcript_entries": len(self._transcript),
+            "timings": self.timings,
+            "publisher": self._publisher.stats(),
+        }
+
+    def _write_json(self, metadata: dict | None) -> dict:
+        """Non-streaming save: dump the in-memory transcript (blocking)."""
         saved_files: dict[str, str] = {}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # 1) Save transcript
         transcript_path = self.output_dir / "transcript.json"
-        transcript_payload = [
-            {"role": e.role, "text": e.text, "timestamp": e.timestamp}
-            for e in self._transcript
-        ]
+        transcript_payload = self._transcript.to_list()
         with open(transcript_path, "w", encoding="utf-8") as f:
             json.dump(transcript_payload, f, indent=2, ensure_ascii=False)
-
         saved_files["transcript"] = str(transcript_path)
-        logger.info(f"💾 Transcript: {transcript_path} ({len(self._transcript)} entries)")
-
-        # 2) Save metadata (optional)
-        if self.save_metadata:
-            ended_at = datetime.now()
-            metadata = {
-                "session_id": self.session_id,
-                "customer_id": self.customer_id,
-                "user_name": self.user_name,
-                "agent_name": self.agent_name,
-                "language": self.language,
-                "started_at": self._started_at.isoformat(),
-                "ended_at": ended_at.isoformat(),
-                "duration_seconds": (ended_at - self._started_at).total_seconds(),
-                "transcript_entries": len(self._transcript),
-            }
+
+        if metadata is not None:
             metadata_path = self.output_dir / "metadata.json"
             with open(metadata_path, "w", encoding="utf-8") as f:
                 json.dump(metadata, f, indent=2, ensure_ascii=False)
-
             saved_files["metadata"] = str(metadata_path)
-            logger.info(f"💾 Metadata: {metadata_path}")
+        return saved_files
 
+    async def save(self) -> dict:
+        """
+        Save transcript to disk. Call this when the session ends.
+        Returns a summary dict of saved file paths.
+        File I/O runs in a worker thread, never on the event loop.
+        """
+        flight_recorder.unregister(self.flight)
+        await self._publisher.aclose()
+        metadata = self._metadata() if self.save_metadata else None
+
+        if self._writer:
+            await asyncio.to_thread(self._writer.close)
+            saved_files = await asyncio.to_thread(compact, self.output_dir, metadata)
+        else:
+            saved_files = await asyncio.to_thread(self._write_json, metadata)
+
+        logger.info(f"💾 Transcript: {saved_files['transcript']} ({len(self._transcript)} entries)")
+        if "metadata" in saved_files:
+            logger.info(f"💾 Metadata: {saved_files['metadata']}")
         logger.info(f"✅ Transcript saved → {self.output_dir}")
-        return saved_files
\ No newline at end of file
+
+        if INDEX_TRANSCRIPTS:
+            try:
+                await asyncio.to_thread(get_index().index_session, self.output_dir, force=True)
+            except Exception:
+                logger.warning("⚠️ Could not add session to the transcript index", exc_info=True)
+        return saved_files
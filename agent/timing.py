@@ -0,0 +1,42 @@
+"""
+Phase Timing
+=============
+Lightweight timing spans for the call-setup path. Durations end up in
+the session's metadata.json under "timings" (via SessionRecorder).
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+
+class PhaseTimer:
+    """Named durations (span) and offsets from job start (mark), in seconds."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.started = clock()
+        self.spans: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.spans[f"{name}_s"] = self._clock() - start
+
+    def mark(self, name: str) -> float:
+        """Record the time elapsed since the timer was created."""
+        elapsed = self._clock() - self.started
+        self.spans[f"{name}_s"] = elapsed
+        return elapsed
+
+    def record(self, name: str, seconds: float) -> None:
+        self.spans[f"{name}_s"] = seconds
+
+    def flush_to(self, recorder) -> None:
+        for name, seconds in self.spans.items():
+            recorder.record_timing(name, seconds)
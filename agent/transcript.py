@@ -0,0 +1,100 @@
+"""
+Transcript Store
+=================
+Compact in-memory transcript for one session.
+
+Entries live in parallel arrays (role codes, texts, monotonic float
+timestamps) instead of one object per entry. Timestamps are formatted
+to ISO-8601 only when serialized. The last index per role is tracked,
+so the recorder's dedupe lookup and "replace" are both O(1).
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List
+
+ROLES = ("user", "agent")
+_ROLE_CODE = {role: code for code, role in enumerate(ROLES)}
+
+
+class TranscriptStore:
+    """Append/replace-only transcript with O(1) last-entry-by-role lookup."""
+
+    __slots__ = ("_roles", "_texts", "_times", "_last", "_offset", "_wall0", "_mono0")
+
+    def __init__(self) -> None:
+        self._roles = array("b")
+        self._texts: List[str] = []
+        self._times = array("d")
+        self._last = [-1] * len(ROLES)     # absolute index of last entry per role
+        self._offset = 0                   # absolute index of _texts[0] (after trim)
+        self._wall0 = time.time()
+        self._mono0 = time.monotonic()
+
+    def __len__(self) -> int:
+        """Total entries ever appended (including trimmed ones)."""
+        return self._offset + len(self._texts)
+
+    # ── Writes ──────────────────────────────────────────────────────────────
+
+    def append(self, role: str, text: str) -> int:
+        code = _ROLE_CODE[role]
+        index = len(self)
+        self._roles.append(code)
+        self._texts.append(text)
+        self._times.append(time.monotonic())
+        self._last[code] = index
+        return index
+
+    def replace(self, index: int, text: str) -> None:
+        i = index - self._offset
+        self._texts[i] = text
+        self._times[i] = time.monotonic()
+
+    def trim(self, keep: int) -> None:
+        """Forget all but the newest `keep` entries (they are persisted elsewhere)."""
+        drop = len(self._texts) - keep
+        if drop <= 0:
+            return
+        del self._roles[:drop]
+        del self._texts[:drop]
+        del self._times[:drop]
+        self._offset += drop
+
+    # ── Reads ───────────────────────────────────────────────────────────────
+
+    def last_index(self, role: str) -> int:
+        """Absolute index of the newest entry for a role still in memory, else -1."""
+        index = self._last[_ROLE_CODE[role]]
+        return index if index >= self._offset else -1
+
+    def role(self, index: int) -> str:
+        return ROLES[self._roles[index - self._offset]]
+
+    def text(self, index: int) -> str:
+        return self._texts[index - self._offset]
+
+    def wall_time(self, index: int) -> float:
+        """Unix time of an entry, derived from its monotonic timestamp."""
+        return self._wall0 + (self._times[index - self._offset] - self._mono0)
+
+    def timestamp(self, index: int) -> str:
+        return format_timestamp(self.wall_time(index))
+
+    def to_list(self) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": ROLES[self._roles[i]],
+                "text": self._texts[i],
+                "timestamp": format_timestamp(self._wall0 + (self._times[i] - self._mono0)),
+            }
+            for i in range(len(self._texts))
+        ]
+
+
+def format_timestamp(wall_time: float) -> str:
+    """Local-time ISO-8601, as datetime.now().isoformat() would produce."""
+    return datetime.fromtimestamp(wall_time).isoformat()
@@ -0,0 +1,150 @@
+"""
+Transcript Writer (append-only JSONL)
+======================================
+Streams transcript operations to <session dir>/transcript.jsonl from a
+background thread, so no disk I/O runs on the worker's event loop and a
+crashed worker still leaves everything up to the last fsync on disk.
+
+Each line is one operation:
+  {"op": "add",     "i": 0, "role": "user", "text": "...", "timestamp": "..."}
+  {"op": "replace", "i": 0, "text": "...", "timestamp": "..."}
+
+Records are queued with a raw wall-clock "t"; it is formatted to the
+ISO "timestamp" here, off the event loop.
+
+At session end the log is compacted into transcript.json (see compact()).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from agent.transcript import format_timestamp
+
+logger = logging.getLogger("agent.transcript_writer")
+
+JSONL_NAME = "transcript.jsonl"
+
+_STOP = object()
+
+
+class TranscriptWriter:
+    """Background appender for one session's transcript.jsonl."""
+
+    def __init__(self, path: Path, fsync_interval_s: float = 1.0) -> None:
+        self.path = path
+        self.fsync_interval_s = fsync_interval_s
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def append(self, record: dict) -> None:
+        """Queue one operation. Starts the writer (and creates the directory) lazily."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name=f"transcript-{self.path.parent.name}", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(record)
+
+    def close(self) -> None:
+        """Flush, fsync and stop the writer. Blocking — call via asyncio.to_thread."""
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+
+    def _run(self) -> None:
+        f = None
+        dirty = False
+        last_sync = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.fsync_interval_s)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if item is not None:
+                    if "t" in item:
+                        item["timestamp"] = format_timestamp(item.pop("t"))
+                    if f is None:
+                        self.path.parent.mkdir(parents=True, exist_ok=True)
+                        f = open(self.path, "a", encoding="utf-8")
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    self.written += 1
+                    dirty = True
+                if f is not None and dirty and (
+                    item is None or time.monotonic() - last_sync >= self.fsync_interval_s
+                ):
+                    f.flush()
+                    os.fsync(f.fileno())
+                    dirty = False
+                    last_sync = time.monotonic()
+        except Exception:
+            logger.exception(f"Transcript writer failed for {self.path}")
+        finally:
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+
+
+def replay(path: Path) -> List[dict]:
+    """Rebuild the transcript from a JSONL log (tolerates a torn last line)."""
+    entries: List[dict] = []
+    if not path.exists():
+        return entries
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line in {path}")
+                continue
+            if op.get("op") == "add":
+                entries.append({"role": op["role"], "text": op["text"], "timestamp": op["timestamp"]})
+            elif op.get("op") == "replace" and 0 <= op.get("i", -1) < len(entries):
+                entries[op["i"]]["text"] = op["text"]
+                entries[op["i"]]["timestamp"] = op["timestamp"]
+    return entries
+
+
+def compact(output_dir: Path, metadata: Optional[dict] = None, keep_log: bool = False) -> dict:
+    """
+    Write transcript.json (and metadata.json) from transcript.jsonl.
+    Blocking — call via asyncio.to_thread. Returns saved file paths.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    log_path = output_dir / JSONL_NAME
+    entries = replay(log_path)
+    saved: dict = {}
+
+    transcript_path = output_dir / "transcript.json"
+    with open(transcript_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
+    saved["transcript"] = str(transcript_path)
+
+    if metadata is not None:
+        metadata = {**metadata, "transcript_entries": len(entries)}
+        metadata_path = output_dir / "metadata.json"
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        saved["metadata"] = str(metadata_path)
+
+    if not keep_log and log_path.exists():
+        log_path.unlink()
+    return saved
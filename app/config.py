@@ -3,34 +3,117 @@ Lisa Voice Agent — Configuration
 =================================
 Only two services needed: LiveKit + xAI.
 xAI Realtime handles STT + LLM + TTS in one model.
+
+Values are read into an immutable ConfigSnapshot. The snapshot is only
+rebuilt when .env / .env.local change on disk (mtime) or when
+Config.reload() is called (the API also wires this to SIGHUP).
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 try:
-    from dotenv import load_dotenv
+    from dotenv import dotenv_values
 except ImportError:
-    load_dotenv = None  # type: ignore
+    dotenv_values = None  # type: ignore
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 ENV_FILE = PROJECT_ROOT / ".env"
 ENV_LOCAL_FILE = PROJECT_ROOT / ".env.local"
 
+# How often (seconds) we stat the env files to look for changes.
+ENV_CHECK_INTERVAL_S = 1.0
+
+# Keys we injected into os.environ from the env files. Real process
+# environment always wins; only these keys are updated on reload.
+_file_values: Dict[str, str] = {}
+
 
 def _load_env_files() -> None:
-    if load_dotenv is None:
+    if dotenv_values is None:
         return
-    if ENV_FILE.exists():
-        load_dotenv(ENV_FILE, override=False)
-    if ENV_LOCAL_FILE.exists():
-        load_dotenv(ENV_LOCAL_FILE, override=False)
-
+    # Same precedence as load_dotenv(override=False) in order .env, .env.local:
+    # process env > .env > .env.local
+    merged: Dict[str, str] = {}
+    for path in (ENV_LOCAL_FILE, ENV_FILE):
+        if path.exists():
+            merged.update({k: v for k, v in dotenv_values(path).items() if v is not None})
+
+    for key in list(_file_values):
+        if key not in merged:
+            os.environ.pop(key, None)
+            del _file_values[key]
+    for key, value in merged.items():
+        if key in os.environ and key not in _file_values:
+            continue
+        os.environ[key] = value
+        _file_values[key] = value
+
+
+def _env_mtimes() -> Tuple[Optional[int], ...]:
+    mtimes = []
+    for path in (ENV_FILE, ENV_LOCAL_FILE):
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of the configuration at one point in time."""
+
+    PORT: int
+    DEBUG: bool
+    LIVEKIT_URL: str
+    LIVEKIT_API_KEY: str
+    LIVEKIT_API_SECRET: str
+    XAI_API_KEY: str
+    SESSIONS_MAX: int = 10_000
+    SESSIONS_ENDED_TTL_S: float = 3600.0
+    WORKERS: int = 1
+    STATE_BACKEND: str = "memory"
+    STATE_DB_PATH: str = ""
+    ROOM_POOL: str = ""
+    ROOM_POOL_TTL_S: float = 300.0
 
-_load_env_files()
+    @classmethod
+    def from_env(cls) -> "ConfigSnapshot":
+        workers = max(1, int(os.getenv("API_WORKERS", "1")))
+        return cls(
+            PORT=int(os.getenv("PORT", "8000")),
+            DEBUG=os.getenv("DEBUG", "true").lower() == "true",
+            LIVEKIT_URL=os.getenv("LIVEKIT_URL", ""),
+            LIVEKIT_API_KEY=os.getenv("LIVEKIT_API_KEY", ""),
+            LIVEKIT_API_SECRET=os.getenv("LIVEKIT_API_SECRET", ""),
+            XAI_API_KEY=os.getenv("XAI_API_KEY", ""),
+            SESSIONS_MAX=int(os.getenv("SESSIONS_MAX", "10000")),
+            SESSIONS_ENDED_TTL_S=float(os.getenv("SESSIONS_ENDED_TTL_S", "3600")),
+            WORKERS=workers,
+            # Worker processes cannot share an in-memory registry.
+            STATE_BACKEND=os.getenv("STATE_BACKEND") or ("sqlite" if workers > 1 else "memory"),
+            STATE_DB_PATH=os.getenv("STATE_DB_PATH") or str(PROJECT_ROOT / "data" / "state.db"),
+            ROOM_POOL=os.getenv("ROOM_POOL", ""),
+            ROOM_POOL_TTL_S=float(os.getenv("ROOM_POOL_TTL_S", "300")),
+        )
+
+    @property
+    def livekit_configured(self) -> bool:
+        return bool(self.LIVEKIT_URL and self.LIVEKIT_API_KEY and self.LIVEKIT_API_SECRET)
+
+    @property
+    def xai_configured(self) -> bool:
+        return bool(self.XAI_API_KEY)
+
+    def status(self) -> Dict[str, bool]:
+        return {"livekit": self.livekit_configured, "xai": self.xai_configured}
 
 
 class Config:
@@ -38,40 +121,86 @@ class Config:
 
     HOST: str = "0.0.0.0"
 
+    # Mirrors of the current snapshot, kept for existing callers.
+    PORT: int
+    DEBUG: bool
+    LIVEKIT_URL: str
+    LIVEKIT_API_KEY: str
+    LIVEKIT_API_SECRET: str
+    XAI_API_KEY: str
+    SESSIONS_MAX: int
+    SESSIONS_ENDED_TTL_S: float
+    WORKERS: int
+    STATE_BACKEND: str
+    STATE_DB_PATH: str
+    ROOM_POOL: str
+    ROOM_POOL_TTL_S: float
+
+    _lock = threading.Lock()
+    _snapshot: ConfigSnapshot
+    _mtimes: Tuple[Optional[int], ...] = ()
+    _next_check: float = 0.0
+    reload_count: int = 0
+
     @classmethod
-    def refresh(cls) -> None:
-        _load_env_files()
-        cls.PORT = int(os.getenv("PORT", "8000"))
-        cls.DEBUG = os.getenv("DEBUG", "true").lower() == "true"
-        cls.LIVEKIT_URL = os.getenv("LIVEKIT_URL", "")
-        cls.LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY", "")
-        cls.LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "")
-        cls.XAI_API_KEY = os.getenv("XAI_API_KEY", "")
+    def _apply(cls, snap: ConfigSnapshot) -> None:
+        cls._snapshot = snap
+        cls.PORT = snap.PORT
+        cls.DEBUG = snap.DEBUG
+        cls.LIVEKIT_URL = snap.LIVEKIT_URL
+        cls.LIVEKIT_API_KEY = snap.LIVEKIT_API_KEY
+        cls.LIVEKIT_API_SECRET = snap.LIVEKIT_API_SECRET
+        cls.XAI_API_KEY = snap.XAI_API_KEY
+        cls.SESSIONS_MAX = snap.SESSIONS_MAX
+        cls.SESSIONS_ENDED_TTL_S = snap.SESSIONS_ENDED_TTL_S
+        cls.WORKERS = snap.WORKERS
+        cls.STATE_BACKEND = snap.STATE_BACKEND
+        cls.STATE_DB_PATH = snap.STATE_DB_PATH
+        cls.ROOM_POOL = snap.ROOM_POOL
+        cls.ROOM_POOL_TTL_S = snap.ROOM_POOL_TTL_S
 
-    # Initialize on import
-    PORT: int = int(os.getenv("PORT", "8000"))
-    DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
+    @classmethod
+    def reload(cls) -> ConfigSnapshot:
+        """Re-read the env files and rebuild the snapshot unconditionally."""
+        with cls._lock:
+            cls._mtimes = _env_mtimes()
+            _load_env_files()
+            cls._apply(ConfigSnapshot.from_env())
+            cls.reload_count += 1
+            cls._next_check = time.monotonic() + ENV_CHECK_INTERVAL_S
+            return cls._snapshot
 
-    LIVEKIT_URL: str = os.getenv("LIVEKIT_URL", "")
-    LIVEKIT_API_KEY: str = os.getenv("LIVEKIT_API_KEY", "")
-    LIVEKIT_API_SECRET: str = os.getenv("LIVEKIT_API_SECRET", "")
+    @classmethod
+    def snapshot(cls) -> ConfigSnapshot:
+        """Current snapshot; rebuilt only if an env file changed on disk."""
+        now = time.monotonic()
+        if now < cls._next_check:
+            return cls._snapshot
+        cls._next_check = now + ENV_CHECK_INTERVAL_S
+        if _env_mtimes() != cls._mtimes:
+            return cls.reload()
+        return cls._snapshot
 
-    XAI_API_KEY: str = os.getenv("XAI_API_KEY", "")
+    @classmethod
+    def refresh(cls) -> None:
+        cls.snapshot()
 
     @classmethod
     def is_livekit_configured(cls) -> bool:
-        cls.refresh()
-        return bool(cls.LIVEKIT_URL and cls.LIVEKIT_API_KEY and cls.LIVEKIT_API_SECRET)
+        return cls.snapshot().livekit_configured
 
     @classmethod
     def is_xai_configured(cls) -> bool:
-        cls.refresh()
-        return bool(cls.XAI_API_KEY)
+        return cls.snapshot().xai_configured
 
     @classmethod
     def get_status(cls) -> Dict[str, bool]:
-        cls.refresh()
-        return {
-            "livekit": bool(cls.LIVEKIT_URL and cls.LIVEKIT_API_KEY and cls.LIVEKIT_API_SECRET),
-            "xai": bool(cls.XAI_API_KEY),
-        }
\ No newline at end of file
+        return cls.snapshot().status()
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, int]:
+        return {"reloads": cls.reload_count}
+
+
+# Initialize on import
+Config.reload()
@@ -0,0 +1,158 @@
+"""
+Lisa Voice Agent — Conditional, Compressed Responses
+======================================================
+For polled read endpoints whose content is pinned by a store revision.
+
+- The serialized body (and its gzip / brotli encodings) is built once
+  per (key, revision) and reused until the revision changes.
+- ETag is derived from the revision; If-None-Match → 304 with no body.
+- Bodies of at least COMPRESS_MIN_BYTES are sent compressed when the
+  client accepts it (brotli needs the optional `brotli` package).
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore
+
+COMPRESS_MIN_BYTES = 1024
+
+# () -> (JSON-able payload, extra response headers)
+Build = Callable[[], Tuple[object, Dict[str, str]]]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): ignore W/ on either side.
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def _accepted(accept_encoding: str) -> Dict[str, float]:
+    codings = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            codings[name.lower()] = q
+    return codings
+
+
+class _Entry:
+    __slots__ = ("body", "headers", "encoded")
+
+    def __init__(self, body: bytes, headers: Dict[str, str]) -> None:
+        self.body = body
+        self.headers = headers
+        self.encoded: Dict[str, bytes] = {}
+
+
+class ResponseCache:
+    """Serialized JSON bodies keyed by (key, revision), bounded LRU."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, Hashable], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop every cached body for `key` (or everything)."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                return
+            for k in [k for k in self._entries if k[0] == key]:
+                del self._entries[k]
+
+    def _entry(self, key: Hashable, revision: Hashable, build: Build) -> _Entry:
+        with self._lock:
+            entry = self._entries.get((key, revision))
+            if entry is not None:
+                self._entries.move_to_end((key, revision))
+                self.hits += 1
+                return entry
+
+        payload, extra_headers = build()
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entry = _Entry(body, extra_headers)
+        with self._lock:
+            self.misses += 1
+            self._entries[(key, revision)] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        revision: Hashable,
+        build: Build,
+    ) -> Response:
+        """
+        JSON response for `key` at `revision`. `build` returns the
+        JSON-able payload and any extra headers to cache with it (e.g. a
+        next-page cursor); it only runs when this revision isn't cached.
+        """
+        etag = f'W/"{revision}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        entry = self._entry(key, revision, build)
+        headers.update(entry.headers)
+        body = entry.body
+        if len(body) >= COMPRESS_MIN_BYTES:
+            coding = self._negotiate(request.headers.get("accept-encoding", ""))
+            if coding is not None:
+                encoded = entry.encoded.get(coding)
+                if encoded is None:
+                    encoded = entry.encoded[coding] = (
+                        brotli.compress(body) if coding == "br" else gzip.compress(body, compresslevel=6)
+                    )
+                body = encoded
+                headers["Content-Encoding"] = coding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _negotiate(accept_encoding: str) -> Optional[str]:
+        codings = _accepted(accept_encoding)
+        if brotli is not None and codings.get("br", 0) > 0:
+            return "br"
+        if codings.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
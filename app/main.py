@@ -4,15 +4,25 @@ Lisa Voice Agent — API Server
 FastAPI app. Start with: python run.py
 """
 
+import asyncio
 import logging
+import signal
 import sys
+import time
 from datetime import datetime
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from . import metrics
 from .config import Config
-from .routes import demo, customers
+from .routes import admin, demo, customers, transcripts
+from agent.personas import PersonaWatcher
+from customers.store import customer_store
+from transcripts.index import get_index
+from transcripts.storage import StorageMaintainer
 
 # Logging
 logging.basicConfig(
@@ -33,10 +43,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        metrics.REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=metrics.route_label(request.scope),
+            status=str(status),
+        )
+
+
 app.include_router(demo.router)
 app.include_router(customers.router)
+app.include_router(transcripts.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -46,12 +79,16 @@ async def root():
         "version": "1.0.0",
         "status": "running",
         "config": Config.get_status(),
+        "config_reloads": Config.reload_count,
         "endpoints": {
             "docs": "/docs",
             "health": "/health",
+            "metrics": "/metrics",
             "config": "/api/demo/config",
             "create_session": "POST /api/demo/session",
+            "create_sessions_batch": "POST /api/demo/sessions:batch",
             "customers": "/api/customers",
+            "transcripts": "/api/transcripts",
         },
     }
 
@@ -61,16 +98,58 @@ async def health():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def _install_reload_signal() -> None:
+    """SIGHUP → re-read .env files without restarting the API."""
+    if not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, Config.reload)
+    except (NotImplementedError, RuntimeError):
+        logger.debug("SIGHUP reload not available on this platform")
+
+
+# Packs old transcript days and applies retention (TRANSCRIPT_MAINTENANCE_INTERVAL_S).
+# Built on startup: it opens the transcript index, which importing the app must not do.
+maintainer: Optional[StorageMaintainer] = None
+
+# Hot-reloads edited persona files into the customer store (PERSONA_CHECK_INTERVAL_S)
+persona_watcher = PersonaWatcher(customer_store.reseed)
+
+
 @app.on_event("startup")
 async def startup():
+    global maintainer
+    _install_reload_signal()
+    maintainer = StorageMaintainer(index=get_index())
+    maintainer.start()
+    persona_watcher.start()
+    demo.room_pool.start()
+    if Config.WORKERS > 1:
+        metrics.snapshots.start()
     status = Config.get_status()
     logger.info("=" * 60)
     logger.info("🎙️  LISA VOICE AGENT API")
     logger.info("=" * 60)
     logger.info(f"   LiveKit: {'✅' if status['livekit'] else '❌'}")
     logger.info(f"   xAI:     {'✅' if status['xai'] else '❌'}")
+    logger.info(f"   Workers: {Config.WORKERS} (state: {Config.STATE_BACKEND})")
     logger.info("=" * 60)
     logger.info("⚠️  Also run: python -m agent.main dev")
     logger.info(f"📡 http://localhost:{Config.PORT}")
     logger.info(f"📚 http://localhost:{Config.PORT}/docs")
-    logger.info("=" * 60)
\ No newline at end of file
+    logger.info("=" * 60)
+
+@app.on_event("shutdown")
+async def shutdown():
+    if maintainer is not None:
+        maintainer.stop()
+    persona_watcher.stop()
+    await demo.room_pool.stop()
+    if Config.WORKERS > 1:
+        metrics.snapshots.stop()
+    demo.sessions.close()
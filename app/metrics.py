@@ -0,0 +1,45 @@
+"""
+Lisa Voice Agent — API Metrics
+================================
+Per-route request latency for the API, served at GET /metrics
+(Prometheus text format, see telemetry/metrics.py).
+
+With several API workers each one snapshots its registry to
+TELEMETRY_DIR/api, and whichever worker answers the scrape merges them.
+"""
+
+import sys
+from pathlib import Path
+
+_root = str(Path(__file__).resolve().parents[1])
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from telemetry.exporter import TELEMETRY_DIR, SnapshotWriter, aggregate
+from telemetry.metrics import Registry
+
+from .config import Config
+
+API_TELEMETRY_DIR = TELEMETRY_DIR / "api"
+
+registry = Registry()
+snapshots = SnapshotWriter(registry, directory=API_TELEMETRY_DIR)
+
+REQUEST_LATENCY = registry.histogram(
+    "lisa_api_request_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = registry.gauge("lisa_api_requests_in_flight", "Requests being handled")
+
+
+def route_label(scope: dict) -> str:
+    """Route template ("/api/customers/{customer_id}"), never the raw path, to bound cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def render() -> str:
+    if Config.WORKERS > 1:
+        return aggregate(registry, API_TELEMETRY_DIR)
+    return registry.render()
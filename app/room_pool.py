@@ -0,0 +1,274 @@
+"""
+Lisa Voice Agent — Warm Room Pool
+===================================
+Optional pool of pre-created LiveKit rooms per customer, each with the
+agent already dispatched and its model session started, so a caller
+who gets one hears the greeting without waiting for dispatch, persona
+load and model startup.
+
+- ROOM_POOL="home_services=2,real_estate=1": target ready rooms per customer
+- ROOM_POOL_TTL_S: a pooled room nobody claimed is deleted (and replaced)
+  after this long, so agents don't sit in empty rooms forever
+
+Rooms are created through the LiveKit server API (works against a local
+`livekit-server --dev` too); the worker is dispatched automatically on
+room creation. A room is only handed out once its agent has joined. The
+room metadata tells the worker it is pooled and how long to wait for a
+caller (see agent/main.py).
+
+Each API process keeps its own rooms. With API_WORKERS=N the target is
+split so the N processes together hold ROOM_POOL: each claims a slot
+0..N-1 through a lock file under data/ and keeps its share (see
+worker_share), so one customer's rooms may sit in some workers only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+try:
+    from livekit import api as lkapi
+except ImportError:
+    lkapi = None  # type: ignore
+
+from .config import PROJECT_ROOT, Config
+
+logger = logging.getLogger("api.room_pool")
+
+# How long a new room may take to get its agent before it is given up on.
+AGENT_JOIN_TIMEOUT_S = 20.0
+AGENT_POLL_INTERVAL_S = 0.25
+# Pause after a failed refill (no worker running, LiveKit down, ...).
+RETRY_BACKOFF_S = 10.0
+# Per-worker slot locks (API_WORKERS > 1).
+SLOT_LOCK_DIR = PROJECT_ROOT / "data"
+
+
+def parse_pool_sizes(value: str) -> Dict[str, int]:
+    """"home_services=2,real_estate=1" → {"home_services": 2, ...}"""
+    sizes: Dict[str, int] = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        customer_id, size = item.split("=", 1)
+        try:
+            if int(size) > 0:
+                sizes[customer_id.strip()] = int(size)
+        except ValueError:
+            logger.warning(f"Ignoring room pool entry {item!r}")
+    return sizes
+
+
+def worker_share(sizes: Dict[str, int], slot: int, workers: int) -> Dict[str, int]:
+    """
+    Slot `slot`'s part of `sizes`, so `workers` slots together hold exactly
+    `sizes`. Remainders are spread by customer, not all on slot 0.
+    """
+    share: Dict[str, int] = {}
+    for i, (customer_id, size) in enumerate(sizes.items()):
+        n = size // workers + (1 if (slot + i) % workers < size % workers else 0)
+        if n:
+            share[customer_id] = n
+    return share
+
+
+def _http_url(url: str) -> str:
+    """The server API speaks HTTP on the same host as the WebSocket URL."""
+    for ws, http in (("wss://", "https://"), ("ws://", "http://")):
+        if url.startswith(ws):
+            return http + url[len(ws):]
+    return url
+
+
+@dataclass
+class PooledRoom:
+    room_name: str
+    session_id: str
+    created: float
+
+    def expired(self, ttl_s: float, now: float) -> bool:
+        return now - self.created >= ttl_s
+
+
+class RoomPool:
+    """Keeps ROOM_POOL warm rooms per customer, refilled in the background."""
+
+    def __init__(self) -> None:
+        self._ready: Dict[str, Deque[PooledRoom]] = {}
+        self._pending: Dict[str, int] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._api = None
+        self._slot_file = None
+        self.slot = 0
+        self.handed_out = 0
+        self.expired = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        cfg = Config.snapshot()
+        return bool(parse_pool_sizes(cfg.ROOM_POOL)) and cfg.livekit_configured and lkapi is not None
+
+    def start(self) -> None:
+        if self._task is None and self.enabled and self._claim_slot():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _claim_slot(self) -> bool:
+        """Take a free worker slot (held until this process exits)."""
+        workers = Config.snapshot().WORKERS
+        if workers <= 1:
+            return True
+        if fcntl is None:
+            logger.warning("Room pool needs file locks to share ROOM_POOL between API workers; disabled")
+            return False
+        SLOT_LOCK_DIR.mkdir(parents=True, exist_ok=True)
+        for slot in range(workers):
+            f = open(SLOT_LOCK_DIR / f"room-pool-{slot}.lock", "w")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                continue
+            self._slot_file, self.slot = f, slot
+            logger.info(f"♨️  Room pool slot {slot + 1}/{workers}")
+            return True
+        logger.warning(f"All {workers} room pool slots are taken; this worker keeps no warm rooms")
+        return False
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for rooms in self._ready.values():
+            while rooms:
+                await self._delete(rooms.popleft())
+        if self._api is not None:
+            await self._api.aclose()
+            self._api = None
+        if self._slot_file is not None:
+            self._slot_file.close()   # releases the slot lock
+            self._slot_file = None
+
+    def take(self, customer_id: str) -> Optional[PooledRoom]:
+        """A ready room for this customer, or None (caller provisions normally)."""
+        rooms = self._ready.get(customer_id)
+        ttl_s = Config.snapshot().ROOM_POOL_TTL_S
+        now = time.time()
+        while rooms:
+            room = rooms.popleft()
+            self._wake.set()
+            if not room.expired(ttl_s, now):
+                self.handed_out += 1
+                return room
+            asyncio.get_running_loop().create_task(self._delete(room))
+            self.expired += 1
+        return None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "slot": self.slot,
+            "target": self._targets(Config.snapshot()),
+            "ready": {cid: len(rooms) for cid, rooms in self._ready.items()},
+            "pending": dict(self._pending),
+            "handed_out": self.handed_out,
+            "expired": self.expired,
+            "failed": self.failed,
+        }
+
+    # -- Background refill ------------------------------------------------------
+
+    def _client(self):
+        if self._api is None:
+            cfg = Config.snapshot()
+            self._api = lkapi.LiveKitAPI(
+                _http_url(cfg.LIVEKIT_URL), cfg.LIVEKIT_API_KEY, cfg.LIVEKIT_API_SECRET,
+            )
+        return self._api
+
+    async def _run(self) -> None:
+        while True:
+            cfg = Config.snapshot()
+            sizes = self._targets(cfg)
+            self._sweep(cfg.ROOM_POOL_TTL_S)
+            for customer_id, size in sizes.items():
+                missing = size - len(self._ready.get(customer_id, ())) - self._pending.get(customer_id, 0)
+                for _ in range(max(0, missing)):
+                    self._pending[customer_id] = self._pending.get(customer_id, 0) + 1
+                    asyncio.get_running_loop().create_task(self._fill(customer_id, cfg.ROOM_POOL_TTL_S))
+            self._wake.clear()
+            try:
+                # Re-check at least a few times per TTL so expiry is prompt.
+                await asyncio.wait_for(self._wake.wait(), timeout=max(1.0, cfg.ROOM_POOL_TTL_S / 4))
+            except asyncio.TimeoutError:
+                pass
+
+    def _targets(self, cfg) -> Dict[str, int]:
+        """Ready rooms this process keeps per customer."""
+        return worker_share(parse_pool_sizes(cfg.ROOM_POOL), self.slot, cfg.WORKERS)
+
+    def _sweep(self, ttl_s: float) -> None:
+        now = time.time()
+        for rooms in self._ready.values():
+            while rooms and rooms[0].expired(ttl_s, now):
+                room = rooms.popleft()
+                asyncio.get_running_loop().create_task(self._delete(room))
+                self.expired += 1
+
+    async def _fill(self, customer_id: str, ttl_s: float) -> None:
+        session_id = str(uuid.uuid4())[:8]
+        room = PooledRoom(f"{customer_id}-{session_id}", session_id, time.time())
+        try:
+            client = self._client()
+            await client.room.create_room(lkapi.CreateRoomRequest(
+                name=room.room_name,
+                empty_timeout=int(ttl_s) + 60,
+                # The worker keeps the primed session waiting this long for a caller.
+                metadata=json.dumps({"warm_pool": True, "caller_wait_s": ttl_s + AGENT_JOIN_TIMEOUT_S}),
+            ))
+            if not await self._wait_for_agent(room.room_name):
+                raise TimeoutError(f"no agent joined {room.room_name} within {AGENT_JOIN_TIMEOUT_S:.0f}s")
+            room.created = time.time()
+            self._ready.setdefault(customer_id, deque()).append(room)
+            logger.info(f"♨️  Warm room ready: {room.room_name}")
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Warm room for {customer_id} failed: {e}")
+            await self._delete(room)
+            await asyncio.sleep(RETRY_BACKOFF_S)
+        finally:
+            self._pending[customer_id] -= 1
+            self._wake.set()
+
+    async def _wait_for_agent(self, room_name: str) -> bool:
+        agent_kind = lkapi.ParticipantInfo.Kind.AGENT
+        deadline = time.monotonic() + AGENT_JOIN_TIMEOUT_S
+        while time.monotonic() < deadline:
+            res = await self._client().room.list_participants(lkapi.ListParticipantsRequest(room=room_name))
+            if any(p.kind == agent_kind for p in res.participants):
+                return True
+            await asyncio.sleep(AGENT_POLL_INTERVAL_S)
+        return False
+
+    async def _delete(self, room: PooledRoom) -> None:
+        try:
+            await self._client().room.delete_room(lkapi.DeleteRoomRequest(room=room.room_name))
+        except Exception:
+            logger.debug(f"Could not delete pooled room {room.room_name}", exc_info=True)
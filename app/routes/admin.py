@@ -0,0 +1,72 @@
+"""
+Lisa Voice Agent — Admin Routes
+=================================
+Operational endpoints. Flight recorder: ask the worker running a session
+to dump its event ring buffer, then list and read the dumps
+(see agent/flight_recorder.py).
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+_root = str(Path(__file__).resolve().parents[2])
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from agent.flight_recorder import POLL_INTERVAL_S, REQUEST_TTL_S, list_dumps, read_dump, request_dump
+
+logger = logging.getLogger("api.admin")
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+# -- Models -------------------------------------------------------------------
+
+class FlightDumpRequested(BaseModel):
+    session_id: str
+    status: str
+    poll_interval_s: float
+    expires_s: float   # no dump by then: no live worker runs this session
+
+
+class FlightDump(BaseModel):
+    name: str
+    bytes: int
+    modified: str
+
+
+# -- Routes --------------------------------------------------------------------
+
+@router.post("/flight-recorder/{session_id}", response_model=FlightDumpRequested, status_code=202)
+async def dump_flight_recorder(session_id: str):
+    """
+    The worker running this session writes its buffer within a few
+    seconds. If no live session has that id, the request expires unused
+    after `expires_s` and no dump appears.
+    """
+    try:
+        request_dump(session_id)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    logger.info(f"🛩️  Flight recorder dump requested for session {session_id}")
+    return FlightDumpRequested(
+        session_id=session_id, status="requested",
+        poll_interval_s=POLL_INTERVAL_S, expires_s=REQUEST_TTL_S,
+    )
+
+
+@router.get("/flight-recorder", response_model=List[FlightDump])
+async def list_flight_dumps(session_id: Optional[str] = None):
+    return [FlightDump(**d) for d in list_dumps(session_id)]
+
+
+@router.get("/flight-recorder/dumps/{name}")
+async def get_flight_dump(name: str) -> Dict:
+    dump = read_dump(name)
+    if dump is None:
+        raise HTTPException(404, "Dump not found")
+    return dump
@@ -1,27 +1,40 @@
 """
 Lisa Voice Agent — Customer Routes
 ====================================
-CRUD for managing agent personas.
+CRUD for managing agent personas, plus system prompt size stats.
+The list is filterable (indexed fields, see customers/store.py),
+cursor-paginated and projectable with fields=.
+
+The polled reads (list and detail) carry revision ETags, answer
+If-None-Match with 304, and reuse one serialized (and compressed) body
+per store revision (see app/http_cache.py).
 """
 
+import hashlib
 import logging
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 
+from ..http_cache import ResponseCache
+
 _root = str(Path(__file__).resolve().parents[2])
 if _root not in sys.path:
     sys.path.insert(0, _root)
 
 from customers.store import customer_store
 from customers.models import CustomerConfig
+from agent.prompts import LANGUAGE_NAMES, is_compact, prompt_cache, prompt_size, unknown_rules
 
 logger = logging.getLogger("api.customers")
 router = APIRouter(prefix="/api/customers", tags=["customers"])
 
+# Serialized list/detail bodies, keyed by store (list) or customer (detail) revision.
+responses = ResponseCache()
+
 
 # -- Models -------------------------------------------------------------------
 
@@ -42,6 +55,8 @@ class CreateCustomerRequest(BaseModel):
     common_customer_questions: List[str] = Field(default_factory=list)
     booking_link_enabled: bool = False
     booking_link_url: Optional[str] = None
+    compact_prompt: bool = False
+    covers_rules: List[str] = Field(default_factory=list)
 
 
 class UpdateCustomerRequest(BaseModel):
@@ -61,6 +76,8 @@ class UpdateCustomerRequest(BaseModel):
     common_customer_questions: Optional[List[str]] = None
     booking_link_enabled: Optional[bool] = None
     booking_link_url: Optional[str] = None
+    compact_prompt: Optional[bool] = None
+    covers_rules: Optional[List[str]] = None
     is_active: Optional[bool] = None
 
 
@@ -89,18 +106,124 @@ class CustomerDetailResponse(CustomerResponse):
     services: List[str]
     common_customer_questions: List[str]
     booking_link_url: Optional[str]
+    compact_prompt: bool
+    covers_rules: List[str]
+
+
+class PromptSize(BaseModel):
+    chars: int
+    bytes: int
+    approx_tokens: int
+
+
+class PromptStatsResponse(BaseModel):
+    id: str
+    compact_prompt: bool
+    languages: Dict[str, Dict[str, PromptSize]]   # lang → {"full", "compact", "active"}
 
 
 # -- Endpoints ----------------------------------------------------------------
 
+def _prompt_stats(customer: CustomerConfig, languages: List[str]) -> PromptStatsResponse:
+    persona = customer.to_persona()
+    stats = {}
+    for lang in languages:
+        full = prompt_size(prompt_cache.get(persona, lang, compact=False))
+        compact = prompt_size(prompt_cache.get(persona, lang, compact=True))
+        stats[lang] = {
+            "full": full,
+            "compact": compact,
+            "active": compact if is_compact(persona) else full,
+        }
+    return PromptStatsResponse(
+        id=customer.id, compact_prompt=is_compact(persona), languages=stats,
+    )
+
+
+def _languages(language: Optional[str]) -> List[str]:
+    return [language] if language else list(LANGUAGE_NAMES)
+
+
+def _detail(customer: CustomerConfig) -> CustomerDetailResponse:
+    return CustomerDetailResponse(
+        **customer.to_dict(),
+        system_prompt=customer.system_prompt,
+        intro_message=customer.intro_message,
+        goodbye_message=customer.goodbye_message,
+        business_hours=customer.business_hours,
+        business_address=customer.business_address,
+        services=customer.services,
+        common_customer_questions=customer.common_customer_questions,
+        booking_link_url=customer.booking_link_url,
+        compact_prompt=customer.compact_prompt,
+        covers_rules=customer.covers_rules,
+    )
+
+
+def _check_rules(covers_rules: Optional[List[str]]) -> None:
+    if unknown := unknown_rules(covers_rules or ()):
+        raise HTTPException(400, f"Unknown workflow rules: {', '.join(unknown)}")
+
+
+def _invalidate(customer_id: str) -> None:
+    responses.invalidate("list")
+    responses.invalidate(("customer", customer_id))
+
+
+LIST_FIELDS = tuple(CustomerResponse.model_fields)
+
+
+def _projection(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(wanted) - set(LIST_FIELDS))
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in wanted if f != "id"]
+
+
 @router.get("", response_model=List[CustomerResponse])
-async def list_customers(active_only: bool = False):
-    customers = customer_store.list_active() if active_only else customer_store.list_all()
-    return [CustomerResponse(**c.to_dict()) for c in customers]
+async def list_customers(
+    request: Request,
+    active_only: bool = False,
+    agent_type: Optional[str] = None,
+    business_category: Optional[str] = None,
+    language: Optional[str] = None,
+    voice: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (id is always included)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """
+    Customers in id order. Without `limit` every match is returned; with
+    it, the X-Next-Cursor header carries the cursor for the next page.
+    """
+    projection = _projection(fields)
+    filters = {
+        "agent_type": agent_type,
+        "business_category": business_category,
+        "language": language,
+        "voice": voice,
+        "is_active": True if active_only else is_active,
+    }
+
+    def build():
+        page, next_cursor = customer_store.query(filters, limit=limit, cursor=cursor)
+        rows = [CustomerResponse(**c.to_dict()).model_dump() for c in page]
+        if projection is not None:
+            rows = [{f: row[f] for f in projection} for row in rows]
+        return rows, {"X-Next-Cursor": next_cursor} if next_cursor is not None else {}
+
+    # One revision per store revision and query variant (the query string).
+    variant = hashlib.sha1(str(sorted(request.query_params.multi_items())).encode()).hexdigest()[:12]
+    return responses.respond(request, "list", f"{customer_store.revision}-{variant}", build)
 
 
 @router.post("", response_model=CustomerResponse)
 async def create_customer(request: CreateCustomerRequest):
+    _check_rules(request.covers_rules)
     customer = CustomerConfig(
         name=request.name,
         agent_name=request.agent_name,
@@ -123,40 +246,52 @@ async def create_customer(request: CreateCustomerRequest):
         common_customer_questions=request.common_customer_questions,
         booking_link_enabled=request.booking_link_enabled,
         booking_link_url=request.booking_link_url,
+        compact_prompt=request.compact_prompt,
+        covers_rules=request.covers_rules,
     )
     customer = customer_store.create(customer)
+    _invalidate(customer.id)
     logger.info(f"Created customer: {customer.id} ({customer.name})")
     return CustomerResponse(**customer.to_dict())
 
 
+@router.get("/prompt-stats", response_model=List[PromptStatsResponse])
+async def list_prompt_stats(language: Optional[str] = None, active_only: bool = False):
+    """System prompt size (bytes / approx tokens) per customer and language."""
+    customers = customer_store.list_active() if active_only else customer_store.list_all()
+    languages = _languages(language)
+    return [_prompt_stats(c, languages) for c in customers]
+
+
 @router.get("/{customer_id}", response_model=CustomerDetailResponse)
-async def get_customer(customer_id: str):
+async def get_customer(customer_id: str, request: Request):
     customer = customer_store.get(customer_id)
     if not customer:
         raise HTTPException(404, "Customer not found")
-    return CustomerDetailResponse(
-        **customer.to_dict(),
-        system_prompt=customer.system_prompt,
-        intro_message=customer.intro_message,
-        goodbye_message=customer.goodbye_message,
-        business_category=customer.business_category,
-        service_area=customer.service_area,
-        business_hours=customer.business_hours,
-        business_address=customer.business_address,
-        services=customer.services,
-        common_customer_questions=customer.common_customer_questions,
-        booking_link_url=customer.booking_link_url,
+    revision = f"{customer.id}-{customer.revision}"
+    return responses.respond(
+        request, ("customer", customer_id), revision, lambda: (_detail(customer).model_dump(), {}),
     )
 
 
+@router.get("/{customer_id}/prompt-stats", response_model=PromptStatsResponse)
+async def get_prompt_stats(customer_id: str, language: Optional[str] = None):
+    customer = customer_store.get(customer_id)
+    if not customer:
+        raise HTTPException(404, "Customer not found")
+    return _prompt_stats(customer, _languages(language))
+
+
 @router.patch("/{customer_id}", response_model=CustomerResponse)
 async def update_customer(customer_id: str, request: UpdateCustomerRequest):
     updates = {k: v for k, v in request.model_dump().items() if v is not None}
     if not updates:
         raise HTTPException(400, "No updates provided")
+    _check_rules(updates.get("covers_rules"))
     customer = customer_store.update(customer_id, updates)
     if not customer:
         raise HTTPException(404, "Customer not found")
+    _invalidate(customer_id)
     return CustomerResponse(**customer.to_dict())
 
 
@@ -164,4 +299,5 @@ async def update_customer(customer_id: str, request: UpdateCustomerRequest):
 async def delete_customer(customer_id: str):
     if not customer_store.delete(customer_id):
         raise HTTPException(404, "Customer not found")
+    _invalidate(customer_id)
     return {"status": "deleted", "id": customer_id}
@@ -3,19 +3,28 @@ Lisa Voice Agent — Demo Routes
 ================================
 Session creation + LiveKit token generation.
 Frontend sends: name, customer_id, language.
+POST /sessions:batch provisions many sessions in one round trip.
+With ROOM_POOL set, POST /session hands out a warm room (agent already
+in it) when one is ready for the customer (see app/room_pool.py).
 """
 
+import asyncio
 import json
 import logging
+import os
 import sys
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from ..config import Config
+from ..room_pool import PooledRoom, RoomPool
+from ..state import create_session_store
 
 _root = str(Path(__file__).resolve().parents[2])
 if _root not in sys.path:
@@ -23,6 +32,11 @@ if _root not in sys.path:
 
 from customers.store import customer_store
 
+try:
+    from livekit.api import AccessToken, VideoGrants
+except ImportError:
+    AccessToken = VideoGrants = None  # type: ignore
+
 logger = logging.getLogger("api.demo")
 router = APIRouter(prefix="/api/demo", tags=["demo"])
 
@@ -54,9 +68,93 @@ class ConfigStatusResponse(BaseModel):
     message: str
 
 
+class BatchCreateSessionRequest(BaseModel):
+    sessions: List[CreateSessionRequest]
+
+
+class BatchSessionResponse(BaseModel):
+    count: int
+    mode: str
+    sessions: List[SessionResponse]
+
+
 # -- Sessions -----------------------------------------------------------------
 
-sessions: dict = {}
+# In-memory for one process; shared across API workers (STATE_BACKEND, app/state.py).
+sessions = create_session_store(Config.snapshot())
+
+MAX_BATCH_SIZE = 1000
+BATCH_PARALLEL_THRESHOLD = 64     # below this, signing inline is cheaper
+BATCH_CHUNK_SIZE = 32
+
+_signing_pool = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1),
+    thread_name_prefix="token-sign",
+)
+
+
+# Started/stopped with the app (app/main.py); idle unless ROOM_POOL is set.
+room_pool = RoomPool()
+
+
+def _require_livekit_api() -> None:
+    if AccessToken is None:
+        raise HTTPException(503, "livekit-api not installed")
+
+
+def _provision(
+    cfg, request: CreateSessionRequest, customer, live: bool, room: Optional[PooledRoom] = None,
+) -> SessionResponse:
+    """Register one session and (in live mode) sign its LiveKit token, for `room` if given."""
+    if room is not None:
+        session_id, room_name = room.session_id, room.room_name
+    else:
+        session_id = str(uuid.uuid4())[:8]
+        room_name = f"{request.customer_id}-{session_id}"
+
+    # ── Metadata the agent will read ──────────────────────────────────
+    metadata = json.dumps({
+        "name": request.name,
+        "customer_id": request.customer_id,
+        "language": request.language,          # ← passed to agent
+        "session_id": session_id,
+    })
+
+    if live:
+        token = (
+            AccessToken(
+                api_key=cfg.LIVEKIT_API_KEY,
+                api_secret=cfg.LIVEKIT_API_SECRET,
+            )
+            .with_identity(f"user-{session_id}")
+            .with_name(request.name)
+            .with_metadata(metadata)
+            .with_grants(
+                VideoGrants(
+                    room_join=True, room=room_name,
+                    can_publish=True, can_subscribe=True,
+                )
+            )
+        )
+        jwt_token = token.to_jwt()
+        livekit_url = cfg.LIVEKIT_URL
+    else:
+        jwt_token = "mock-token"
+        livekit_url = "wss://not-configured"
+
+    sessions.add({
+        "id": session_id, "room": room_name,
+        "user_name": request.name, "customer_id": request.customer_id,
+        "language": request.language, "status": "created" if live else "mock",
+    })
+
+    return SessionResponse(
+        session_id=session_id, room_name=room_name,
+        token=jwt_token, livekit_url=livekit_url,
+        customer_name=customer.name, agent_name=customer.agent_name,
+        agent_type=customer.agent_type, language=request.language,
+        mode="live" if live else "mock",
+    )
 
 
 # -- Endpoints ----------------------------------------------------------------
@@ -89,77 +187,79 @@ async def create_session(request: CreateSessionRequest):
     if not customer:
         raise HTTPException(404, f"Customer '{request.customer_id}' not found")
 
-    session_id = str(uuid.uuid4())[:8]
-    room_name = f"{request.customer_id}-{session_id}"
-
-    # ── Metadata the agent will read ──────────────────────────────────
-    metadata = json.dumps({
-        "name": request.name,
-        "customer_id": request.customer_id,
-        "language": request.language,          # ← passed to agent
-        "session_id": session_id,
-    })
-
-    if not Config.is_livekit_configured():
+    cfg = Config.snapshot()
+    if not cfg.livekit_configured:
         logger.warning("⚠️ LiveKit not configured — mock session")
-        sessions[session_id] = {
-            "id": session_id, "room": room_name,
-            "user_name": request.name, "customer_id": request.customer_id,
-            "language": request.language, "status": "mock",
-            "created_at": datetime.utcnow().isoformat(),
-        }
-        return SessionResponse(
-            session_id=session_id, room_name=room_name,
-            token="mock-token", livekit_url="wss://not-configured",
-            customer_name=customer.name, agent_name=customer.agent_name,
-            agent_type=customer.agent_type, language=request.language,
-            mode="mock",
-        )
+        return _provision(cfg, request, customer, live=False)
 
+    _require_livekit_api()
+    room = room_pool.take(request.customer_id)
     try:
-        from livekit.api import AccessToken, VideoGrants
-
-        token = (
-            AccessToken(
-                api_key=Config.LIVEKIT_API_KEY,
-                api_secret=Config.LIVEKIT_API_SECRET,
-            )
-            .with_identity(f"user-{session_id}")
-            .with_name(request.name)
-            .with_metadata(metadata)
-            .with_grants(
-                VideoGrants(
-                    room_join=True, room=room_name,
-                    can_publish=True, can_subscribe=True,
-                )
-            )
-        )
-        jwt_token = token.to_jwt()
-    except ImportError:
-        raise HTTPException(503, "livekit-api not installed")
+        response = _provision(cfg, request, customer, live=True, room=room)
     except Exception as e:
         logger.error(f"❌ Token error: {e}", exc_info=True)
         raise HTTPException(500, str(e))
 
-    sessions[session_id] = {
-        "id": session_id, "room": room_name,
-        "user_name": request.name, "customer_id": request.customer_id,
-        "language": request.language, "status": "created",
-        "created_at": datetime.utcnow().isoformat(),
-    }
-
     logger.info(
-        f"✅ Session {session_id} — room={room_name}, "
-        f"agent={customer.agent_name}, lang={request.language}"
+        f"✅ Session {response.session_id} — room={response.room_name}"
+        f"{' (warm)' if room else ''}, agent={customer.agent_name}, lang={request.language}"
     )
+    return response
 
-    return SessionResponse(
-        session_id=session_id, room_name=room_name,
-        token=jwt_token, livekit_url=Config.LIVEKIT_URL,
-        customer_name=customer.name, agent_name=customer.agent_name,
-        agent_type=customer.agent_type, language=request.language,
-        mode="live",
-    )
+
+@router.post("/sessions:batch", response_model=BatchSessionResponse)
+async def create_sessions_batch(request: BatchCreateSessionRequest):
+    """
+    Create many sessions in one round trip (campaign launches, load tests).
+    Customers are resolved and config is checked once per batch; large
+    batches sign their tokens on a worker pool.
+    """
+    entries = request.sessions
+    if not entries:
+        raise HTTPException(400, "No sessions provided")
+    if len(entries) > MAX_BATCH_SIZE:
+        raise HTTPException(400, f"Batch too large (max {MAX_BATCH_SIZE})")
+
+    customers = {cid: customer_store.get(cid) for cid in {e.customer_id for e in entries}}
+    missing = sorted(cid for cid, c in customers.items() if c is None)
+    if missing:
+        raise HTTPException(404, f"Customers not found: {', '.join(missing)}")
+
+    cfg = Config.snapshot()
+    live = cfg.livekit_configured
+    if live:
+        _require_livekit_api()
+
+    def _provision_chunk(chunk):
+        return [_provision(cfg, e, customers[e.customer_id], live=live) for e in chunk]
+
+    try:
+        if live and len(entries) >= BATCH_PARALLEL_THRESHOLD:
+            loop = asyncio.get_running_loop()
+            chunks = [
+                entries[i:i + BATCH_CHUNK_SIZE]
+                for i in range(0, len(entries), BATCH_CHUNK_SIZE)
+            ]
+            results = await asyncio.gather(*(
+                loop.run_in_executor(_signing_pool, _provision_chunk, chunk)
+                for chunk in chunks
+            ))
+            provisioned = [r for chunk in results for r in chunk]
+        else:
+            provisioned = _provision_chunk(entries)
+    except Exception as e:
+        logger.error(f"❌ Batch token error: {e}", exc_info=True)
+        raise HTTPException(500, str(e))
+
+    mode = "live" if live else "mock"
+    logger.info(f"✅ Batch — {len(provisioned)} sessions ({mode})")
+    return BatchSessionResponse(count=len(provisioned), mode=mode, sessions=provisioned)
+
+
+@router.get("/room-pool")
+async def get_room_pool():
+    """Warm rooms ready/pending per customer and hand-out counters."""
+    return {"enabled": room_pool.enabled, **room_pool.stats()}
 
 
 @router.get("/session/{session_id}")
@@ -172,12 +272,46 @@ async def get_session(session_id: str):
 
 @router.post("/session/{session_id}/end")
 async def end_session(session_id: str):
-    if session_id in sessions:
-        sessions[session_id]["status"] = "ended"
-        sessions[session_id]["ended_at"] = datetime.utcnow().isoformat()
+    sessions.set_status(session_id, "ended", ended_at=datetime.utcnow().isoformat())
     return {"status": "ended", "session_id": session_id}
 
 
+def _parse_time(value: Optional[str], name: str) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(400, f"Invalid {name}: expected ISO-8601")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
 @router.get("/sessions")
-async def list_sessions():
-    return {"count": len(sessions), "sessions": list(sessions.values())}
+async def list_sessions(
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    try:
+        after_seq = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+    page, next_cursor = sessions.query(
+        customer_id=customer_id,
+        status=status,
+        created_after=_parse_time(created_after, "created_after"),
+        created_before=_parse_time(created_before, "created_before"),
+        limit=limit,
+        cursor=after_seq,
+    )
+    return {
+        "count": len(page),
+        "total": len(sessions),
+        "sessions": page,
+        "next_cursor": str(next_cursor) if next_cursor is not None else None,
+    }
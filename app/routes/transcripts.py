@@ -0,0 +1,127 @@
+"""
+Lisa Voice Agent — Transcript Routes
+======================================
+Search saved sessions through the transcript index (transcripts/index.py)
+by customer, date range, language, duration and free text, and fetch a
+single session's transcript (unpacked or from a day pack). Run
+`python -m transcripts.backfill` once to index recordings saved before
+the index existed.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+_root = str(Path(__file__).resolve().parents[2])
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from transcripts.index import get_index
+from transcripts.storage import read_session
+
+logger = logging.getLogger("api.transcripts")
+router = APIRouter(prefix="/api/transcripts", tags=["transcripts"])
+
+
+# -- Models -------------------------------------------------------------------
+
+class TranscriptSummary(BaseModel):
+    session_id: str
+    customer_id: str
+    user_name: Optional[str]
+    agent_name: Optional[str]
+    language: Optional[str]
+    started_at: str
+    ended_at: Optional[str]
+    duration_s: Optional[float]
+    entries: int
+    path: str
+    snippet: Optional[str] = None
+
+
+class TranscriptSearchResponse(BaseModel):
+    count: int
+    total: int
+    sessions: List[TranscriptSummary]
+    next_cursor: Optional[str]
+
+
+class TranscriptDetailResponse(TranscriptSummary):
+    metadata: Dict
+    transcript: List[Dict]
+
+
+# -- Helpers -------------------------------------------------------------------
+
+def _parse_time(value: Optional[str], name: str) -> Optional[str]:
+    """ISO-8601 → naive local ISO string, comparable with saved started_at."""
+    if value is None:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(400, f"Invalid {name}: expected ISO-8601")
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt.isoformat()
+
+
+# -- Routes --------------------------------------------------------------------
+
+@router.get("", response_model=TranscriptSearchResponse)
+async def search_transcripts(
+    q: Optional[str] = Query(None, description='Full-text query: words, "phrases", prefix*, AND/OR/NOT'),
+    customer_id: Optional[str] = None,
+    language: Optional[str] = None,
+    started_after: Optional[str] = None,
+    started_before: Optional[str] = None,
+    min_duration_s: Optional[float] = Query(None, ge=0),
+    max_duration_s: Optional[float] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    try:
+        after_id = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+    try:
+        page, total, next_cursor = await asyncio.to_thread(
+            get_index().search,
+            text=q,
+            customer_id=customer_id,
+            language=language,
+            started_after=_parse_time(started_after, "started_after"),
+            started_before=_parse_time(started_before, "started_before"),
+            min_duration_s=min_duration_s,
+            max_duration_s=max_duration_s,
+            limit=limit,
+            cursor=after_id,
+        )
+    except sqlite3.OperationalError as e:
+        raise HTTPException(400, f"Invalid search query: {e}")
+    return TranscriptSearchResponse(
+        count=len(page),
+        total=total,
+        sessions=[TranscriptSummary(**row) for row in page],
+        next_cursor=str(next_cursor) if next_cursor is not None else None,
+    )
+
+
+@router.get("/{session_id}", response_model=TranscriptDetailResponse)
+async def get_transcript(session_id: str):
+    index = get_index()
+    row = await asyncio.to_thread(index.get, session_id)
+    if not row:
+        raise HTTPException(404, "Transcript not found")
+    loaded = await asyncio.to_thread(read_session, index.root, row["path"])
+    if loaded is None:
+        raise HTTPException(404, "Transcript files are gone (run the backfill with --prune)")
+    metadata, entries = loaded
+    return TranscriptDetailResponse(**row, metadata=metadata, transcript=entries)
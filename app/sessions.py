@@ -0,0 +1,300 @@
+"""
+Lisa Voice Agent — Session Registry
+=====================================
+Bounded store for demo sessions.
+
+SessionStore is the interface the routes use; SessionRegistry is the
+in-memory implementation (single API process). Multi-worker mode uses a
+shared backend from app/state.py instead.
+
+- max_size caps memory: when full, the oldest finished session goes
+  first (then the oldest session overall).
+- Finished sessions ("ended", "mock") expire after ended_ttl_s.
+- Secondary indexes by customer_id, status and creation time keep
+  filtered, cursor-paginated listing independent of registry size.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Sessions in these states are finished and subject to TTL eviction.
+TERMINAL_STATUSES = frozenset({"ended", "mock"})
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class SessionStore(ABC):
+    """
+    Session records keyed by id. Every backend keeps the same semantics:
+
+    - add() evicts expired sessions, then (at max_size) the oldest
+      finished session, else the oldest session
+    - records in TERMINAL_STATUSES expire ended_ttl_s after they got there
+    - query() returns sessions in creation order; cursors are opaque ints
+      that only grow
+    """
+
+    max_size: int
+    ended_ttl_s: float
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    @abstractmethod
+    def add(self, record: dict) -> dict: ...
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    def set_status(self, session_id: str, status: str, **fields) -> Optional[dict]: ...
+
+    @abstractmethod
+    def query(
+        self,
+        customer_id: Optional[str] = None,
+        status: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[int]]: ...
+
+    @abstractmethod
+    def sweep(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]: ...
+
+    def close(self) -> None:
+        pass
+
+
+class SessionRegistry(SessionStore):
+    """In-memory session records, with per-customer/status/time indexes."""
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ended_ttl_s: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_size = max_size
+        self.ended_ttl_s = ended_ttl_s
+        self._clock = clock
+        self._lock = threading.RLock()
+
+        self._records: Dict[str, dict] = {}
+        self._seq_of: Dict[str, int] = {}
+        self._id_of: Dict[int, str] = {}
+        self._next_seq = 1
+        self._last_created = 0.0
+
+        # Parallel, ascending lists: every seq and its creation time.
+        self._all_seqs: List[int] = []
+        self._all_created: List[float] = []
+        # Ascending seq lists per customer / status.
+        self._by_customer: Dict[str, List[int]] = {}
+        self._by_status: Dict[str, List[int]] = {}
+        # (expires_at, seq) for finished sessions.
+        self._expiry: List[Tuple[float, int]] = []
+        self._expires_at: Dict[int, float] = {}
+
+        self.evicted_total = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._records
+
+    # -- Index helpers --------------------------------------------------------
+
+    @staticmethod
+    def _index_add(index: Dict[str, List[int]], key: str, seq: int) -> None:
+        index.setdefault(key, []).append(seq)   # seqs only ever grow
+
+    @staticmethod
+    def _index_remove(index: Dict[str, List[int]], key: str, seq: int) -> None:
+        seqs = index.get(key)
+        if not seqs:
+            return
+        i = bisect_left(seqs, seq)
+        if i < len(seqs) and seqs[i] == seq:
+            del seqs[i]
+        if not seqs:
+            del index[key]
+
+    def _schedule_expiry(self, seq: int, status: str, now: float) -> None:
+        if status in TERMINAL_STATUSES:
+            expires_at = now + self.ended_ttl_s
+            self._expires_at[seq] = expires_at
+            heapq.heappush(self._expiry, (expires_at, seq))
+        else:
+            self._expires_at.pop(seq, None)
+
+    def _remove(self, session_id: str) -> None:
+        record = self._records.pop(session_id)
+        seq = self._seq_of.pop(session_id)
+        del self._id_of[seq]
+        self._expires_at.pop(seq, None)
+
+        i = bisect_left(self._all_seqs, seq)
+        del self._all_seqs[i]
+        del self._all_created[i]
+        self._index_remove(self._by_customer, record["customer_id"], seq)
+        self._index_remove(self._by_status, record["status"], seq)
+
+    # -- Eviction --------------------------------------------------------------
+
+    def _evict_expired(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, seq = heapq.heappop(self._expiry)
+            # Skip stale heap entries (session removed or status changed).
+            if self._expires_at.get(seq) != expires_at:
+                continue
+            self._remove(self._id_of[seq])
+            self.evicted_total += 1
+
+    def _evict_for_capacity(self) -> None:
+        while self._records and len(self._records) >= self.max_size:
+            oldest = None
+            for status in TERMINAL_STATUSES:
+                seqs = self._by_status.get(status)
+                if seqs and (oldest is None or seqs[0] < oldest):
+                    oldest = seqs[0]
+            if oldest is None:
+                oldest = self._all_seqs[0]
+            self._remove(self._id_of[oldest])
+            self.evicted_total += 1
+
+    def sweep(self) -> None:
+        """Drop expired finished sessions."""
+        with self._lock:
+            self._evict_expired(self._clock())
+
+    # -- Public API -------------------------------------------------------------
+
+    def add(self, record: dict) -> dict:
+        """Register a session record (needs id, customer_id, status)."""
+        with self._lock:
+            now = self._clock()
+            self._evict_expired(now)
+            if record["id"] in self._records:
+                self._remove(record["id"])
+            self._evict_for_capacity()
+
+            created = max(now, self._last_created)
+            self._last_created = created
+            record.setdefault("created_at", _iso(created))
+
+            seq = self._next_seq
+            self._next_seq += 1
+            self._records[record["id"]] = record
+            self._seq_of[record["id"]] = seq
+            self._id_of[seq] = record["id"]
+            self._all_seqs.append(seq)
+            self._all_created.append(created)
+            self._index_add(self._by_customer, record["customer_id"], seq)
+            self._index_add(self._by_status, record["status"], seq)
+            self._schedule_expiry(seq, record["status"], now)
+            return record
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return self._records.get(session_id)
+
+    def set_status(self, session_id: str, status: str, **fields) -> Optional[dict]:
+        """Move a session to a new status, updating indexes and TTL."""
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None:
+                return None
+            seq = self._seq_of[session_id]
+            now = self._clock()
+            if record["status"] != status:
+                self._index_remove(self._by_status, record["status"], seq)
+                # Seqs are re-inserted in order, keeping the list sorted.
+                seqs = self._by_status.setdefault(status, [])
+                seqs.insert(bisect_left(seqs, seq), seq)
+                record["status"] = status
+            record.update(fields)
+            self._schedule_expiry(seq, status, now)
+            return record
+
+    def query(
+        self,
+        customer_id: Optional[str] = None,
+        status: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Sessions in creation order matching all filters.
+        Returns (page, next_cursor); next_cursor is None on the last page.
+        """
+        with self._lock:
+            self._evict_expired(self._clock())
+
+            # Creation-time range → seq range via the global time index.
+            lo_seq = (cursor or 0) + 1
+            hi_seq = self._next_seq
+            if created_after is not None:
+                i = bisect_left(self._all_created, created_after)
+                lo_seq = max(lo_seq, self._all_seqs[i] if i < len(self._all_seqs) else hi_seq)
+            if created_before is not None:
+                i = bisect_left(self._all_created, created_before)
+                hi_seq = min(hi_seq, self._all_seqs[i] if i < len(self._all_seqs) else hi_seq)
+
+            # Drive from the most selective index; check the other filter inline.
+            if customer_id is not None and status is not None:
+                by_c = self._by_customer.get(customer_id, [])
+                by_s = self._by_status.get(status, [])
+                candidates = by_c if len(by_c) <= len(by_s) else by_s
+            elif customer_id is not None:
+                candidates = self._by_customer.get(customer_id, [])
+            elif status is not None:
+                candidates = self._by_status.get(status, [])
+            else:
+                candidates = self._all_seqs
+
+            page: List[dict] = []
+            last_seq = None
+            start = bisect_left(candidates, lo_seq)
+            end = bisect_left(candidates, hi_seq)
+            for j in range(start, end):
+                seq = candidates[j]
+                record = self._records[self._id_of[seq]]
+                if customer_id is not None and record["customer_id"] != customer_id:
+                    continue
+                if status is not None and record["status"] != status:
+                    continue
+                if len(page) == limit:
+                    return page, last_seq
+                page.append(record)
+                last_seq = seq
+            return page, None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._records),
+                "max_size": self.max_size,
+                "evicted_total": self.evicted_total,
+                **{f"status_{k}": len(v) for k, v in self._by_status.items()},
+            }
@@ -0,0 +1,258 @@
+"""
+Lisa Voice Agent — Shared State
+=================================
+Session store backends, so several API worker processes see the same
+sessions (see app/sessions.py for the SessionStore interface).
+
+- memory: SessionRegistry, one process only
+- sqlite: SQLiteSessionStore, a WAL database every worker on the host
+  opens (STATE_DB_PATH)
+- "package.module:ClassName": any other SessionStore, e.g. one backed by
+  a Redis-compatible server. It is constructed with the keyword
+  arguments max_size, ended_ttl_s and url (STATE_URL).
+
+Customers are already shared through customers/db.py: every write bumps
+a global revision and each process's CustomerStore catches up (and
+drops its cached prompts) when it sees a newer one.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .sessions import TERMINAL_STATUSES, SessionRegistry, SessionStore, _iso
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    id          TEXT NOT NULL UNIQUE,
+    customer_id TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    created     REAL NOT NULL,
+    expires_at  REAL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_customer ON sessions(customer_id, seq);
+CREATE INDEX IF NOT EXISTS sessions_status ON sessions(status, seq);
+CREATE INDEX IF NOT EXISTS sessions_created ON sessions(created);
+CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions(expires_at) WHERE expires_at IS NOT NULL;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('size', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('evicted_total', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('last_created', 0);
+"""
+
+_TERMINAL = tuple(sorted(TERMINAL_STATUSES))
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite file shared by every API worker on the host."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_size: int = 10_000,
+        ended_ttl_s: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.ended_ttl_s = ended_ttl_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        self.sweep()
+        with self._lock:
+            return int(self._meta("size"))
+
+    # -- Helpers (call with the lock held) -------------------------------------
+
+    def _meta(self, key: str) -> float:
+        return self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()[0]
+
+    def _add_meta(self, key: str, delta: float) -> None:
+        self._conn.execute("UPDATE meta SET value = value + ? WHERE key = ?", (delta, key))
+
+    def _write(self, fn):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn()
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def _expires_at(self, status: str, now: float) -> Optional[float]:
+        return now + self.ended_ttl_s if status in TERMINAL_STATUSES else None
+
+    def _delete(self, where: str, params: tuple) -> int:
+        removed = self._conn.execute(f"DELETE FROM sessions WHERE {where}", params).rowcount
+        if removed:
+            self._add_meta("size", -removed)
+        return removed
+
+    def _evict_expired(self, now: float) -> None:
+        removed = self._delete("expires_at <= ?", (now,))
+        if removed:
+            self._add_meta("evicted_total", removed)
+
+    def _evict_for_capacity(self) -> None:
+        while self._meta("size") >= self.max_size:
+            seqs = [
+                self._conn.execute("SELECT MIN(seq) FROM sessions WHERE status = ?", (status,)).fetchone()[0]
+                for status in _TERMINAL
+            ]
+            seqs = [s for s in seqs if s is not None]
+            oldest = min(seqs) if seqs else self._conn.execute("SELECT MIN(seq) FROM sessions").fetchone()[0]
+            if oldest is None:
+                return
+            self._delete("seq = ?", (oldest,))
+            self._add_meta("evicted_total", 1)
+
+    # -- SessionStore ----------------------------------------------------------
+
+    def sweep(self) -> None:
+        """Drop expired finished sessions (a cheap indexed read when there are none)."""
+        now = self._clock()
+        with self._lock:
+            due = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE expires_at <= ? LIMIT 1", (now,)
+            ).fetchone()
+            if due:
+                self._write(lambda: self._evict_expired(now))
+
+    def add(self, record: dict) -> dict:
+        """Register a session record (needs id, customer_id, status)."""
+        def _add():
+            now = self._clock()
+            self._evict_expired(now)
+            self._delete("id = ?", (record["id"],))
+            self._evict_for_capacity()
+
+            created = max(now, self._meta("last_created"))
+            self._conn.execute("UPDATE meta SET value = ? WHERE key = 'last_created'", (created,))
+            record.setdefault("created_at", _iso(created))
+            self._conn.execute(
+                "INSERT INTO sessions (id, customer_id, status, created, expires_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record["id"], record["customer_id"], record["status"], created,
+                 self._expires_at(record["status"], now), json.dumps(record, ensure_ascii=False)),
+            )
+            self._add_meta("size", 1)
+            return record
+
+        with self._lock:
+            return self._write(_add)
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (session_id, self._clock()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_status(self, session_id: str, status: str, **fields) -> Optional[dict]:
+        """Move a session to a new status (and TTL), merging `fields` into the record."""
+        def _set():
+            row = self._conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            record = json.loads(row[0])
+            record["status"] = status
+            record.update(fields)
+            self._conn.execute(
+                "UPDATE sessions SET status = ?, expires_at = ?, data = ? WHERE id = ?",
+                (status, self._expires_at(status, self._clock()),
+                 json.dumps(record, ensure_ascii=False), session_id),
+            )
+            return record
+
+        with self._lock:
+            return self._write(_set)
+
+    def query(
+        self,
+        customer_id: Optional[str] = None,
+        status: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Sessions in creation order matching all filters.
+        Returns (page, next_cursor); next_cursor is None on the last page.
+        """
+        self.sweep()
+        clauses, params = ["seq > ?"], [cursor or 0]
+        for clause, value in (
+            ("customer_id = ?", customer_id),
+            ("status = ?", status),
+            ("created >= ?", created_after),
+            ("created < ?", created_before),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT seq, data FROM sessions WHERE {' AND '.join(clauses)} ORDER BY seq LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        page = [json.loads(data) for _seq, data in rows[:limit]]
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return page, next_cursor
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            by_status = self._conn.execute(
+                "SELECT status, COUNT(*) FROM sessions GROUP BY status"
+            ).fetchall()
+            return {
+                "size": int(self._meta("size")),
+                "max_size": self.max_size,
+                "evicted_total": int(self._meta("evicted_total")),
+                **{f"status_{k}": n for k, n in by_status},
+            }
+
+
+def create_session_store(cfg) -> SessionStore:
+    """The session store selected by STATE_BACKEND (see module docstring)."""
+    backend = cfg.STATE_BACKEND
+    if backend == "memory":
+        return SessionRegistry(max_size=cfg.SESSIONS_MAX, ended_ttl_s=cfg.SESSIONS_ENDED_TTL_S)
+    if backend == "sqlite":
+        return SQLiteSessionStore(
+            Path(cfg.STATE_DB_PATH), max_size=cfg.SESSIONS_MAX, ended_ttl_s=cfg.SESSIONS_ENDED_TTL_S,
+        )
+    module_name, _, class_name = backend.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown STATE_BACKEND {backend!r} (memory, sqlite or package.module:Class)")
+    store_cls = getattr(importlib.import_module(module_name), class_name)
+    return store_cls(
+        max_size=cfg.SESSIONS_MAX, ended_ttl_s=cfg.SESSIONS_ENDED_TTL_S, url=os.getenv("STATE_URL", ""),
+    )
@@ -0,0 +1 @@
+"""Lisa Voice Agent - Benchmarks"""
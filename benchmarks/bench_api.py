@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+"""
+API Throughput Benchmark
+=========================
+req/s and p50/p99 latency of the API's hot routes at several concurrency
+levels and registry sizes:
+
+- POST  /api/demo/session          (mock mode, and signed-token mode)
+- GET   /api/customers
+- GET   /api/customers/{id}
+- PATCH /api/customers/{id}
+- GET   /api/demo/sessions         (first page, and filtered by customer)
+
+Each level ("sessions:customers", e.g. 10000:5000) seeds that many
+customers into a throwaway customers.db and that many sessions into the
+registry before measuring. By default requests go in-process over the
+ASGI transport (app cost only, INFO logging off); --uvicorn also runs
+every level against a real uvicorn server on localhost (HTTP parsing,
+sockets, logging).
+
+Signed-token mode uses dummy LiveKit credentials; tokens are signed but
+never sent anywhere. It needs livekit-api installed.
+
+Results are written to benchmarks/results/api-<commit>.json;
+pass --compare <file> to diff against an earlier run.
+
+Usage:
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --levels 1000:50 10000:5000 --concurrency 1 16 64
+    python -m benchmarks.bench_api --uvicorn --compare benchmarks/results/api-abc1234.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import importlib.util
+import itertools
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from benchmarks.results import compare, percentiles, print_results, write_results
+
+DUMMY_LIVEKIT = {
+    "LIVEKIT_URL": "wss://bench.invalid",
+    "LIVEKIT_API_KEY": "bench-key",
+    "LIVEKIT_API_SECRET": "bench-secret-bench-secret-bench-secret",
+}
+SESSION_CUSTOMERS = 50       # seeded sessions are spread over the first N customers
+SEED_BATCH = 1000            # sessions per /sessions:batch call while seeding
+
+
+class Level(NamedTuple):
+    sessions: int
+    customers: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.sessions}s_{self.customers}c"
+
+
+def _level(value: str) -> Level:
+    sessions, _, customers = value.partition(":")
+    return Level(int(sessions), int(customers or sessions))
+
+
+# -- Routes -------------------------------------------------------------------
+
+Request = Tuple[str, str, Optional[dict]]
+
+
+class Route(NamedTuple):
+    name: str
+    make: Callable[[int, "Workload"], Request]
+    signed: bool = False     # needs signed-token mode
+    listing: bool = False    # response grows with registry size: uses --list-requests
+
+
+@dataclasses.dataclass
+class Workload:
+    customer_ids: List[str]
+    rng: random.Random
+
+    def customer(self) -> str:
+        return self.rng.choice(self.customer_ids)
+
+    def session_customer(self) -> str:
+        return self.customer_ids[self.rng.randrange(min(SESSION_CUSTOMERS, len(self.customer_ids)))]
+
+
+def _create_session(i: int, w: Workload) -> Request:
+    return "POST", "/api/demo/session", {"name": f"bench-{i}", "customer_id": w.customer(), "language": "it"}
+
+
+ROUTES = [
+    Route("create_session_mock", _create_session),
+    Route("create_session_signed", _create_session, signed=True),
+    Route("list_customers", lambda i, w: ("GET", "/api/customers", None), listing=True),
+    Route("get_customer", lambda i, w: ("GET", f"/api/customers/{w.customer()}", None)),
+    Route("patch_customer", lambda i, w: (
+        "PATCH", f"/api/customers/{w.customer()}", {"service_area": f"Zona {i % 97}"},
+    )),
+    Route("list_sessions", lambda i, w: ("GET", "/api/demo/sessions?limit=100", None)),
+    Route("list_sessions_customer", lambda i, w: (
+        "GET", f"/api/demo/sessions?limit=100&customer_id={w.session_customer()}", None,
+    )),
+]
+
+
+# -- Seeding ------------------------------------------------------------------
+
+def customer_ids(count: int) -> List[str]:
+    return [f"bench{n:05d}" for n in range(count)]
+
+
+def seed_customers(db_path: Path, count: int) -> None:
+    """Top the database up to `count` bench customers (written like API creates)."""
+    from customers.db import CustomerDB
+    from customers.models import CustomerConfig
+
+    db = CustomerDB(db_path)
+    try:
+        existing = {cid for cid, _, _, deleted in db.changes_since(0) if not deleted}
+        for n, cid in enumerate(customer_ids(count)):
+            if cid in existing:
+                continue
+            customer = CustomerConfig(
+                id=cid,
+                name=f"Bench Business {n}",
+                agent_name="Lisa",
+                language="it",
+                business_category="home_services",
+                service_area="Milano e provincia",
+                business_hours="Lun-Ven 8:00-18:00",
+                services=["Idraulica", "Riscaldamento", "Climatizzazione", "Pronto intervento"],
+                common_customer_questions=["Quanto costa un intervento?", "Venite anche il sabato?"],
+                system_prompt="Sei un assistente cordiale e conciso. " * 20,
+            )
+            db.put(cid, customer.to_record())
+    finally:
+        db.close()
+
+
+async def seed_sessions(client: httpx.AsyncClient, level: Level) -> None:
+    ids = customer_ids(min(SESSION_CUSTOMERS, level.customers))
+    for offset in range(0, level.sessions, SEED_BATCH):
+        n = min(SEED_BATCH, level.sessions - offset)
+        batch = [
+            {"name": f"seed-{offset + i}", "customer_id": ids[(offset + i) % len(ids)], "language": "it"}
+            for i in range(n)
+        ]
+        r = await client.post("/api/demo/sessions:batch", json={"sessions": batch})
+        r.raise_for_status()
+
+
+# -- Measurement ----------------------------------------------------------------
+
+async def measure(client: httpx.AsyncClient, route: Route, workload: Workload,
+                  total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def _worker() -> None:
+        nonlocal errors
+        while (i := next(counter)) < total:
+            method, url, body = route.make(i, workload)
+            start = time.perf_counter()
+            r = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if r.status_code >= 400:
+                errors += 1
+
+    for i in range(min(20, total)):   # warm caches and connections
+        method, url, body = route.make(i, workload)
+        await client.request(method, url, json=body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    return {"req_per_s": total / wall, **percentiles(latencies), "errors": errors}
+
+
+async def bench_level(client: httpx.AsyncClient, routes: List[Route], level: Level, args) -> Dict:
+    workload = Workload(customer_ids(level.customers), random.Random(42))
+    results: Dict = {}
+    for route in routes:
+        total = args.list_requests if route.listing else args.requests
+        results[route.name] = {
+            f"c{c}": await measure(client, route, workload, total, c) for c in args.concurrency
+        }
+        line = "  ".join(
+            f"c{c}: {r['req_per_s']:8.0f} req/s p99 {r['p99_ms']:7.2f} ms"
+            for c, r in zip(args.concurrency, results[route.name].values())
+        )
+        print(f"   {route.name:<24} {line}", flush=True)
+    return results
+
+
+# -- Targets ------------------------------------------------------------------
+
+@contextlib.asynccontextmanager
+async def inprocess(app, level: Level, signed: bool):
+    """The app over the ASGI transport, with a fresh registry and LiveKit mode set."""
+    from app.config import Config
+    from app.routes import demo
+    from app.sessions import SessionRegistry
+
+    demo.sessions = SessionRegistry(max_size=level.sessions, ended_ttl_s=Config.SESSIONS_ENDED_TTL_S)
+    saved, saved_check = Config.snapshot(), Config._next_check
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await seed_sessions(client, level)
+            if signed:
+                Config._apply(dataclasses.replace(saved, **DUMMY_LIVEKIT))
+                Config._next_check = float("inf")   # no env-file reload mid-run
+            yield client
+    finally:
+        Config._apply(saved)
+        Config._next_check = saved_check
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_server(env: Dict[str, str], level: Level, signed: bool, concurrency: int):
+    """A real uvicorn process (own registry) and an HTTP client for it."""
+    port = _free_port()
+    server_env = {
+        **os.environ, **env,
+        "SESSIONS_MAX": str(level.sessions),
+        **(DUMMY_LIVEKIT if signed else {k: "" for k in DUMMY_LIVEKIT}),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=server_env, cwd=Path(__file__).resolve().parents[1],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"uvicorn did not start (exit code {proc.poll()})")
+                await asyncio.sleep(0.2)
+            await seed_sessions(client, level)
+            yield client
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# -- Main -----------------------------------------------------------------------
+
+def _signing_available() -> bool:
+    try:
+        return importlib.util.find_spec("livekit.api") is not None
+    except ModuleNotFoundError:
+        return False
+
+
+async def run(args, env: Dict[str, str], db_path: Path) -> Dict:
+    routes = [r for r in ROUTES if not args.routes or r.name in args.routes]
+    if not _signing_available():
+        print("⚠️  livekit-api not installed — skipping signed-token mode")
+        routes = [r for r in routes if not r.signed]
+    modes = [(False, [r for r in routes if not r.signed]), (True, [r for r in routes if r.signed])]
+    modes = [(signed, rs) for signed, rs in modes if rs]
+
+    from app.main import app   # after the environment points at the throwaway databases
+    logging.disable(logging.WARNING)   # per-request INFO logs would flood the output
+
+    results: Dict = {"inprocess": {}}
+    if args.uvicorn:
+        results["uvicorn"] = {}
+    for level in sorted(args.levels, key=lambda lv: lv.customers):
+        seed_customers(db_path, level.customers)
+        for signed, mode_routes in modes:
+            print(f"\n▶ in-process · {level.name} · {'signed' if signed else 'mock'}")
+            async with inprocess(app, level, signed) as client:
+                results["inprocess"].setdefault(level.name, {}).update(
+                    await bench_level(client, mode_routes, level, args)
+                )
+            if args.uvicorn:
+                print(f"\n▶ uvicorn · {level.name} · {'signed' if signed else 'mock'}")
+                async with uvicorn_server(env, level, signed, max(args.concurrency)) as client:
+                    results["uvicorn"].setdefault(level.name, {}).update(
+                        await bench_level(client, mode_routes, level, args)
+                    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=_level, nargs="+", default=[_level("1000:50"), _level("10000:5000")],
+                        help="registry sizes as sessions:customers")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route and concurrency")
+    parser.add_argument("--list-requests", type=int, default=200, help="requests for GET /api/customers")
+    parser.add_argument("--routes", nargs="+", choices=[r.name for r in ROUTES], default=None)
+    parser.add_argument("--uvicorn", action="store_true", help="also benchmark a real uvicorn server")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "customers.db"
+        env = {
+            "CUSTOMERS_DB_PATH": str(db_path),
+            "TRANSCRIPTS_DB_PATH": str(Path(tmp) / "transcripts.db"),
+            "TELEMETRY_DIR": str(Path(tmp) / "metrics"),
+        }
+        os.environ.update(env)
+        results = asyncio.run(run(args, env, db_path))
+        logging.shutdown()
+
+    print()
+    print_results(results)
+    if not args.no_save:
+        print(f"\n📄 {write_results('api', results, args.output)}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
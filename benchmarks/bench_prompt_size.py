@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Prompt Size Benchmark
+======================
+System prompt size per persona, full vs compact mode, for one or more
+languages, plus compile time with and without the prompt cache.
+
+Usage:
+    python -m benchmarks.bench_prompt_size
+    python -m benchmarks.bench_prompt_size --languages en it es
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from agent.personas import get_all as get_all_personas
+from agent.prompts import PromptCache, compile_system_prompt, prompt_size
+
+
+def _time_per_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--languages", nargs="+", default=["en", "it"])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    personas = get_all_personas()
+    print(f"{'persona':<16} {'lang':<5} {'full B':>8} {'compact B':>10} {'full tok':>9} {'compact tok':>12} {'saved':>7}")
+    total_full = total_compact = 0
+    for pid, persona in sorted(personas.items()):
+        for lang in args.languages:
+            full = prompt_size(compile_system_prompt(persona, lang, compact=False))
+            compact = prompt_size(compile_system_prompt(persona, lang, compact=True))
+            total_full += full["bytes"]
+            total_compact += compact["bytes"]
+            saved = 1 - compact["bytes"] / full["bytes"]
+            print(
+                f"{pid:<16} {lang:<5} {full['bytes']:>8} {compact['bytes']:>10} "
+                f"{full['approx_tokens']:>9} {compact['approx_tokens']:>12} {saved:>6.1%}"
+            )
+    print(f"{'total':<22} {total_full:>8} {total_compact:>10} {'':>22} {1 - total_compact / total_full:>6.1%}")
+
+    print()
+    persona = next(iter(personas.values()))
+    cache = PromptCache()
+    cold = _time_per_call(lambda: compile_system_prompt(persona, "it"), args.iterations)
+    warm = _time_per_call(lambda: cache.get(persona, "it"), args.iterations)
+    print(f"compile (uncached): {cold:8.2f} us/call")
+    print(f"compile (cached):   {warm:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Session Provisioning Benchmark
+===============================
+Compares sessions/s of the per-session endpoint (POST /api/demo/session)
+against the batch endpoint (POST /api/demo/sessions:batch).
+
+Runs in-process over the ASGI transport, so no server is needed.
+Set LIVEKIT_* in the environment to measure signed-token mode;
+otherwise both endpoints run in mock mode.
+
+Usage:
+    python -m benchmarks.bench_sessions --sessions 2000 --batch-size 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.main import app
+
+
+def _entry(i: int) -> dict:
+    return {"name": f"bench-{i}", "customer_id": "home_services", "language": "en"}
+
+
+async def bench_single(client: httpx.AsyncClient, total: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(i: int) -> None:
+        async with sem:
+            r = await client.post("/api/demo/session", json=_entry(i))
+            r.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def bench_batch(client: httpx.AsyncClient, total: int, batch_size: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(offset: int) -> None:
+        n = min(batch_size, total - offset)
+        async with sem:
+            r = await client.post(
+                "/api/demo/sessions:batch",
+                json={"sessions": [_entry(offset + i) for i in range(n)]},
+            )
+            r.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one(o) for o in range(0, total, batch_size)))
+    return total / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        mode = (await client.get("/api/demo/config")).json()
+        print(f"LiveKit configured: {mode['livekit']}")
+
+        single = await bench_single(client, args.sessions, args.concurrency)
+        batch = await bench_batch(client, args.sessions, args.batch_size, args.concurrency)
+
+    print(f"per-session endpoint : {single:10.1f} sessions/s")
+    print(f"batch endpoint       : {batch:10.1f} sessions/s  (batch={args.batch_size})")
+    print(f"speedup              : {batch / single:10.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+Transcript Store Benchmark
+===========================
+Simulates a long call: user turns arrive as several incremental STT
+finals (each one a dedupe lookup plus replace), agent turns as a single
+item. Compares the previous representation (dataclass per entry, eager
+isoformat, reverse scan for the last entry by role) with TranscriptStore.
+
+Reports wall time and peak traced memory for the in-memory transcript.
+
+Usage:
+    python -m benchmarks.bench_transcript
+    python -m benchmarks.bench_transcript --minutes 60 --turns-per-minute 12 --finals 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from agent.transcript import TranscriptStore
+
+
+@dataclass
+class _LegacyEntry:
+    role: str
+    text: str
+    timestamp: str
+    index: int = 0
+
+
+class _LegacyTranscript:
+    """Replica of the recorder's former list-of-dataclasses transcript."""
+
+    def __init__(self) -> None:
+        self.entries: List[_LegacyEntry] = []
+
+    def last_by_role(self, role: str) -> Optional[_LegacyEntry]:
+        for entry in reversed(self.entries):
+            if entry.role == role:
+                return entry
+        return None
+
+    def user_final(self, text: str) -> None:
+        last = self.last_by_role("user")
+        if last and (text.startswith(last.text) or last.text.startswith(text)):
+            last.text = text
+            last.timestamp = datetime.now().isoformat()
+        else:
+            self.entries.append(_LegacyEntry("user", text, datetime.now().isoformat(), len(self.entries)))
+
+    def agent_item(self, text: str) -> None:
+        last = self.last_by_role("agent")
+        if last and last.text == text:
+            return
+        self.entries.append(_LegacyEntry("agent", text, datetime.now().isoformat(), len(self.entries)))
+
+    def serialize(self) -> list:
+        return [{"role": e.role, "text": e.text, "timestamp": e.timestamp} for e in self.entries]
+
+
+class _CompactTranscript:
+    """Same call pattern as SessionRecorder on top of TranscriptStore."""
+
+    def __init__(self) -> None:
+        self.store = TranscriptStore()
+
+    def user_final(self, text: str) -> None:
+        store = self.store
+        last = store.last_index("user")
+        last_text = store.text(last) if last >= 0 else None
+        if last_text and (text.startswith(last_text) or last_text.startswith(text)):
+            store.replace(last, text)
+        else:
+            store.append("user", text)
+
+    def agent_item(self, text: str) -> None:
+        store = self.store
+        last = store.last_index("agent")
+        if last >= 0 and store.text(last) == text:
+            return
+        store.append("agent", text)
+
+    def serialize(self) -> list:
+        return self.store.to_list()
+
+
+def _script(turns: int, finals: int) -> list:
+    """(role, text) events for a call; user turns grow word by word."""
+    events = []
+    for turn in range(turns):
+        words = [f"word{turn}_{w}" for w in range(finals)]
+        for n in range(1, finals + 1):
+            events.append(("user", " ".join(words[:n])))
+        events.append(("agent", f"Risposta numero {turn}: va bene, ci penso io."))
+    return events
+
+
+def _run(factory, events: list) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    transcript = factory()
+    for role, text in events:
+        if role == "user":
+            transcript.user_final(text)
+        else:
+            transcript.agent_item(text)
+    feed_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    entries = transcript.serialize()
+    serialize_s = time.perf_counter() - start
+    return feed_s, serialize_s, peak, len(entries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--turns-per-minute", type=int, default=12)
+    parser.add_argument("--finals", type=int, default=6, help="incremental finals per user turn")
+    args = parser.parse_args()
+
+    events = _script(args.minutes * args.turns_per_minute, args.finals)
+    print(f"{len(events)} events ({args.minutes} min call, {args.finals} finals per user turn)\n")
+    print(f"{'store':<10} {'entries':>8} {'feed ms':>9} {'µs/event':>9} {'save ms':>8} {'peak KiB':>9}")
+    for name, factory in (("legacy", _LegacyTranscript), ("compact", _CompactTranscript)):
+        feed_s, serialize_s, peak, count = _run(factory, events)
+        print(
+            f"{name:<10} {count:>8} {feed_s * 1000:>9.1f} {feed_s / len(events) * 1e6:>9.2f} "
+            f"{serialize_s * 1000:>8.1f} {peak / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
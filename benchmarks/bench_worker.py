@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Agent Worker Benchmark
+=======================
+Offline benchmark of the worker's hot paths on LiveKit stand-ins
+(benchmarks/fakes.py):
+
+- entrypoint: setup overhead with zero simulated latency (pure CPU), and
+  a simulated call (connect / session start / late-joining caller) for
+  the pipelined and sequential startup paths
+- build_system_prompt (prewarmed cache)
+- SessionRecorder: event handling for a long call, then save()
+  (streaming and plain)
+- TranscriptPublisher: enqueue cost and data-channel send rate
+
+Results are written to benchmarks/results/worker-<commit>.json;
+pass --compare <file> to diff against an earlier run.
+
+Usage:
+    python -m benchmarks.bench_worker
+    python -m benchmarks.bench_worker --compare benchmarks/results/worker-abc1234.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import fakes
+
+fakes.install()
+
+import agent.main as worker_main
+from agent import metrics, recorder as recorder_module
+from agent.publisher import TranscriptPublisher
+from agent.recorder import SessionRecorder
+from benchmarks.results import compare, percentiles, print_results, write_results
+
+CUSTOMER = "real_estate"
+
+
+# ── entrypoint ──────────────────────────────────────────────────────────────
+
+async def _one_call(proc, pipelined: bool, n: int, join_delay_s: float, connect_s: float) -> float:
+    worker_main.PIPELINED_STARTUP = pipelined
+    session_id = f"b{n:07d}"
+    room = fakes.FakeRoom(f"{CUSTOMER}-{session_id}")
+    participant = fakes.caller("Bench", CUSTOMER, session_id, language="it")
+    if join_delay_s:
+        room.join_later(participant, join_delay_s)
+    else:
+        room.join(participant)
+    ctx = fakes.FakeJobContext(room, proc, connect_latency_s=connect_s)
+    start = time.perf_counter()
+    await worker_main.entrypoint(ctx)
+    elapsed = time.perf_counter() - start
+
+    # Hang up and let the save finish outside the timed region.
+    fakes.FakeAgentSession.last.close()
+    current = asyncio.current_task()
+    await asyncio.gather(*(t for t in asyncio.all_tasks() if t is not current))
+    return elapsed
+
+
+async def bench_entrypoint(runs: int, sim_runs: int, join_delay_s: float,
+                           connect_s: float, start_s: float) -> dict:
+    fakes.use_fakes(worker_main)
+    proc = fakes.FakeJobProcess()
+    worker_main.prewarm(proc)
+    results: dict = {}
+
+    fakes.FakeAgentSession.start_latency_s = 0.0
+    for mode, pipelined in (("pipelined", True), ("sequential", False)):
+        samples = [await _one_call(proc, pipelined, i, 0.0, 0.0) for i in range(runs)]
+        results[f"overhead_{mode}"] = percentiles(samples)
+
+    fakes.FakeAgentSession.start_latency_s = start_s
+    for mode, pipelined in (("pipelined", True), ("sequential", False)):
+        samples = [
+            await _one_call(proc, pipelined, runs + i, join_delay_s, connect_s) for i in range(sim_runs)
+        ]
+        results[f"simulated_{mode}"] = percentiles(samples)
+    fakes.FakeAgentSession.start_latency_s = 0.0
+    return results
+
+
+# ── prompts ─────────────────────────────────────────────────────────────────
+
+def bench_prompt(iterations: int) -> dict:
+    worker_main.load_persona(CUSTOMER)
+    results = {}
+    for language in ("en", "it"):
+        persona = worker_main.load_persona(CUSTOMER)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            worker_main.build_system_prompt(persona, language)
+        results[f"{language}_us"] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+
+# ── recorder ────────────────────────────────────────────────────────────────
+
+async def bench_recorder(turns: int, finals: int) -> dict:
+    script = fakes.conversation_script(turns, finals_per_turn=finals)
+    results = {"events": len(script)}
+    for mode, stream in (("streaming", True), ("plain", False)):
+        rec = SessionRecorder(
+            session_id=f"rec-{mode}", customer_id=CUSTOMER, user_name="Bench",
+            agent_name="Lisa", language="it", stream=stream,
+        )
+        session = fakes.FakeAgentSession()
+        rec.attach_to_session(session)
+        metrics.track_turns(session, rec.flight)
+
+        start = time.perf_counter()
+        session.play(script)
+        handle_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await rec.save()
+        save_s = time.perf_counter() - start
+        results[mode] = {
+            "events_per_s": len(script) / handle_s,
+            "us_per_event": handle_s / len(script) * 1e6,
+            "save_ms": save_s * 1000,
+        }
+    return results
+
+
+# ── publisher ───────────────────────────────────────────────────────────────
+
+async def bench_publisher(entries: int, updates_per_entry: int, latency_s: float) -> dict:
+    room = fakes.FakeRoom("bench-publisher", publish_latency_s=latency_s)
+    publisher = TranscriptPublisher(room, max_queued_bytes=1 << 30)
+    published = 0
+
+    start = time.perf_counter()
+    for index in range(entries):
+        text = "parola"
+        publisher.publish("user", text, "add", index)
+        for _ in range(updates_per_entry):
+            text += " parola"
+            publisher.publish("user", text, "replace", index)
+            published += 1
+        published += 1
+        await asyncio.sleep(0)   # let the sender run between entries, as on a live loop
+    enqueue_s = time.perf_counter() - start
+    await publisher.aclose(timeout_s=600)
+    total_s = time.perf_counter() - start
+
+    stats = publisher.stats()
+    return {
+        "updates": published,
+        "enqueue_us_per_update": enqueue_s / published * 1e6,
+        "sent": stats["sent"],
+        "coalesced": stats["coalesced"],
+        "messages_per_s": stats["sent"] / total_s,
+        "updates_per_s": published / total_s,
+    }
+
+
+# ── main ────────────────────────────────────────────────────────────────────
+
+async def run(args) -> dict:
+    return {
+        "entrypoint": await bench_entrypoint(
+            args.runs, args.sim_runs, args.join_delay, args.connect_latency, args.start_latency
+        ),
+        "build_system_prompt": bench_prompt(args.prompt_iterations),
+        "recorder": await bench_recorder(args.turns, args.finals),
+        "publisher": await bench_publisher(args.entries, args.finals, args.publish_latency),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200, help="entrypoint runs with zero latency")
+    parser.add_argument("--sim-runs", type=int, default=5, help="entrypoint runs with simulated latency")
+    parser.add_argument("--join-delay", type=float, default=0.5, help="caller joins after (s)")
+    parser.add_argument("--connect-latency", type=float, default=0.05)
+    parser.add_argument("--start-latency", type=float, default=0.3, help="session.start() (s)")
+    parser.add_argument("--prompt-iterations", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=720, help="recorder: user/agent turns (~1h call)")
+    parser.add_argument("--finals", type=int, default=4, help="incremental STT finals per user turn")
+    parser.add_argument("--entries", type=int, default=2000, help="publisher: transcript entries")
+    parser.add_argument("--publish-latency", type=float, default=0.0005, help="publish_data (s)")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)   # keep the worker's per-call logs out of the timings
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder_module.RECORDINGS_DIR = Path(tmp) / "recordings"
+        recorder_module.INDEX_TRANSCRIPTS = False
+        metrics.snapshots.directory = Path(tmp) / "metrics"
+        results = asyncio.run(run(args))
+
+    print_results(results)
+    if not args.no_save:
+        print(f"\n📄 {write_results('worker', results, args.output)}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
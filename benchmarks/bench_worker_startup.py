@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Worker Startup Benchmark
+=========================
+- import time of agent.main and app.main (fresh interpreter), with an
+  import-time profile (python -X importtime) of the slowest modules
+- prewarm() time
+- time-to-first-job: per-call setup (persona lookup, prompt build,
+  realtime model client, recorder) in a cold process vs. a prewarmed one
+
+Usage:
+    python -m benchmarks.bench_worker_startup
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+from agent.context import WorkerContext
+from agent.main import _create_model
+from agent.prompts import PromptCache
+from agent.recorder import SessionRecorder
+
+
+def _import_time(module: str, runs: int) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def _import_profile(module: str, top: int) -> List[Tuple[float, float, str]]:
+    """(cumulative s, self s, module) for the `top` slowest imports of `module`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _first_job_setup(context: WorkerContext, customer_id: str, language: str) -> float:
+    start = time.perf_counter()
+    persona = context.load_persona(customer_id)
+    context.system_prompt(persona, language)
+    context.model_for(persona["voice"])
+    SessionRecorder(
+        session_id="bench", customer_id=customer_id, user_name="bench",
+        agent_name=persona["agent_name"], language=language,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customer", default="real_estate")
+    parser.add_argument("--language", default="it")
+    parser.add_argument("--import-runs", type=int, default=3)
+    parser.add_argument("--profile-top", type=int, default=15, help="slowest imports to list (0 = skip)")
+    args = parser.parse_args()
+
+    for module in ("agent.main", "app.main"):
+        print(f"import {module:<18}: {_import_time(module, args.import_runs) * 1000:8.1f} ms (median)")
+        if args.profile_top:
+            print(f"  {'cumulative':>10}  {'self':>8}  module")
+            for cumulative, own, name in _import_profile(module, args.profile_top):
+                print(f"  {cumulative * 1000:8.1f}ms  {own * 1000:6.1f}ms  {name}")
+
+    cold = WorkerContext(_create_model, prompts=PromptCache())
+    cold_s = _first_job_setup(cold, args.customer, args.language)
+
+    warm = WorkerContext(_create_model, prompts=PromptCache())
+    warm.prewarm()
+    warm_s = _first_job_setup(warm, args.customer, args.language)
+
+    print(f"prewarm()                : {warm.prewarm_s * 1000:8.1f} ms (before any job)")
+    print(f"first job setup (cold)   : {cold_s * 1000:8.2f} ms")
+    print(f"first job setup (warm)   : {warm_s * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+LiveKit Stand-ins
+==================
+Offline fakes for the objects the agent worker touches: Room (with
+participants joining late), LocalParticipant.publish_data, AgentSession
+(event emitter with start/generate_reply), Agent, RealtimeModel and
+JobContext. They emit the same events, with the same attribute names,
+that agent/recorder.py, agent/metrics.py and agent/main.py listen to.
+
+install() registers minimal `livekit.*` modules when livekit-agents is
+not installed, so agent.main can be imported; use_fakes() points
+agent.main at the fakes either way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import inspect
+import json
+import sys
+import types
+from typing import Callable, Dict, List, Optional
+
+
+class FakeEmitter:
+    def __init__(self) -> None:
+        self._handlers: Dict[str, List[Callable]] = {}
+
+    def on(self, event: str, callback: Optional[Callable] = None):
+        def _register(fn: Callable) -> Callable:
+            self._handlers.setdefault(event, []).append(fn)
+            return fn
+        return _register(callback) if callback is not None else _register
+
+    def off(self, event: str, callback: Callable) -> None:
+        handlers = self._handlers.get(event, [])
+        if callback in handlers:
+            handlers.remove(callback)
+
+    def emit(self, event: str, *args) -> None:
+        # Like livekit's EventEmitter, pass only as many args as the callback takes.
+        for fn in list(self._handlers.get(event, [])):
+            code = getattr(fn, "__code__", None)
+            if code is None or code.co_flags & inspect.CO_VARARGS:
+                fn(*args)
+            else:
+                fn(*args[:code.co_argcount - inspect.ismethod(fn)])
+
+
+# ── Room ────────────────────────────────────────────────────────────────────
+
+class FakeParticipant:
+    def __init__(self, identity: str, metadata: str = "") -> None:
+        self.identity = identity
+        self.metadata = metadata
+
+
+class FakeLocalParticipant:
+    """publish_data with a fixed simulated network latency."""
+
+    def __init__(self, latency_s: float = 0.0) -> None:
+        self.latency_s = latency_s
+        self.published: List[bytes] = []
+
+    async def publish_data(self, payload: bytes, reliable: bool = True, topic: str = "") -> None:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        else:
+            await asyncio.sleep(0)
+        self.published.append(payload)
+
+
+class FakeRoom(FakeEmitter):
+    def __init__(self, name: str, publish_latency_s: float = 0.0) -> None:
+        super().__init__()
+        self.name = name
+        self.remote_participants: Dict[str, FakeParticipant] = {}
+        self.local_participant = FakeLocalParticipant(publish_latency_s)
+
+    def join(self, participant: FakeParticipant) -> None:
+        self.remote_participants[participant.identity] = participant
+        self.emit("participant_connected", participant)
+
+    def join_later(self, participant: FakeParticipant, delay_s: float) -> None:
+        asyncio.get_running_loop().call_later(delay_s, self.join, participant)
+
+
+def caller(name: str, customer_id: str, session_id: str, language: str = "en") -> FakeParticipant:
+    """A frontend participant carrying the metadata the API puts in its token."""
+    metadata = {"name": name, "customer_id": customer_id, "session_id": session_id, "language": language}
+    return FakeParticipant(identity=f"user-{session_id}", metadata=json.dumps(metadata))
+
+
+# ── Agent session ───────────────────────────────────────────────────────────
+
+def _event(**fields) -> types.SimpleNamespace:
+    return types.SimpleNamespace(**fields)
+
+
+def _assistant_item(text: str) -> types.SimpleNamespace:
+    return _event(item=_event(role="assistant", text_content=text, content=[text]))
+
+
+class FakeRealtimeModel:
+    def __init__(self, voice: str = "eve", **kwargs) -> None:
+        self.voice = voice
+
+
+class FakeAgent:
+    def __init__(self, instructions: str = "", llm=None, **kwargs) -> None:
+        self.instructions = instructions
+        self.llm = llm
+
+    async def update_instructions(self, instructions: str) -> None:
+        self.instructions = instructions
+
+
+class FakeAgentSession(FakeEmitter):
+    """start() and generate_reply() take `start_latency_s` / `reply_latency_s`."""
+
+    start_latency_s = 0.0
+    reply_latency_s = 0.0
+    last: Optional["FakeAgentSession"] = None   # most recently created, for closing it
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__()
+        self.started = False
+        self.replies: List[str] = []
+        FakeAgentSession.last = self
+
+    async def start(self, room=None, agent=None) -> None:
+        await asyncio.sleep(self.start_latency_s)
+        self.started = True
+
+    async def generate_reply(self, instructions: str = "") -> None:
+        self.replies.append(instructions)
+        await asyncio.sleep(self.reply_latency_s)
+        self.emit("agent_state_changed", _event(old_state="thinking", new_state="speaking"))
+        self.emit("conversation_item_added", _assistant_item(f"reply {len(self.replies)}"))
+
+    def play(self, script: List[tuple]) -> None:
+        """Emit a scripted conversation synchronously (see conversation_script)."""
+        for event, payload in script:
+            self.emit(event, payload)
+
+    def close(self, error=None) -> None:
+        self.emit("close", _event(reason="participant_disconnected", error=error))
+
+
+def conversation_script(turns: int, finals_per_turn: int = 4, words_per_final: int = 3) -> List[tuple]:
+    """
+    A realistic event stream: each user turn arrives as incremental STT
+    finals (each extending the previous one), then the agent speaks and
+    its reply item is added.
+    """
+    script: List[tuple] = []
+    for turn in range(turns):
+        words: List[str] = []
+        script.append(("agent_state_changed", _event(old_state="speaking", new_state="listening")))
+        for _ in range(finals_per_turn):
+            words.extend(f"parola{turn}_{len(words) + i}" for i in range(words_per_final))
+            script.append(("user_input_transcribed", _event(is_final=True, transcript=" ".join(words))))
+        script.append(("agent_state_changed", _event(old_state="listening", new_state="thinking")))
+        script.append(("speech_created", _event(source="generate_reply", user_initiated=False)))
+        script.append(("agent_state_changed", _event(old_state="thinking", new_state="speaking")))
+        script.append(("conversation_item_added", _assistant_item(
+            f"Certo, risposta numero {turn}: posso aiutarla con la sua richiesta."
+        )))
+    return script
+
+
+# ── Job ─────────────────────────────────────────────────────────────────────
+
+class FakeJobProcess:
+    def __init__(self) -> None:
+        self.userdata: dict = {}
+
+
+class FakeJobContext:
+    def __init__(self, room: FakeRoom, proc: Optional[FakeJobProcess] = None,
+                 connect_latency_s: float = 0.0) -> None:
+        self.room = room
+        self.proc = proc or FakeJobProcess()
+        self.connect_latency_s = connect_latency_s
+
+    async def connect(self) -> None:
+        await asyncio.sleep(self.connect_latency_s)
+
+
+class FakeAgentServer(FakeEmitter):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self.setup_fnc = None
+        self.entrypoint = None
+
+    def rtc_session(self, *args, **kwargs):
+        def _register(fn):
+            self.entrypoint = fn
+            return fn
+        return _register
+
+
+# ── Wiring ──────────────────────────────────────────────────────────────────
+
+def install() -> bool:
+    """Register stand-in livekit modules if the SDK is missing. Returns True if it did."""
+    try:
+        if importlib.util.find_spec("livekit.agents") is not None:
+            return False
+    except ModuleNotFoundError:
+        pass
+
+    # livekit-api alone (the API server's dependency) also provides `livekit`.
+    try:
+        livekit = importlib.import_module("livekit")
+    except ImportError:
+        livekit = types.ModuleType("livekit")
+        livekit.__path__ = []
+    agents = types.ModuleType("livekit.agents")
+    agents.Agent = FakeAgent
+    agents.AgentSession = FakeAgentSession
+    agents.AgentServer = FakeAgentServer
+    agents.JobContext = FakeJobContext
+    agents.JobProcess = FakeJobProcess
+    agents.cli = types.SimpleNamespace(run_app=lambda server: None)
+    plugins = types.ModuleType("livekit.plugins")
+    plugins.__path__ = []
+    xai = types.ModuleType("livekit.plugins.xai")
+    xai.realtime = types.SimpleNamespace(RealtimeModel=FakeRealtimeModel)
+
+    livekit.agents = agents
+    livekit.plugins = plugins
+    plugins.xai = xai
+    sys.modules.update({
+        "livekit": livekit,
+        "livekit.agents": agents,
+        "livekit.plugins": plugins,
+        "livekit.plugins.xai": xai,
+    })
+    return True
+
+
+def use_fakes(main_module) -> None:
+    """Point agent.main at the fakes (also when the real SDK is installed)."""
+    main_module.Agent = FakeAgent
+    main_module.AgentSession = FakeAgentSession
+    main_module._create_model = FakeRealtimeModel
@@ -0,0 +1,104 @@
+"""
+Benchmark Results
+==================
+Store benchmark results as JSON (tagged with the git commit) and compare
+two result files, so a change can be judged against the previous commit.
+
+Files go to benchmarks/results/<benchmark>-<commit>.json by default.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=RESULTS_DIR.parent,
+        )
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, cwd=RESULTS_DIR.parent,
+        ).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50 / p99 / mean of latency samples (seconds), in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def write_results(benchmark: str, results: Dict, path: Optional[Path] = None) -> Path:
+    commit = git_commit()
+    path = path or RESULTS_DIR / f"{benchmark}-{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": benchmark,
+        "commit": commit,
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def print_results(results: Dict, indent: str = "") -> None:
+    for key, value in results.items():
+        if isinstance(value, dict):
+            print(f"{indent}{key}:")
+            print_results(value, indent + "  ")
+        elif isinstance(value, float):
+            print(f"{indent}{key:<24} {value:>12.3f}")
+        else:
+            print(f"{indent}{key:<24} {value:>12}")
+
+
+def _flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(baseline_path: Path, results: Dict) -> None:
+    """Print every numeric result next to the baseline's, with the change in %."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = _flatten(baseline["results"])
+    new = _flatten(results)
+    print(f"\nvs {baseline_path.name} ({baseline['commit']}):")
+    print(f"{'metric':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(set(old) | set(new)):
+        before, after = old.get(name), new.get(name)
+        if before is None or after is None:
+            change = "new" if before is None else "gone"
+        elif before == 0:
+            change = "-"
+        else:
+            change = f"{(after - before) / before * 100:+.1f}%"
+        fmt = lambda v: "-" if v is None else f"{v:.4g}"
+        print(f"{name:<48} {fmt(before):>12} {fmt(after):>12} {change:>8}")
@@ -1,3 +1,11 @@
 """Lisa Voice Agent - Customer Management"""
 from .models import CustomerConfig
-from .store import customer_store
+
+
+def __getattr__(name):
+    # Lazy: the store seeds the database and mirrors every customer, which
+    # the agent worker (customers.cache) must not pay for on import.
+    if name == "customer_store":
+        from .store import customer_store
+        return customer_store
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
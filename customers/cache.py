@@ -0,0 +1,92 @@
+"""
+Lisa Voice Agent — Customer Cache
+===================================
+Bounded LRU read-through cache over the customer database, used by the
+agent worker on the call-start path.
+
+A warm hit costs one indexed SQLite read (the global revision). Only
+when another process has written since the last check do we re-read
+the entry's own revision, and only when that changed do we reload it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .db import CustomerDB
+from .models import CustomerConfig
+
+
+class CustomerCache:
+    """LRU of persona dicts keyed by customer id, revalidated by revision."""
+
+    def __init__(self, db: Optional[CustomerDB] = None, max_size: int = 256) -> None:
+        self._db = db or CustomerDB()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # id → (persona, entry revision, global revision when last validated)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, customer_id: str) -> Optional[dict]:
+        """Persona dict for a customer, or None if it does not exist."""
+        global_rev = self._db.revision()
+        with self._lock:
+            entry = self._entries.get(customer_id)
+            if entry is not None:
+                persona, rev, checked = entry
+                if checked == global_rev:
+                    self._entries.move_to_end(customer_id)
+                    self.hits += 1
+                    return persona
+
+        if entry is not None:
+            self.revalidations += 1
+            current = self._db.get_revision(customer_id)
+            if current == entry[1]:
+                with self._lock:
+                    self._entries[customer_id] = (entry[0], current, global_rev)
+                    self._entries.move_to_end(customer_id)
+                    self.hits += 1
+                return entry[0]
+
+        self.misses += 1
+        row = self._db.get(customer_id)
+        with self._lock:
+            if row is None:
+                self._entries.pop(customer_id, None)
+                return None
+            data, rev = row
+            persona = CustomerConfig.from_record(data).to_persona()
+            self._entries[customer_id] = (persona, rev, global_rev)
+            self._entries.move_to_end(customer_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return persona
+
+    def is_deleted(self, customer_id: str) -> bool:
+        """True if the customer was deleted through the API (tombstoned)."""
+        return self._db.is_deleted(customer_id)
+
+    def invalidate(self, customer_id: Optional[str] = None) -> None:
+        with self._lock:
+            if customer_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(customer_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+        }
@@ -0,0 +1,176 @@
+"""
+Lisa Voice Agent — Customer Database
+======================================
+Durable customer storage shared by the API and the agent worker.
+
+SQLite in WAL mode, so the API can write while workers read.
+Every write bumps a global, monotonically increasing revision and
+stamps it on the row; readers compare revisions to know when their
+cached copy is stale. Deletes leave a tombstone so other processes
+can see them via changes_since().
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "customers.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    id       TEXT PRIMARY KEY,
+    data     TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    deleted  INTEGER NOT NULL DEFAULT 0,
+    source   TEXT
+);
+CREATE INDEX IF NOT EXISTS customers_revision ON customers(revision);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', 0);
+"""
+
+# (id, data, revision, deleted)
+Row = Tuple[str, Optional[Dict], int, bool]
+
+
+def get_db_path() -> Path:
+    return Path(os.getenv("CUSTOMERS_DB_PATH") or DEFAULT_DB_PATH)
+
+
+class CustomerDB:
+    """Thin, thread-safe wrapper around the customers SQLite file."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path or get_db_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- Reads -----------------------------------------------------------------
+
+    def revision(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'revision'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, customer_id: str) -> Optional[Tuple[Dict, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, revision FROM customers WHERE id = ? AND deleted = 0",
+                (customer_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get_revision(self, customer_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revision FROM customers WHERE id = ? AND deleted = 0",
+                (customer_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_deleted(self, customer_id: str) -> bool:
+        """True if the customer was deleted (its row is a tombstone)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT deleted FROM customers WHERE id = ?", (customer_id,),
+            ).fetchone()
+        return bool(row and row[0])
+
+    def changes_since(self, revision: int) -> List[Row]:
+        """Rows (including tombstones) written after `revision`, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data, revision, deleted FROM customers "
+                "WHERE revision > ? ORDER BY revision",
+                (revision,),
+            ).fetchall()
+        return [
+            (cid, None if deleted else json.loads(data), rev, bool(deleted))
+            for cid, data, rev, deleted in rows
+        ]
+
+    def sources(self) -> Dict[str, Optional[str]]:
+        """id → source fingerprint for rows seeded from persona files."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, source FROM customers").fetchall()
+        return dict(rows)
+
+    # -- Writes ----------------------------------------------------------------
+
+    def _bump(self) -> int:
+        self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'revision'")
+        return self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'revision'"
+        ).fetchone()[0]
+
+    def put(self, customer_id: str, data: Dict, source: Optional[str] = None) -> int:
+        """Insert or replace a customer. Returns its new revision."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rev = self._bump()
+                payload = json.dumps({**data, "revision": rev}, ensure_ascii=False)
+                if source is None:
+                    self._conn.execute(
+                        "INSERT INTO customers (id, data, revision, deleted) VALUES (?, ?, ?, 0) "
+                        "ON CONFLICT(id) DO UPDATE SET data = excluded.data, "
+                        "revision = excluded.revision, deleted = 0",
+                        (customer_id, payload, rev),
+                    )
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO customers (id, data, revision, deleted, source) "
+                        "VALUES (?, ?, ?, 0, ?)",
+                        (customer_id, payload, rev, source),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rev
+
+    def delete(self, customer_id: str) -> bool:
+        """Tombstone a customer. Returns False if it did not exist."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM customers WHERE id = ? AND deleted = 0",
+                    (customer_id,),
+                ).fetchone()
+                if exists:
+                    rev = self._bump()
+                    self._conn.execute(
+                        "UPDATE customers SET deleted = 1, revision = ? WHERE id = ?",
+                        (rev, customer_id),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return bool(exists)
@@ -8,7 +8,7 @@ Used by the API routes to serialize/deserialize.
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -38,49 +38,19 @@ class CustomerConfig:
     common_customer_questions: List[str] = field(default_factory=list)
     booking_link_enabled: bool = False
     booking_link_url: Optional[str] = None
+    compact_prompt: bool = False   # drop default-workflow rules the prompt repeats
+    covers_rules: List[str] = field(default_factory=list)   # which ones (agent/prompts.py)
 
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     is_active: bool = True
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    revision: int = 0   # store revision of the last write (0 = never stored)
 
-    def get_full_system_prompt(self) -> str:
-        parts = [self.system_prompt] if self.system_prompt else [
-            f"You are {self.agent_name}, helping with {self.name}. "
-            "You sound like a real front-desk assistant who moves the situation forward."
-        ]
-        parts.append(
-            "Handle missed calls like an active small-business assistant: start with a reassuring opening, "
-            "understand the problem quickly, gather the details needed to act, and make the caller feel "
-            "their request is already being handled."
-        )
-        parts.append(
-            "Never sound like voicemail. Do not say the owner is unavailable, do not ask the caller to leave a message, "
-            "and do not mention AI."
-        )
-        parts.append(
-            "Use active phrasing like: 'I'll help get this handled quickly,' 'Let me grab a couple details so we can take care of this,' "
-            "and 'I'll make sure the team gets this right away.'"
-        )
-        if self.business_category:
-            parts.append(f"Business category: {self.business_category}.")
-        if self.services:
-            parts.append(f"Services: {', '.join(self.services)}.")
-        if self.service_area:
-            parts.append(f"Service area: {self.service_area}.")
-        if self.business_hours:
-            parts.append(f"Hours: {self.business_hours}.")
-        if self.business_address:
-            parts.append(f"Address: {self.business_address}.")
-        if self.common_customer_questions:
-            parts.append(
-                f"Common customer questions: {', '.join(self.common_customer_questions)}."
-            )
-        if self.booking_link_enabled and self.booking_link_url:
-            parts.append(
-                "Booking link available after collecting details: "
-                f"{self.booking_link_url}."
-            )
-        return "\n\n".join(parts)
+    def get_full_system_prompt(self, language: str = "en") -> str:
+        """Same prompt the agent worker sends (see agent/prompts.py)."""
+        from agent.prompts import prompt_cache
+
+        return prompt_cache.get(self.to_persona(), language)
 
     def get_intro(self, user_name: Optional[str] = None) -> str:
         return self.intro_message.format(
@@ -89,6 +59,20 @@ class CustomerConfig:
             business_name=self.name,
         )
 
+    @classmethod
+    def from_record(cls, data: Dict) -> "CustomerConfig":
+        """Build from a stored record, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def to_record(self) -> Dict:
+        """Every field, for persistence."""
+        return asdict(self)
+
+    def to_persona(self) -> Dict:
+        """Persona dict in the shape of the agent/personas/ files."""
+        return self.to_record()
+
     def to_dict(self) -> Dict:
         return {
             "id": self.id,
@@ -0,0 +1,84 @@
+"""
+Lisa Voice Agent — Persona Seeding
+====================================
+Copies persona files (agent/personas/) into the shared customer database.
+
+A persona is written only when its file revision differs from the one
+recorded at its last seed, so API edits survive restarts and several
+processes seeding at once mostly find nothing to do. Readers (the API's
+CustomerStore, the worker's CustomerCache) pick the write up by revision.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .db import CustomerDB
+from .models import CustomerConfig
+
+_root = str(Path(__file__).resolve().parents[1])
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from agent.personas import PersonaWatcher, fingerprint, get as get_persona, manifest as persona_manifest
+from agent.prompts import prompt_cache
+
+logger = logging.getLogger("customers.seed")
+
+
+def persona_to_customer(persona: dict) -> CustomerConfig:
+    return CustomerConfig(
+        id=persona["id"],
+        name=persona["name"],
+        agent_name=persona["agent_name"],
+        agent_type=persona.get("agent_type", "general_business"),
+        voice=persona.get("voice", "eve"),
+        language=persona.get("language", "en"),
+        system_prompt=persona.get("system_prompt", ""),
+        intro_message=persona.get("intro_message", "Hello!"),
+        goodbye_message=persona.get("goodbye_message", "Goodbye!"),
+        business_category=persona.get("business_category"),
+        service_area=persona.get("service_area"),
+        business_hours=persona.get("business_hours"),
+        business_address=persona.get("business_address"),
+        services=persona.get("services", []),
+        common_customer_questions=persona.get("common_customer_questions", []),
+        booking_link_enabled=persona.get("booking_link_enabled", False),
+        booking_link_url=persona.get("booking_link_url"),
+        compact_prompt=persona.get("compact_prompt", False),
+        covers_rules=persona.get("covers_rules", []),
+    )
+
+
+def seed_personas(db: CustomerDB, persona_ids: Optional[Iterable[str]] = None) -> int:
+    """Write personas (all, or just `persona_ids`) whose revision changed. Returns the count."""
+    seeded = db.sources()
+    entries = persona_manifest()
+    count = 0
+    for pid in entries if persona_ids is None else persona_ids:
+        entry = entries.get(pid)
+        if entry is None or seeded.get(pid) == entry["revision"]:
+            continue   # removed files leave their customer in place
+        persona = get_persona(pid)
+        if persona is None:
+            continue
+        db.put(pid, persona_to_customer(persona).to_record(), source=fingerprint(persona))
+        prompt_cache.invalidate(pid)
+        count += 1
+    return count
+
+
+def watch_personas(db: Optional[CustomerDB] = None) -> PersonaWatcher:
+    """Started watcher that seeds changed persona files into `db`."""
+    db = db or CustomerDB()
+
+    def _on_change(persona_ids):
+        count = seed_personas(db, persona_ids)
+        logger.info(f"Re-seeded {count} customers from changed persona files")
+
+    watcher = PersonaWatcher(_on_change)
+    watcher.start()
+    return watcher
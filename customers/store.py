@@ -1,86 +1,191 @@
 """
 Lisa Voice Agent — Customer Store
 ===================================
-Reads agent personas from agent/personas/*.py files.
-Those files are the SINGLE SOURCE OF TRUTH.
-
-This store wraps them in CustomerConfig objects for the API routes.
+Reads agent personas from the persona files in agent/personas/.
+Those files are the SINGLE SOURCE OF TRUTH for the built-in personas.
+
+Customers live in a shared SQLite database (customers/db.py) so that
+customers created through the API are visible to the agent worker.
+Persona files are seeded into it on startup (customers/seed.py); a
+persona is re-seeded only when its file content changes, so API edits
+survive restarts. reseed() applies hot-reloaded persona files.
+
+This store wraps them in CustomerConfig objects for the API routes and
+keeps an in-memory mirror that catches up with other processes' writes
+by revision. The mirror keeps an id-ordered list plus secondary indexes
+on INDEXED_FIELDS, so filtered, cursor-paginated listing (query()) does
+not scan every customer.
 """
 
 from __future__ import annotations
 
 import logging
 import sys
+import threading
+from bisect import bisect_left, bisect_right, insort
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from .db import CustomerDB
 from .models import CustomerConfig
+from .seed import seed_personas
 
 # Ensure we can import agent.personas
 _root = str(Path(__file__).resolve().parents[1])
 if _root not in sys.path:
     sys.path.insert(0, _root)
 
-from agent.personas import get_all as get_all_personas
+from agent.prompts import prompt_cache
 
 logger = logging.getLogger("customers.store")
 
+# Fields query() can filter on through an index.
+INDEXED_FIELDS = ("agent_type", "business_category", "language", "voice", "is_active")
+
 
 class CustomerStore:
-    def __init__(self) -> None:
+    def __init__(self, db: Optional[CustomerDB] = None) -> None:
+        self._db = db or CustomerDB()
         self._customers: Dict[str, CustomerConfig] = {}
+        # Ascending customer ids, overall and per (field → value).
+        self._ids: List[str] = []
+        self._indexes: Dict[str, Dict[Any, List[str]]] = {f: {} for f in INDEXED_FIELDS}
+        self._revision = 0
+        self._lock = threading.Lock()
         self._load_from_personas()
+        self._sync()
 
     def _load_from_personas(self) -> None:
-        """Import all personas and convert to CustomerConfig objects."""
-        for pid, persona in get_all_personas().items():
-            self._customers[pid] = CustomerConfig(
-                id=persona["id"],
-                name=persona["name"],
-                agent_name=persona["agent_name"],
-                agent_type=persona.get("agent_type", "general_business"),
-                voice=persona.get("voice", "eve"),
-                language=persona.get("language", "en"),
-                system_prompt=persona.get("system_prompt", ""),
-                intro_message=persona.get("intro_message", "Hello!"),
-                goodbye_message=persona.get("goodbye_message", "Goodbye!"),
-                business_category=persona.get("business_category"),
-                service_area=persona.get("service_area"),
-                business_hours=persona.get("business_hours"),
-                business_address=persona.get("business_address"),
-                services=persona.get("services", []),
-                common_customer_questions=persona.get("common_customer_questions", []),
-                booking_link_enabled=persona.get("booking_link_enabled", False),
-                booking_link_url=persona.get("booking_link_url"),
-            )
-        logger.info(f"Loaded {len(self._customers)} customers from persona files")
+        """Seed personas whose file content changed since the last seed."""
+        count = seed_personas(self._db)
+        logger.info(f"Seeded {count} customers from persona files")
+
+    def reseed(self, persona_ids: List[str]) -> None:
+        """Apply changed persona files (PersonaWatcher callback)."""
+        if seed_personas(self._db, persona_ids):
+            self._sync()
+
+    def _sync(self) -> None:
+        """Apply writes made since our last sync (by any process)."""
+        revision = self._db.revision()
+        if revision == self._revision:
+            return
+        with self._lock:
+            for cid, data, _rev, deleted in self._db.changes_since(self._revision):
+                prompt_cache.invalidate(cid)
+                self._unindex(cid)
+                if deleted:
+                    self._customers.pop(cid, None)
+                else:
+                    self._customers[cid] = CustomerConfig.from_record(data)
+                    self._index(cid)
+            self._revision = max(self._revision, revision)
+
+    # -- Index helpers (call with the lock held) ---------------------------
+
+    @staticmethod
+    def _remove_sorted(ids: List[str], cid: str) -> None:
+        i = bisect_left(ids, cid)
+        if i < len(ids) and ids[i] == cid:
+            del ids[i]
+
+    def _index(self, cid: str) -> None:
+        customer = self._customers[cid]
+        insort(self._ids, cid)
+        for field, index in self._indexes.items():
+            insort(index.setdefault(getattr(customer, field), []), cid)
+
+    def _unindex(self, cid: str) -> None:
+        customer = self._customers.get(cid)
+        if customer is None:
+            return
+        self._remove_sorted(self._ids, cid)
+        for field, index in self._indexes.items():
+            value = getattr(customer, field)
+            ids = index.get(value)
+            if ids is not None:
+                self._remove_sorted(ids, cid)
+                if not ids:
+                    del index[value]
+
+    @property
+    def revision(self) -> int:
+        self._sync()
+        return self._revision
 
     # -- CRUD (create/update/delete for runtime additions via API) -----
 
     def get(self, customer_id: str) -> Optional[CustomerConfig]:
+        self._sync()
         return self._customers.get(customer_id)
 
     def list_all(self) -> List[CustomerConfig]:
+        self._sync()
         return list(self._customers.values())
 
     def list_active(self) -> List[CustomerConfig]:
-        return [c for c in self._customers.values() if c.is_active]
+        self._sync()
+        with self._lock:
+            return [self._customers[cid] for cid in self._indexes["is_active"].get(True, [])]
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[CustomerConfig], Optional[str]]:
+        """
+        Customers in id order matching every filter (INDEXED_FIELDS only),
+        starting after `cursor` (a customer id). Returns (page, next_cursor);
+        next_cursor is None on the last page.
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on: {', '.join(sorted(unknown))}")
+        self._sync()
+        with self._lock:
+            # Drive from the most selective index; check the others inline.
+            candidates = self._ids
+            for field, value in filters.items():
+                ids = self._indexes[field].get(value, [])
+                if len(ids) < len(candidates):
+                    candidates = ids
+
+            page: List[CustomerConfig] = []
+            start = bisect_right(candidates, cursor) if cursor is not None else 0
+            for j in range(start, len(candidates)):
+                customer = self._customers[candidates[j]]
+                if any(getattr(customer, f) != v for f, v in filters.items()):
+                    continue
+                if limit is not None and len(page) == limit:
+                    return page, page[-1].id
+                page.append(customer)
+            return page, None
 
     def create(self, customer: CustomerConfig) -> CustomerConfig:
-        self._customers[customer.id] = customer
-        return customer
+        customer.revision = self._db.put(customer.id, customer.to_record())
+        self._sync()
+        return self._customers.get(customer.id, customer)
 
     def update(self, customer_id: str, updates: dict) -> Optional[CustomerConfig]:
-        customer = self._customers.get(customer_id)
+        customer = self.get(customer_id)
         if not customer:
             return None
+        record = customer.to_record()
         for k, v in updates.items():
-            if hasattr(customer, k):
-                setattr(customer, k, v)
-        return customer
+            if k in record and k not in ("id", "revision"):
+                record[k] = v
+        self._db.put(customer_id, record)
+        prompt_cache.invalidate(customer_id)
+        self._sync()
+        return self._customers.get(customer_id)
 
     def delete(self, customer_id: str) -> bool:
-        return self._customers.pop(customer_id, None) is not None
+        deleted = self._db.delete(customer_id)
+        prompt_cache.invalidate(customer_id)
+        self._sync()
+        return deleted
 
 
 # Singleton
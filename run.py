@@ -8,6 +8,9 @@ Usage:
     Terminal 1 (API):      python run.py
     Terminal 2 (Agent):    python -m agent.main dev
     Terminal 3 (Frontend): npm run dev
+
+Set API_WORKERS=N to run N API processes; sessions then move to the
+shared STATE_BACKEND (SQLite by default, see app/state.py).
 """
 
 import uvicorn
@@ -27,6 +30,7 @@ def main():
         print("📋 Configuration:")
         print(f"   LiveKit:  {'✅' if status['livekit'] else '❌ NOT SET'}")
         print(f"   xAI:      {'✅' if status['xai'] else '❌ NOT SET'}")
+        print(f"   Workers:  {Config.WORKERS} (state: {Config.STATE_BACKEND})")
         print()
 
         if not status["livekit"]:
@@ -42,11 +46,21 @@ def main():
     print("⚠️  Also run the agent:  python -m agent.main dev")
     print()
 
+    if Config.WORKERS > 1:
+        if Config.STATE_BACKEND == "memory":
+            print("❌ STATE_BACKEND=memory cannot be shared by several workers")
+            raise SystemExit(1)
+        # Snapshots from a previous run's workers would be merged into /metrics.
+        from app.metrics import API_TELEMETRY_DIR
+        from telemetry.exporter import clear_snapshots
+        clear_snapshots(API_TELEMETRY_DIR)
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=Config.PORT,
         reload=False,
+        workers=Config.WORKERS,
         log_level="info",
     )
 
@@ -0,0 +1,2 @@
+"""Lisa Voice Agent - Telemetry"""
+from .metrics import Counter, Gauge, Histogram, Registry, merge, render
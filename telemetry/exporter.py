@@ -0,0 +1,215 @@
+"""
+Lisa Voice Agent — Metrics Exporter
+=====================================
+Multi-process export for the agent worker.
+
+Each job process owns its own Registry and periodically writes a JSON
+snapshot to <TELEMETRY_DIR>/<pid>-<start ns>.json (SnapshotWriter).
+The worker's main process serves GET /metrics (serve_metrics) by
+merging every snapshot file with its own registry.
+
+On each scrape, files of exited processes are folded into one
+accumulated file (EXITED_NAME) and deleted, so counters never go
+backwards while the directory stays one file per live process. Their
+gauges are dropped: they described a process that no longer exists.
+The directory is cleared when the main process starts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+from telemetry.metrics import Registry, Snapshot, merge, render
+
+logger = logging.getLogger("telemetry.exporter")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TELEMETRY_DIR = Path(os.getenv("TELEMETRY_DIR") or PROJECT_ROOT / "data" / "metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Counters and histograms of exited processes, summed.
+EXITED_NAME = "exited.json"
+
+
+class SnapshotWriter:
+    """Writes a registry snapshot for this process every `interval_s` (and on flush())."""
+
+    def __init__(self, registry: Registry, directory: Path = TELEMETRY_DIR, interval_s: float = 5.0) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._name = ""
+
+    @property
+    def path(self) -> Path:
+        # Unique per process, even across fork and pid reuse.
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid, self._name = pid, f"{pid}-{time.time_ns()}"
+        return self.directory / f"{self._name}.json"
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the snapshot now. Blocking; call via asyncio.to_thread from the loop."""
+        with self._write_lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self.path
+                tmp = path.with_suffix(".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.registry.snapshot(), f, separators=(",", ":"))
+                os.replace(tmp, path)
+            except OSError:
+                logger.warning("Could not write metrics snapshot", exc_info=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.flush()
+
+
+def _pid(path: Path) -> Optional[int]:
+    """Writer pid from a "<pid>-<start ns>.json" name (None for EXITED_NAME)."""
+    try:
+        return int(path.stem.split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass   # exists, owned by someone else
+    return True
+
+
+def _load(path: Path) -> Optional[Snapshot]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None   # being replaced or torn; next scrape gets it
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    """Serializes scrapes of one directory (several API workers may scrape it)."""
+    if fcntl is None:
+        yield
+        return
+    with open(directory / ".lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def fold_exited(directory: Path = TELEMETRY_DIR) -> int:
+    """
+    Merge the counters and histograms of exited processes into
+    EXITED_NAME and delete their files. Call with the directory locked.
+    Returns the number of files folded.
+    """
+    dead = [p for p in directory.glob("*.json") if (pid := _pid(p)) is not None and not _alive(pid)]
+    if not dead:
+        return 0
+    exited = directory / EXITED_NAME
+    snapshots = [s for s in map(_load, [exited] + dead) if s is not None]
+    merged = {
+        name: metric for name, metric in merge(snapshots).items()
+        if metric["type"] != "gauge"
+    }
+    tmp = exited.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(merged, f, separators=(",", ":"))
+    os.replace(tmp, exited)
+    for path in dead:
+        path.unlink(missing_ok=True)
+    return len(dead)
+
+
+def read_snapshots(directory: Path = TELEMETRY_DIR, exclude_pid: Optional[int] = None) -> List[Snapshot]:
+    snapshots: List[Snapshot] = []
+    if not directory.exists():
+        return snapshots
+    for path in directory.glob("*.json"):
+        if exclude_pid is not None and _pid(path) == exclude_pid:
+            continue
+        snapshot = _load(path)
+        if snapshot is not None:
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def clear_snapshots(directory: Path = TELEMETRY_DIR) -> None:
+    if directory.exists():
+        for path in directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def aggregate(registry: Registry, directory: Path = TELEMETRY_DIR) -> str:
+    """This process's registry plus every other process's snapshot, rendered."""
+    own = registry.snapshot()
+    if not directory.exists():
+        return render(own)
+    with _locked(directory):
+        try:
+            fold_exited(directory)
+        except OSError:
+            logger.warning("Could not fold exited metrics snapshots", exc_info=True)
+        others = read_snapshots(directory, exclude_pid=os.getpid())
+    return render(merge([own] + others))
+
+
+def serve_metrics(port: int, render_fn: Callable[[], str], host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve GET /metrics on a daemon thread. Returns the server (call shutdown() to stop)."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_fn().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass   # scrapes every few seconds would flood the worker log
+
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="metrics-http", daemon=True).start()
+    return httpd
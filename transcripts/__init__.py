@@ -0,0 +1,2 @@
+"""Lisa Voice Agent - Transcript Index & Search"""
+from .index import TranscriptIndex, get_index
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Transcript Index Backfill
+==========================
+Index every session directory and day pack under recordings/ (unchanged
+ones are skipped). Safe to re-run, and to run while the API and workers
+are up.
+
+Usage:
+    python -m transcripts.backfill
+    python -m transcripts.backfill --force --prune
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from transcripts.index import TranscriptIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, default=None, help="recordings directory")
+    parser.add_argument("--db", type=Path, default=None, help="index database (default TRANSCRIPTS_DB_PATH)")
+    parser.add_argument("--force", action="store_true", help="re-index unchanged sessions too")
+    parser.add_argument("--prune", action="store_true", help="drop sessions whose directory is gone")
+    args = parser.parse_args()
+
+    index = TranscriptIndex(path=args.db, root=args.root)
+    start = time.perf_counter()
+    counts = index.backfill(force=args.force, prune=args.prune)
+    elapsed = time.perf_counter() - start
+
+    print(f"📚 {index.root} → {index.path}")
+    print(
+        f"   scanned {counts['scanned']}, indexed {counts['indexed']}, "
+        f"unchanged {counts['skipped']}, failed {counts['failed']}, pruned {counts['pruned']}"
+    )
+    print(f"   {elapsed:.2f}s; index now holds {index.stats()['sessions']} sessions")
+
+
+if __name__ == "__main__":
+    main()
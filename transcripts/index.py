@@ -0,0 +1,358 @@
+"""
+Lisa Voice Agent — Transcript Index
+=====================================
+SQLite catalogue of saved sessions with an FTS5 full-text index over
+their transcripts, so finding a call is a query instead of a walk of
+the recordings directory.
+
+- sessions: one row per saved session (metadata columns, indexed
+  for customer / date / language / duration filters)
+- transcript_fts: one document per session ("role: text" lines),
+  rowid = sessions.id
+
+The agent worker indexes each session right after saving it; existing
+directories and day packs are picked up with the backfill CLI
+(transcripts.backfill). Session paths are relative to the recordings
+root and follow transcripts/storage.py (packed: "<day>.pack#<name>").
+WAL mode, so the API can search while workers write.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from transcripts import storage
+
+logger = logging.getLogger("transcripts.index")
+
+DEFAULT_DB_PATH = storage.PROJECT_ROOT / "data" / "transcripts.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL UNIQUE,
+    session_id  TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    user_name   TEXT,
+    agent_name  TEXT,
+    language    TEXT,
+    started_at  TEXT NOT NULL,
+    ended_at    TEXT,
+    duration_s  REAL,
+    entries     INTEGER NOT NULL DEFAULT 0,
+    mtime       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions(started_at, id);
+CREATE INDEX IF NOT EXISTS sessions_customer ON sessions(customer_id, started_at, id);
+CREATE INDEX IF NOT EXISTS sessions_session_id ON sessions(session_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+    body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_COLUMNS = (
+    "id", "path", "session_id", "customer_id", "user_name", "agent_name",
+    "language", "started_at", "ended_at", "duration_s", "entries",
+)
+
+
+def get_db_path() -> Path:
+    return Path(os.getenv("TRANSCRIPTS_DB_PATH") or DEFAULT_DB_PATH)
+
+
+class TranscriptIndex:
+    """Thread-safe wrapper around the transcripts SQLite file."""
+
+    def __init__(self, path: Optional[Path] = None, root: Optional[Path] = None) -> None:
+        self.path = Path(path or get_db_path())
+        self.root = Path(root or storage.RECORDINGS_DIR)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _relative(self, session_dir: Path) -> str:
+        try:
+            return str(session_dir.resolve().relative_to(self.root.resolve()))
+        except ValueError:
+            return str(session_dir.resolve())
+
+    # -- Writes ----------------------------------------------------------------
+
+    def _indexed_mtime(self, rel: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime FROM sessions WHERE path = ?", (rel,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def index_session(self, session_dir: Path, force: bool = False) -> bool:
+        """
+        Add or refresh one unpacked session directory. Skips directories
+        whose files have not changed since they were last indexed, unless
+        `force`. Returns True if the index was written.
+        """
+        session_dir = Path(session_dir)
+        rel = self._relative(session_dir)
+        mtime = max(
+            (p.stat().st_mtime for p in session_dir.iterdir() if p.is_file()),
+            default=0.0,
+        )
+        if not force and (self._indexed_mtime(rel) or -1.0) >= mtime:
+            return False
+        loaded = storage.load_session(session_dir)
+        if loaded is None:
+            return False
+        self._upsert(rel, *loaded, mtime)
+        return True
+
+    def index_pack(self, pack: Path, force: bool = False) -> int:
+        """Add the members of a day pack that are missing or stale. Returns members written."""
+        pack_rel = self._relative(pack)
+        mtime = pack.stat().st_mtime
+        written = 0
+        for name in storage.read_pack_index(pack):
+            rel = f"{pack_rel}#{name}"
+            if not force and self._indexed_mtime(rel) is not None:
+                continue   # members never change once packed
+            loaded = storage.read_member(pack, name)
+            if loaded is not None:
+                self._upsert(rel, *loaded, mtime)
+                written += 1
+        return written
+
+    def _upsert(self, rel: str, metadata: Dict, entries: List[Dict], mtime: float) -> None:
+        fallback = storage.describe(rel)
+        body = "\n".join(f"{e.get('role', '')}: {e.get('text', '')}" for e in entries)
+        values = (
+            rel,
+            metadata.get("session_id") or fallback["session_id"],
+            metadata.get("customer_id") or fallback["customer_id"],
+            metadata.get("user_name"),
+            metadata.get("agent_name"),
+            metadata.get("language"),
+            metadata.get("started_at") or fallback["started_at"]
+            or datetime.fromtimestamp(mtime).isoformat(),
+            metadata.get("ended_at"),
+            metadata.get("duration_seconds"),
+            len(entries),
+            mtime,
+        )
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM sessions WHERE path = ?", (rel,)
+                ).fetchone()
+                if row:
+                    self._conn.execute("DELETE FROM transcript_fts WHERE rowid = ?", (row[0],))
+                    self._conn.execute("DELETE FROM sessions WHERE id = ?", (row[0],))
+                cur = self._conn.execute(
+                    "INSERT INTO sessions (path, session_id, customer_id, user_name, "
+                    "agent_name, language, started_at, ended_at, duration_s, entries, mtime) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values,
+                )
+                self._conn.execute(
+                    "INSERT INTO transcript_fts (rowid, body) VALUES (?, ?)",
+                    (cur.lastrowid, body),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def move(self, old_path: str, new_path: str) -> bool:
+        """Point a session at its new location (migration, packing)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE sessions SET path = ? WHERE path = ?", (new_path, old_path)
+            )
+        return cur.rowcount > 0
+
+    def remove_prefix(self, prefix: str) -> int:
+        """Drop every session whose path starts with `prefix` (retention)."""
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [r[0] for r in self._conn.execute(
+                    "SELECT id FROM sessions WHERE path LIKE ? ESCAPE '\\'", (pattern,)
+                )]
+                self._conn.executemany("DELETE FROM transcript_fts WHERE rowid = ?", [(i,) for i in ids])
+                self._conn.executemany("DELETE FROM sessions WHERE id = ?", [(i,) for i in ids])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(ids)
+
+    def remove(self, rel_path: str) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM sessions WHERE path = ?", (rel_path,)
+                ).fetchone()
+                if row:
+                    self._conn.execute("DELETE FROM transcript_fts WHERE rowid = ?", (row[0],))
+                    self._conn.execute("DELETE FROM sessions WHERE id = ?", (row[0],))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row is not None
+
+    def backfill(self, force: bool = False, prune: bool = False) -> Dict[str, int]:
+        """Index every session directory and day pack under root; optionally drop vanished ones."""
+        counts = {"scanned": 0, "indexed": 0, "skipped": 0, "failed": 0, "pruned": 0}
+        for session_dir in storage.iter_session_dirs(self.root):
+            counts["scanned"] += 1
+            try:
+                written = self.index_session(session_dir, force=force)
+            except Exception:
+                counts["failed"] += 1
+                logger.warning(f"Could not index {session_dir}", exc_info=True)
+                continue
+            counts["indexed" if written else "skipped"] += 1
+        for pack in storage.iter_packs(self.root):
+            members = len(storage.read_pack_index(pack))
+            counts["scanned"] += members
+            try:
+                written = self.index_pack(pack, force=force)
+            except Exception:
+                counts["failed"] += members
+                logger.warning(f"Could not index {pack}", exc_info=True)
+                continue
+            counts["indexed"] += written
+            counts["skipped"] += members - written
+        if prune:
+            with self._lock:
+                paths = [r[0] for r in self._conn.execute("SELECT path FROM sessions")]
+            for rel in paths:
+                if storage.read_session(self.root, rel) is None and self.remove(rel):
+                    counts["pruned"] += 1
+        return counts
+
+    # -- Reads -----------------------------------------------------------------
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        language: Optional[str] = None,
+        started_after: Optional[str] = None,
+        started_before: Optional[str] = None,
+        min_duration_s: Optional[float] = None,
+        max_duration_s: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[int] = None,
+    ) -> Tuple[List[Dict], int, Optional[int]]:
+        """
+        Newest first. `text` is an FTS5 query (words, "phrases", prefix*,
+        AND/OR/NOT). `cursor` is the id of the last row of the previous
+        page. Returns (page, total matches, next_cursor).
+        Raises sqlite3.OperationalError on a malformed text query.
+        """
+        where: List[str] = []
+        params: List = []
+        if text:
+            where.append("s.id IN (SELECT rowid FROM transcript_fts WHERE transcript_fts MATCH ?)")
+            params.append(text)
+        if customer_id:
+            where.append("s.customer_id = ?")
+            params.append(customer_id)
+        if language:
+            where.append("s.language = ?")
+            params.append(language)
+        if started_after:
+            where.append("s.started_at >= ?")
+            params.append(started_after)
+        if started_before:
+            where.append("s.started_at < ?")
+            params.append(started_before)
+        if min_duration_s is not None:
+            where.append("s.duration_s >= ?")
+            params.append(min_duration_s)
+        if max_duration_s is not None:
+            where.append("s.duration_s <= ?")
+            params.append(max_duration_s)
+
+        filters = " AND ".join(where) or "1"
+        page_where = filters
+        page_params = list(params)
+        if cursor is not None:
+            page_where += (
+                " AND (s.started_at, s.id) < "
+                "(SELECT started_at, id FROM sessions WHERE id = ?)"
+            )
+            page_params.append(cursor)
+
+        snippet = (
+            "(SELECT snippet(transcript_fts, 0, '[', ']', '…', 12) "
+            "FROM transcript_fts WHERE transcript_fts MATCH ? AND rowid = s.id)"
+            if text else "NULL"
+        )
+        columns = ", ".join(f"s.{c}" for c in _COLUMNS)
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM sessions s WHERE {filters}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns}, {snippet} FROM sessions s WHERE {page_where} "
+                "ORDER BY s.started_at DESC, s.id DESC LIMIT ?",
+                ([text] if text else []) + page_params + [limit + 1],
+            ).fetchall()
+
+        page = [dict(zip(_COLUMNS + ("snippet",), row)) for row in rows[:limit]]
+        next_cursor = page[-1]["id"] if len(rows) > limit else None
+        return page, total, next_cursor
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Newest indexed session with this session id."""
+        columns = ", ".join(_COLUMNS)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM sessions WHERE session_id = ? "
+                "ORDER BY started_at DESC LIMIT 1",
+                (session_id,),
+            ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sessions, customers = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT customer_id) FROM sessions"
+            ).fetchone()
+        return {"sessions": sessions, "customers": customers}
+
+
+_index: Optional[TranscriptIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> TranscriptIndex:
+    """Process-wide index (opened on first use)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TranscriptIndex()
+    return _index
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Transcript Layout Migration
+============================
+Move flat recordings/<customer>_<session>_<YYYYmmdd>_<HHMMSS>/ directories
+into the sharded layout (<customer>/<YYYY>/<MM>/<DD>/<session>_<HHMMSS>/)
+and update their paths in the transcript index. With --pack, days older
+than TRANSCRIPT_PACK_AFTER_DAYS are then packed.
+
+Directories are renamed, not copied, so this is fast and needs no extra
+disk space. Safe to re-run: already-migrated sessions are skipped.
+
+Usage:
+    python -m transcripts.migrate --dry-run
+    python -m transcripts.migrate --pack
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+
+from transcripts import storage
+from transcripts.index import TranscriptIndex
+
+
+def _target(root: Path, legacy_dir: Path) -> Path:
+    fields = storage.parse_legacy_name(legacy_dir.name)
+    metadata_path = legacy_dir / "metadata.json"
+    if metadata_path.exists():
+        with open(metadata_path, encoding="utf-8") as f:
+            metadata = json.load(f)
+        fields["customer_id"] = metadata.get("customer_id") or fields["customer_id"]
+        fields["session_id"] = metadata.get("session_id") or fields["session_id"]
+        fields["started_at"] = metadata.get("started_at") or fields["started_at"]
+    started = (
+        datetime.fromisoformat(fields["started_at"]) if fields["started_at"]
+        else datetime.fromtimestamp(legacy_dir.stat().st_mtime)
+    )
+    return storage.session_dir(root, fields["customer_id"], fields["session_id"], started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, default=storage.RECORDINGS_DIR, help="recordings directory")
+    parser.add_argument("--db", type=Path, default=None, help="index database (default TRANSCRIPTS_DB_PATH)")
+    parser.add_argument("--dry-run", action="store_true", help="print moves without doing them")
+    parser.add_argument("--pack", action="store_true", help="pack old days after moving")
+    args = parser.parse_args()
+
+    root = args.root
+    index = None if args.dry_run else TranscriptIndex(path=args.db, root=root)
+    moved = skipped = 0
+    legacy = [p for p in sorted(root.iterdir()) if p.is_dir() and storage.is_session_dir(p)] if root.exists() else []
+
+    for legacy_dir in legacy:
+        target = _target(root, legacy_dir)
+        if target.exists():
+            print(f"⚠️  {legacy_dir.name}: {target.relative_to(root)} already exists, skipping")
+            skipped += 1
+            continue
+        if args.dry_run:
+            print(f"   {legacy_dir.name} → {target.relative_to(root)}")
+            moved += 1
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        legacy_dir.rename(target)
+        if not index.move(legacy_dir.name, str(target.relative_to(root))):
+            index.index_session(target)
+        moved += 1
+
+    verb = "would move" if args.dry_run else "moved"
+    print(f"📦 {verb} {moved} sessions, skipped {skipped}")
+
+    if args.pack and not args.dry_run:
+        with storage.maintenance_lock(root) as acquired:
+            if not acquired:
+                print("⚠️  Another maintainer holds the lock; run again with --pack later")
+                return
+            packed = storage.compact_days(root, index=index)
+        print(f"🗜️  packed {packed} sessions into day packs")
+
+
+if __name__ == "__main__":
+    main()
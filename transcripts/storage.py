@@ -0,0 +1,388 @@
+"""
+Lisa Voice Agent — Transcript Storage
+=======================================
+On-disk layout for saved sessions, day packing and retention.
+
+  recordings/
+    <customer>/<YYYY>/<MM>/<DD>/<session>_<HHMMSS>/   recent sessions
+        transcript.json, metadata.json
+    <customer>/<YYYY>/<MM>/<DD>.pack                  packed day
+    <customer>/<YYYY>/<MM>/<DD>.pack.idx              member name → offset, length
+
+A pack is a concatenation of independently zlib-compressed members (one
+per session: {"metadata": ..., "transcript": [...]}), so one transcript
+is read with a seek and a single decompress. The compactor packs days
+older than TRANSCRIPT_PACK_AFTER_DAYS; the sweeper drops whole days past
+a customer's retention. Both run from StorageMaintainer in the API.
+
+Paths stored in the transcript index are relative to the recordings
+root; a packed session is "<customer>/<YYYY>/<MM>/<DD>.pack#<name>".
+Flat pre-sharding directories (recordings/<customer>_<session>_<ts>/)
+are still readable; transcripts.migrate moves them into the layout.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from agent.transcript_writer import JSONL_NAME, replay
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger("transcripts.storage")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RECORDINGS_DIR = PROJECT_ROOT / "recordings"
+# Maintenance lock files live with the other runtime state, not in recordings/.
+LOCK_DIR = PROJECT_ROOT / "data"
+
+PACK_SUFFIX = ".pack"
+PACK_INDEX_SUFFIX = ".pack.idx"
+PACK_VERSION = 1
+
+PACK_AFTER_DAYS = int(os.getenv("TRANSCRIPT_PACK_AFTER_DAYS", "1"))
+RETENTION_DAYS = int(os.getenv("TRANSCRIPT_RETENTION_DAYS", "0"))   # 0 = keep forever
+MAINTENANCE_INTERVAL_S = float(os.getenv("TRANSCRIPT_MAINTENANCE_INTERVAL_S", "3600"))
+
+_SESSION_FILES = ("transcript.json", "metadata.json", JSONL_NAME)
+
+Session = Tuple[Dict, List[Dict]]   # (metadata, transcript entries)
+
+
+def _parse_overrides(value: str) -> Dict[str, int]:
+    """"real_estate=30,home_services=90" → {"real_estate": 30, ...}"""
+    overrides: Dict[str, int] = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        customer_id, days = item.split("=", 1)
+        try:
+            overrides[customer_id.strip()] = int(days)
+        except ValueError:
+            logger.warning(f"Ignoring retention override {item!r}")
+    return overrides
+
+
+RETENTION_OVERRIDES = _parse_overrides(os.getenv("TRANSCRIPT_RETENTION_OVERRIDES", ""))
+
+
+def retention_days(customer_id: str) -> int:
+    """Days of transcripts kept for a customer (0 = forever)."""
+    return RETENTION_OVERRIDES.get(customer_id, RETENTION_DAYS)
+
+
+# ── Layout ──────────────────────────────────────────────────────────────────
+
+def session_dir(root: Path, customer_id: str, session_id: str, started: datetime) -> Path:
+    return (
+        root / customer_id / f"{started:%Y}" / f"{started:%m}" / f"{started:%d}"
+        / f"{session_id}_{started:%H%M%S}"
+    )
+
+
+def is_session_dir(path: Path) -> bool:
+    return any((path / name).exists() for name in _SESSION_FILES)
+
+
+def parse_legacy_name(name: str) -> Dict[str, Optional[str]]:
+    """<customer>_<session>_<YYYYmmdd>_<HHMMSS> → fields."""
+    parts = name.rsplit("_", 3)
+    if len(parts) != 4:
+        return {"customer_id": name, "session_id": name, "started_at": None}
+    customer_id, session_id, day, clock = parts
+    try:
+        started = datetime.strptime(f"{day}_{clock}", "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        started = None
+    return {"customer_id": customer_id, "session_id": session_id, "started_at": started}
+
+
+def describe(rel_path: str) -> Dict[str, Optional[str]]:
+    """Customer, session and start time implied by a relative session path."""
+    if "/" not in rel_path:
+        return parse_legacy_name(rel_path)
+    day_path, _, name = rel_path.partition(PACK_SUFFIX + "#")
+    if not name:
+        day_path, _, name = rel_path.rpartition("/")
+    parts = day_path.split("/")
+    if len(parts) < 4:
+        return parse_legacy_name(name)
+    customer_id, year, month, day = parts[-4:]
+    session_id, _, clock = name.rpartition("_")
+    try:
+        started = datetime.strptime(f"{year}{month}{day}_{clock}", "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        started = None
+    return {"customer_id": customer_id, "session_id": session_id or name, "started_at": started}
+
+
+def iter_session_dirs(root: Path) -> Iterator[Path]:
+    """Unpacked session directories: flat legacy ones, then sharded ones."""
+    if not root.exists():
+        return
+    for path in sorted(p for p in root.iterdir() if p.is_dir()):
+        if is_session_dir(path):
+            yield path
+    for day_dir, _ in _iter_days(root):
+        if day_dir.is_dir():
+            yield from sorted(p for p in day_dir.iterdir() if p.is_dir())
+
+
+def iter_packs(root: Path) -> Iterator[Path]:
+    for day_path, _ in _iter_days(root):
+        if day_path.suffix == PACK_SUFFIX:
+            yield day_path
+
+
+def _iter_days(root: Path) -> Iterator[Tuple[Path, date]]:
+    """(day directory or day pack, date) for every sharded day under root."""
+    if not root.exists():
+        return
+    for customer_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        if is_session_dir(customer_dir):
+            continue
+        for month_dir in sorted(customer_dir.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9]")):
+            for path in sorted(month_dir.iterdir()):
+                name = path.name[: -len(PACK_SUFFIX)] if path.suffix == PACK_SUFFIX else path.name
+                if not (name.isdigit() and len(name) == 2) or (path.is_file() and path.suffix != PACK_SUFFIX):
+                    continue
+                try:
+                    day = date(int(month_dir.parent.name), int(month_dir.name), int(name))
+                except ValueError:
+                    continue
+                yield path, day
+
+
+# ── Reading ─────────────────────────────────────────────────────────────────
+
+def load_session(path: Path) -> Optional[Session]:
+    """(metadata, entries) for an unpacked session directory, or None."""
+    transcript_path = path / "transcript.json"
+    if transcript_path.exists():
+        with open(transcript_path, encoding="utf-8") as f:
+            entries = json.load(f)
+    elif (path / JSONL_NAME).exists():
+        entries = replay(path / JSONL_NAME)   # worker died before compacting
+    else:
+        return None
+
+    metadata: Dict = {}
+    metadata_path = path / "metadata.json"
+    if metadata_path.exists():
+        with open(metadata_path, encoding="utf-8") as f:
+            metadata = json.load(f)
+    return metadata, entries
+
+
+def read_pack_index(pack: Path) -> Dict[str, Dict[str, int]]:
+    idx_path = pack.with_suffix(PACK_INDEX_SUFFIX)
+    if not idx_path.exists():
+        return {}
+    with open(idx_path, encoding="utf-8") as f:
+        return json.load(f)["members"]
+
+
+def read_member(pack: Path, name: str) -> Optional[Session]:
+    member = read_pack_index(pack).get(name)
+    if member is None:
+        return None
+    with open(pack, "rb") as f:
+        f.seek(member["offset"])
+        blob = f.read(member["length"])
+    record = json.loads(zlib.decompress(blob))
+    return record["metadata"], record["transcript"]
+
+
+def read_session(root: Path, rel_path: str) -> Optional[Session]:
+    """Read a session by its index path, packed or not."""
+    if "#" in rel_path:
+        pack, name = rel_path.split("#", 1)
+        pack_path = root / pack
+        return read_member(pack_path, name) if pack_path.exists() else None
+    path = Path(rel_path)
+    return load_session(path if path.is_absolute() else root / path)
+
+
+# ── Packing ─────────────────────────────────────────────────────────────────
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def pack_day(day_dir: Path, root: Path, index=None) -> int:
+    """
+    Append every session under day_dir to <DD>.pack, then remove the
+    directories. The pack is fsynced before its index is replaced, and
+    the index before any directory is deleted, so a crash at any point
+    leaves each session readable from one place or the other.
+    Returns the number of sessions packed.
+    """
+    pack = day_dir.with_name(day_dir.name + PACK_SUFFIX)
+    members = read_pack_index(pack)
+    packed: List[Path] = []
+
+    with open(pack, "ab") as f:
+        offset = f.seek(0, os.SEEK_END)
+        for path in sorted(p for p in day_dir.iterdir() if p.is_dir()):
+            if path.name in members:
+                packed.append(path)   # packed before a crash, directory not yet removed
+                continue
+            loaded = load_session(path)
+            if loaded is None:
+                continue
+            metadata, entries = loaded
+            raw = json.dumps(
+                {"metadata": metadata, "transcript": entries},
+                ensure_ascii=False, separators=(",", ":"),
+            ).encode("utf-8")
+            blob = zlib.compress(raw, 6)
+            f.write(blob)
+            members[path.name] = {"offset": offset, "length": len(blob), "size": len(raw)}
+            offset += len(blob)
+            packed.append(path)
+        f.flush()
+        os.fsync(f.fileno())
+
+    if not packed:
+        return 0
+    _write_json_atomic(
+        pack.with_suffix(PACK_INDEX_SUFFIX), {"version": PACK_VERSION, "members": members}
+    )
+    pack_rel = str(pack.relative_to(root))
+    for path in packed:
+        if index is not None:
+            index.move(str(path.relative_to(root)), f"{pack_rel}#{path.name}")
+        shutil.rmtree(path)
+    try:
+        day_dir.rmdir()
+    except OSError:
+        pass  # something non-session is left in it
+    return len(packed)
+
+
+def compact_days(root: Path, older_than_days: int = PACK_AFTER_DAYS, index=None,
+                 today: Optional[date] = None) -> int:
+    """Pack every sharded day older than `older_than_days`. Returns sessions packed."""
+    cutoff = (today or date.today()) - timedelta(days=older_than_days)
+    total = 0
+    for day_path, day in list(_iter_days(root)):
+        if day < cutoff and day_path.is_dir():
+            total += pack_day(day_path, root, index)
+    return total
+
+
+# ── Retention ───────────────────────────────────────────────────────────────
+
+def sweep_expired(root: Path, index=None, today: Optional[date] = None) -> int:
+    """Delete whole days past each customer's retention. Returns days removed."""
+    today = today or date.today()
+    removed = 0
+    for day_path, day in list(_iter_days(root)):
+        rel = day_path.relative_to(root)
+        customer_id = rel.parts[0]
+        days = retention_days(customer_id)
+        if days <= 0 or day >= today - timedelta(days=days):
+            continue
+        if day_path.is_dir():
+            shutil.rmtree(day_path)
+            prefix = str(rel) + "/"
+        else:
+            day_path.with_suffix(PACK_INDEX_SUFFIX).unlink(missing_ok=True)
+            day_path.unlink()
+            prefix = str(rel) + "#"
+        if index is not None:
+            index.remove_prefix(prefix)
+        for parent in (day_path.parent, day_path.parent.parent):
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+        removed += 1
+    return removed
+
+
+# ── Background maintenance ──────────────────────────────────────────────────
+
+@contextmanager
+def maintenance_lock(root: Path) -> Iterator[bool]:
+    """
+    Cross-process lock so only one maintainer works on a root at a time.
+    The lock file is under LOCK_DIR, named after the root's path.
+    """
+    if fcntl is None:
+        yield True
+        return
+    LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(str(root.resolve()).encode()).hexdigest()[:12]
+    with open(LOCK_DIR / f"transcripts-maintenance-{key}.lock", "w") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def run_maintenance(root: Path, index=None) -> Dict[str, int]:
+    with maintenance_lock(root) as acquired:
+        if not acquired:
+            return {"packed": 0, "expired_days": 0, "skipped": 1}
+        expired = sweep_expired(root, index)
+        packed = compact_days(root, index=index)
+    return {"packed": packed, "expired_days": expired, "skipped": 0}
+
+
+class StorageMaintainer:
+    """Runs retention + packing every `interval_s` on a daemon thread."""
+
+    def __init__(self, root: Path = RECORDINGS_DIR, index=None,
+                 interval_s: float = MAINTENANCE_INTERVAL_S) -> None:
+        self.root = root
+        self.index = index
+        self.interval_s = interval_s
+        self.last_run: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval_s <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="transcript-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.last_run = run_maintenance(self.root, self.index)
+                if self.last_run["packed"] or self.last_run["expired_days"]:
+                    logger.info(
+                        f"🗜️  Transcripts: packed {self.last_run['packed']} sessions, "
+                        f"expired {self.last_run['expired_days']} days"
+                    )
+            except Exception:
+                logger.exception("Transcript storage maintenance failed")
+            self._stop.wait(self.interval_s)